@@ -0,0 +1,213 @@
+"""
+집계 조회 API
+대시보드와 같은 큐브 조회 경로로 /api/district, /api/weather, /api/vehicle 을 제공합니다.
+UI를 거치지 않고 다른 서비스가 같은 필터로 집계를 받아갈 수 있습니다.
+
+쿼리 파라미터:
+    start_year, end_year: 연도 범위 (양 끝 포함, 기본: 전체)
+    district: 자치구 (여러 번 또는 쉼표로 구분, 기본: 전체)
+    weather: 기상상태 (/api/weather 전용, 기본: 전체)
+    group_by: 묶음 기준 (/api/district 전용, GROUP_BY 참고. 기상별/차종별은 기상상태/차종으로만 묶음)
+    metric: count | deaths | injuries (기본: 전체)
+    format: json(기본) | arrow  (또는 Accept: application/vnd.apache.arrow.stream)
+
+잘못된 파라미터(알 수 없는 값 포함)는 400을 반환합니다.
+
+응답에는 본문 해시 ETag와 Cache-Control이 붙고, If-None-Match가 일치하면 304를 반환합니다.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from compression import cached_response
+from cube import METRICS
+from metrics import measure
+
+try:
+    import pyarrow as pa
+except ImportError:  # Arrow 응답은 pyarrow가 있을 때만
+    pa = None
+
+ARROW_MIMETYPE = 'application/vnd.apache.arrow.stream'
+
+# 프록시/브라우저 캐시 유효 시간 (초)
+MAX_AGE_ENV = 'DASHBOARD_API_MAX_AGE'
+DEFAULT_MAX_AGE = 300
+
+# 지표 이름 (API) → 큐브 지표
+METRIC_NAMES = {'count': '발생건수', 'deaths': '사망자수', 'injuries': '부상자수'}
+
+# 응답 컬럼 이름
+COLUMN_NAMES = {
+    '연도': 'year', '자치구': 'district', '기상상태': 'weather', '차종': 'vehicle',
+    '발생건수': 'count', '사망자수': 'deaths', '부상자수': 'injuries',
+}
+
+ENDPOINTS = ('district', 'weather', 'vehicle')
+
+# /api/district의 group_by 값 (첫 번째가 기본값)
+GROUP_BY = ('district', 'year', 'year_district', 'none')
+
+# format 값 (없으면 Accept 헤더로 결정)
+FORMATS = ('json', 'arrow')
+
+
+class ApiError(Exception):
+    """잘못된 쿼리 파라미터 (400)"""
+
+
+def _multi(args, name):
+    """반복 파라미터와 쉼표 구분 값을 모두 받아 목록으로"""
+    values = []
+    for value in args.getlist(name):
+        values.extend(v.strip() for v in value.split(',') if v.strip())
+    return values
+
+
+def _year(args, name, default):
+    value = args.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ApiError(f"{name}은 정수여야 합니다: {value}")
+
+
+def parse_query(args, endpoint, cube):
+    """쿼리 파라미터 → 정규화된 필터 dict"""
+    start_year = _year(args, 'start_year', int(cube.years[0]))
+    end_year = _year(args, 'end_year', int(cube.years[-1]))
+    if start_year > end_year:
+        raise ApiError(f"start_year({start_year})가 end_year({end_year})보다 큽니다")
+
+    districts = _multi(args, 'district')
+    unknown = sorted(set(districts) - set(cube.districts))
+    if unknown:
+        raise ApiError(f"알 수 없는 자치구: {', '.join(unknown)}")
+
+    weather = _multi(args, 'weather') if endpoint == 'weather' else []
+    unknown = sorted(set(weather) - set(cube.weathers))
+    if unknown:
+        raise ApiError(f"알 수 없는 기상상태: {', '.join(unknown)}")
+
+    group_by = args.get('group_by')
+    if endpoint != 'district' and group_by:
+        raise ApiError("group_by는 /api/district에서만 쓸 수 있습니다")
+    group_by = group_by or GROUP_BY[0]
+    if group_by not in GROUP_BY:
+        raise ApiError(f"group_by는 {', '.join(GROUP_BY)} 중 하나여야 합니다")
+
+    metric = args.get('metric')
+    if metric and metric not in METRIC_NAMES:
+        raise ApiError(f"metric은 {', '.join(METRIC_NAMES)} 중 하나여야 합니다")
+
+    output_format = args.get('format')
+    if output_format and output_format not in FORMATS:
+        raise ApiError(f"format은 {', '.join(FORMATS)} 중 하나여야 합니다")
+
+    query = {
+        'start_year': start_year,
+        'end_year': end_year,
+        'districts': districts,
+        'weather': weather,
+        'metric': metric,
+    }
+    if endpoint == 'district':
+        query['group_by'] = group_by
+    return query
+
+
+def aggregate(cube, endpoint, query):
+    """필터/묶음 기준에 맞는 집계 DataFrame (차트와 같은 큐브 조각 사용)"""
+    selection = cube.select([query['start_year'], query['end_year']], query['districts'])
+
+    if endpoint == 'district':
+        group_by = query['group_by']
+        if group_by == 'district':
+            df = cube.district_totals(selection)
+        elif group_by == 'none':
+            df = pd.DataFrame([cube.totals(selection)], columns=METRICS)
+        else:
+            df = cube.district_frame(selection)
+            if group_by == 'year':
+                df = df.groupby('연도', as_index=False)[METRICS].sum()
+    elif endpoint == 'weather':
+        df = cube.weather_totals(selection, query['weather'])
+        df = df[df['기상상태'] != '소계']
+    else:
+        df = cube.vehicle_totals(selection)
+        df = df[df['차종'] != '소계']
+
+    metrics = [METRIC_NAMES[query['metric']]] if query['metric'] else METRICS
+    labels = [col for col in df.columns if col not in METRICS]
+    df = df[labels + metrics].reset_index(drop=True)
+    df[metrics] = np.rint(df[metrics].to_numpy()).astype(np.int64)
+    return df.rename(columns=COLUMN_NAMES)
+
+
+def _wants_arrow(request):
+    if request.args.get('format'):
+        return request.args.get('format') == 'arrow'
+    best = request.accept_mimetypes.best_match(['application/json', ARROW_MIMETYPE])
+    return best == ARROW_MIMETYPE
+
+
+def _arrow_body(df):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def register_api_routes(server, get_current, prefix='/api'):
+    """
+    Flask 서버에 집계 조회 API 등록
+
+    Args:
+        get_current: 현재 (큐브, 데이터 버전)을 반환하는 함수 (준비 전이면 큐브가 None → 503).
+            요청마다 한 번만 읽어 데이터가 교체되는 도중에도 행/ETag/data_version이 같은 큐브를 가리킴
+    """
+    from flask import Response, request
+
+    max_age = int(os.environ.get(MAX_AGE_ENV, DEFAULT_MAX_AGE))
+
+    def handle(endpoint):
+        cube, data_version = get_current()
+        if cube is None:
+            body = json.dumps({'error': '데이터를 준비 중입니다'}, ensure_ascii=False)
+            return Response(body, status=503, mimetype='application/json')
+        try:
+            query = parse_query(request.args, endpoint, cube)
+        except ApiError as e:
+            body = json.dumps({'error': str(e)}, ensure_ascii=False)
+            return Response(body, status=400, mimetype='application/json')
+
+        with measure(f'api.{endpoint}'):
+            df = aggregate(cube, endpoint, query)
+
+            if _wants_arrow(request):
+                if pa is None:
+                    body = json.dumps({'error': 'pyarrow가 설치되어 있지 않습니다'}, ensure_ascii=False)
+                    return Response(body, status=406, mimetype='application/json')
+                body, mimetype = _arrow_body(df), ARROW_MIMETYPE
+            else:
+                body = json.dumps({
+                    'endpoint': endpoint,
+                    'data_version': data_version,
+                    'query': query,
+                    'rows': df.to_dict(orient='records'),
+                }, ensure_ascii=False, default=int).encode('utf-8')
+                mimetype = 'application/json'
+
+        response = cached_response(body, mimetype, max_age)
+        response.headers['Vary'] = 'Accept'
+        return response
+
+    for endpoint in ENDPOINTS:
+        server.add_url_rule(f'{prefix}/{endpoint}', f'api_{endpoint}',
+                            lambda endpoint=endpoint: handle(endpoint))
@@ -3,38 +3,196 @@
 Plotly Dash 기반 웹 애플리케이션 - 새로운 레이아웃 (사이드바)
 """
 
+import json
+import os
+import threading
 import dash
-from dash import dcc, html, Input, Output
+from dash import dcc, html, Input, Output, State
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
-from preprocessing import load_and_clean_data
+from preprocessing import load_and_clean_data, data_fingerprint, find_data_files
+from reloader import files_signature, start_watcher
+from data_cache import cache_dir
+from geo import ensure_geometry_file, get_geometry, geometry_digest, register_geometry_route, GeometryError
+from cube import CUBE_FORMAT, SHARED_CUBE_PREFIX, AccidentCube, load_shared_cube, remove_stale_cubes
+from figure_cache import figure_cache, filter_key
+from metrics import register_metrics_route
+from compression import register_compression
+from api import register_api_routes
+from jobs import create_background_manager, background_options, in_background_job
 from charts import (
     create_trend_chart,
     create_weather_chart,
     create_vehicle_chart,
     create_heatmap_chart,
     create_ranking_chart,
-    create_map_chart
+    create_map_chart,
+    figure_update,
+    is_failed_figure,
+    metric_specs
 )
 
-# 데이터 로드 (전역 변수)
-print("=" * 70)
-print("📊 데이터 로딩 중...")
-print("=" * 70)
-df_weather, df_vehicle, df_district = load_and_clean_data()
+# 대시보드 표시 기간
+min_year, max_year = 2020, 2024
 
-# 2020~2024년 데이터만 필터링
-df_weather = df_weather[df_weather['연도'].between(2020, 2024)]
-df_vehicle = df_vehicle[df_vehicle['연도'].between(2020, 2024)]
-df_district = df_district[df_district['연도'].between(2020, 2024)]
+# 데이터 공유 방식: 'local'(프로세스마다 큐브 생성) 또는 'mmap'(공유 큐브를 읽기 전용으로 연결)
+DATA_PLANE_ENV = 'DASHBOARD_DATA_PLANE'
 
-print("\n✅ 데이터 로딩 완료! (2020~2024년)\n")
 
-# 년도 범위
-years = sorted(df_district['연도'].unique())
-min_year, max_year = 2020, 2024
+def build_cube(paths=None):
+    """정제 데이터 로드 → 표시 기간 필터 → 사전 집계 큐브"""
+    df_weather, df_vehicle, df_district = load_and_clean_data(paths=paths)
+    
+    # 2020~2024년 데이터만 필터링
+    df_weather = df_weather[df_weather['연도'].between(min_year, max_year)]
+    df_vehicle = df_vehicle[df_vehicle['연도'].between(min_year, max_year)]
+    df_district = df_district[df_district['연도'].between(min_year, max_year)]
+    
+    return AccidentCube.from_frames(df_weather, df_vehicle, df_district)
+
+
+# 시작 방식: DASHBOARD_LAZY_START=1이면 import 시 데이터를 읽지 않고 서버를 먼저 띄운 뒤
+# 백그라운드 스레드에서 로드 (준비 전에는 /ready가 503, 페이지는 로딩 화면)
+LAZY_START_ENV = 'DASHBOARD_LAZY_START'
+lazy_start = os.environ.get(LAZY_START_ENV) == '1'
+
+# 사전 집계 큐브 (콜백은 행 단위 필터링 대신 큐브 조각만 계산, 로드 전에는 None)
+cube = None
+
+# 데이터 버전 (데이터를 다시 읽으면 올려서 차트 캐시를 무효화)
+data_version = 0
+
+# (큐브, 데이터 버전) 한 쌍. 콜백은 이 값을 한 번만 읽어 요청 도중 데이터가 교체되어도
+# 한 요청 안에서는 같은 큐브를 사용
+_current = (None, 0)
+
+# 현재 큐브를 만든 원본 파일 (reloader.files_signature, 감시 스레드가 변경 판단에 사용)
+loaded_files = None
+
+# 백그라운드 로드 실패 메시지 (/ready와 로딩 화면에 표시)
+load_error = None
+
+_load_lock = threading.Lock()
+_load_thread = None
+_watcher = None
+
+# 로드/갱신은 한 번에 하나씩 (첫 로드와 감시 스레드의 갱신이 겹치지 않도록)
+_reload_lock = threading.Lock()
+
+
+def load_data(paths=None, shared=False):
+    """
+    큐브를 만들거나(공유 큐브면 연결) 전역 상태로 교체하고 데이터 버전을 올림
+
+    새 큐브를 다 만든 뒤 참조만 바꾸므로 진행 중인 콜백은 이전 큐브로 끝까지 처리되고,
+    이전 큐브는 마지막 콜백이 끝나면 해제됩니다.
+
+    Args:
+        paths: 데이터셋별 원본 경로 (기본: 데이터셋별 최신 파일)
+        shared: True면 DASHBOARD_DATA_PLANE과 무관하게 공유 큐브를 거침 (감시 스레드의 갱신)
+    """
+    global cube, data_version, _current, loaded_files
+
+    with _reload_lock:
+        print("=" * 70)
+        print("📊 데이터 로딩 중...")
+        print("=" * 70)
+
+        # 읽기 전에 파일 상태를 기록 (읽는 도중 바뀌면 감시 스레드가 다시 갱신)
+        paths = paths or find_data_files()
+        signature = files_signature(paths)
+
+        # 정제 DataFrame은 큐브를 만든 뒤 버려서 워커마다 원본 사본을 들고 있지 않음
+        if shared or os.environ.get(DATA_PLANE_ENV) == 'mmap':
+            shared_dir = os.path.join(
+                cache_dir(),
+                f"{SHARED_CUBE_PREFIX}{data_fingerprint(paths)[:16]}-{min_year}-{max_year}-v{CUBE_FORMAT}")
+            new_cube = load_shared_cube(shared_dir, lambda: build_cube(paths))
+            remove_stale_cubes(shared_dir)
+        else:
+            new_cube = build_cube(paths)
+
+        # 자치구 경계 미리 로드 (지도 콜백에서 네트워크/디스크 접근 없이 재사용)
+        # 파일이 없을 때의 내려받기는 여기서 프로세스당 한 번만 시도 (콜백은 네트워크를 기다리지 않음)
+        ensure_geometry_file()
+        try:
+            get_geometry()
+        except GeometryError as e:
+            print(f"⚠️ {e}")
+
+        version = data_version + 1
+        _current = (new_cube, version)
+        cube, data_version = new_cube, version
+        loaded_files = signature
+        figure_cache.set_data_version(version)
+
+        print(f"\n✅ 데이터 로딩 완료! ({min_year}~{max_year}년, 데이터 버전 {version})\n")
 
-# 자치구 목록
-districts = sorted(df_district['자치구'].unique())
+
+def current_data():
+    """현재 (큐브, 데이터 버전). 로드 전이면 (None, 0)"""
+    return _current
+
+
+def _load_in_background():
+    global load_error
+    try:
+        load_data()
+    except Exception as e:
+        load_error = f"{type(e).__name__}: {e}"
+        print(f"❌ 데이터 로딩 실패: {load_error}")
+        import traceback
+        traceback.print_exc()
+
+
+def start_loading():
+    """
+    백그라운드 데이터 로드 시작 (이미 시작했거나 로드가 끝났으면 무시)
+
+    gunicorn preload 마스터에서 시작한 스레드는 fork된 워커로 넘어가지 않으므로,
+    워커 시작 후(post_worker_init) 또는 첫 요청에서 호출합니다.
+    """
+    global _load_thread
+    with _load_lock:
+        if _load_thread is None and cube is None:
+            _load_thread = threading.Thread(
+                target=_load_in_background, name='dashboard-data-load', daemon=True)
+            _load_thread.start()
+
+
+def reload_data(paths):
+    """
+    감시 스레드의 갱신: 항상 공유 큐브를 거쳐 교체
+
+    워커마다 감시 스레드가 같은 변경을 거의 동시에 발견하므로, 잠금을 얻은 워커 하나만 원본을 파싱해
+    공유 큐브를 만들고 나머지 워커는 기다렸다가 연결만 합니다 (DASHBOARD_DATA_PLANE=local이어도 동일).
+    """
+    load_data(paths, shared=True)
+
+
+def start_watching():
+    """원본 파일 감시 시작 (워커마다 1회, DASHBOARD_RELOAD_INTERVAL=0이면 감시하지 않음)"""
+    global _watcher
+    with _load_lock:
+        if _watcher is None:
+            _watcher = start_watcher(reload_data, lambda: loaded_files) or False
+
+
+def is_ready():
+    return cube is not None
+
+
+if not lazy_start:
+    load_data()
+
+# 차트 그래프 id (각 그래프마다 '<id>-signature' Store로 현재 Figure 구조를 기억)
+GRAPH_IDS = ['map-chart', 'trend-chart', 'weather-chart', 'vehicle-chart', 'heatmap-chart', 'ranking-chart']
+
+# 백그라운드 콜백 관리자 (결과 캐시 키에 원본 파일 상태와 경계 파일 해시 포함, 사용할 수 없으면 None)
+# 경계 파일이 없을 때 캐시된 '지도 로딩 실패' 결과는 파일을 준비하면 키가 바뀌어 다시 쓰이지 않음
+# 새로 그릴 때 오래 걸리는 지도(~90ms)/히트맵(~50ms)만 작업 프로세스에서 그리고, 나머지 차트는
+# 작업 프로세스를 띄우고 결과를 받아가는 비용과 비슷해서 요청 스레드에서 처리
+background_manager = create_background_manager(lambda: (loaded_files, geometry_digest()))
 
 # 기상 조건 목록
 weather_conditions = ['맑음', '흐림', '비', '안개', '눈', '기타/불명']
@@ -52,6 +210,43 @@ app = dash.Dash(
 # ✅ Render 배포를 위한 server 변수 추가
 server = app.server
 
+# 응답 압축 (brotli/gzip, 계측 훅보다 먼저 등록해야 /metrics가 압축 전 크기를 기록)
+register_compression(server)
+
+# 성능 계측 (/metrics, Prometheus 텍스트 형식)
+register_metrics_route(server)
+
+# 집계 조회 API (/api/district, /api/weather, /api/vehicle)
+register_api_routes(server, current_data)
+
+# 자치구 경계 파일 (/geo/seoul-<해시>.json, 지도 Figure는 이 주소만 참조)
+register_geometry_route(server, app.config.requests_pathname_prefix)
+
+
+@server.route('/healthz')
+def healthz():
+    """liveness: 프로세스가 요청을 받을 수 있으면 항상 200"""
+    return server.response_class('ok', mimetype='text/plain')
+
+
+@server.route('/ready')
+def ready():
+    """readiness: 데이터가 준비되면 200, 로딩 중이거나 실패하면 503"""
+    body = {'ready': is_ready(), 'data_version': current_data()[1]}
+    if load_error:
+        body['error'] = load_error
+    return server.response_class(json.dumps(body, ensure_ascii=False),
+                                 status=200 if body['ready'] else 503, mimetype='application/json')
+
+
+@server.before_request
+def ensure_background():
+    """post_worker_init 훅 없이 실행된 경우에도 첫 요청(헬스 체크 등)에서 로드/감시 시작"""
+    if lazy_start and cube is None:
+        start_loading()
+    if _watcher is None:
+        start_watching()
+
 app.title = "서울시 교통사고 대시보드"
 
 # 커스텀 스타일
@@ -162,460 +357,685 @@ app.index_string = '''
 </html>
 '''
 
-# 레이아웃
-app.layout = html.Div([
-    # 왼쪽 사이드바 (고정)
-    html.Div([
-        # 로고/제목
+def chart_progress(graph_id):
+    """백그라운드로 그리는 차트의 '계산 중' 표시 (작업이 도는 동안만 보임)"""
+    return html.Span([
+        dbc.Spinner(size="sm", spinner_style={"margin-right": "6px"}),
+        "계산 중..."
+    ], id=f'{graph_id}-progress', style={"display": "none"})
+
+
+def build_layout(cube):
+    """대시보드 레이아웃 (큐브의 연도/자치구 목록과 전체 합계로 필터/통계 카드 초기값 구성)"""
+    # 년도 범위
+    years = [int(year) for year in cube.years]
+
+    # 자치구 목록
+    districts = sorted(cube.districts)
+
+    # 통계 카드 초기값 (전체 기간/전체 자치구)
+    initial_totals = cube.totals(cube.select())
+
+    return html.Div([
+        # 왼쪽 사이드바 (고정)
         html.Div([
-            html.H3([
-                html.I(className="fas fa-car-crash", 
-                       style={"margin-right": "10px", "color": "#3b82f6"}),
-                "FILTERS"
-            ], style={
-                "color": "#1e40af",
-                "margin-bottom": "10px",
-                "font-size": "1.3rem",
-                "font-weight": "700",
-                "letter-spacing": "1px"
-            }),
-            html.Hr(style={"border-color": "#3b82f6", "opacity": "0.5"}),
-        ], style={"margin-bottom": "25px"}),
+            # 로고/제목
+            html.Div([
+                html.H3([
+                    html.I(className="fas fa-car-crash", 
+                           style={"margin-right": "10px", "color": "#3b82f6"}),
+                    "FILTERS"
+                ], style={
+                    "color": "#1e40af",
+                    "margin-bottom": "10px",
+                    "font-size": "1.3rem",
+                    "font-weight": "700",
+                    "letter-spacing": "1px"
+                }),
+                html.Hr(style={"border-color": "#3b82f6", "opacity": "0.5"}),
+            ], style={"margin-bottom": "25px"}),
         
-        # 연도 범위 필터
-        html.Div([
-            html.Label([
-                html.I(className="fas fa-calendar-check", 
-                       style={"margin-right": "8px", "color": "#3b82f6"}),
-                "연도 범위"
-            ], style={
-                "font-weight": "bold",
-                "font-size": "0.95rem",
-                "color": "#1e293b",
-                "margin-bottom": "10px",
-                "display": "block"
-            }),
-            dcc.RangeSlider(
-                id='year-slider',
-                min=min_year,
-                max=max_year,
-                value=[min_year, max_year],
-                marks={str(year): {
-                    'label': str(year),
-                    'style': {'font-weight': 'bold', 'font-size': '0.75rem', 'color': '#1e293b'}
-                } for year in years},
-                step=1,
-                tooltip={"placement": "bottom", "always_visible": True}
-            )
-        ], style={"margin-bottom": "30px"}),
+            # 연도 범위 필터
+            html.Div([
+                html.Label([
+                    html.I(className="fas fa-calendar-check", 
+                           style={"margin-right": "8px", "color": "#3b82f6"}),
+                    "연도 범위"
+                ], style={
+                    "font-weight": "bold",
+                    "font-size": "0.95rem",
+                    "color": "#1e293b",
+                    "margin-bottom": "10px",
+                    "display": "block"
+                }),
+                dcc.RangeSlider(
+                    id='year-slider',
+                    min=min_year,
+                    max=max_year,
+                    value=[min_year, max_year],
+                    marks={str(year): {
+                        'label': str(year),
+                        'style': {'font-weight': 'bold', 'font-size': '0.75rem', 'color': '#1e293b'}
+                    } for year in years},
+                    step=1,
+                    tooltip={"placement": "bottom", "always_visible": True}
+                )
+            ], style={"margin-bottom": "30px"}),
         
-        # 자치구 선택
-        html.Div([
-            html.Label([
-                html.I(className="fas fa-map-marked-alt", 
-                       style={"margin-right": "8px", "color": "#3b82f6"}),
-                "자치구 선택"
-            ], style={
-                "font-weight": "bold",
-                "font-size": "0.95rem",
-                "color": "#1e293b",
-                "margin-bottom": "10px",
-                "display": "block"
-            }),
-            dcc.Dropdown(
-                id='district-dropdown',
-                options=[{'label': dist, 'value': dist} for dist in districts],
-                value=[],
-                multi=True,
-                placeholder="전체 자치구",
-                style={"font-size": "0.9rem"}
-            )
-        ], style={"margin-bottom": "30px"}),
+            # 자치구 선택
+            html.Div([
+                html.Label([
+                    html.I(className="fas fa-map-marked-alt", 
+                           style={"margin-right": "8px", "color": "#3b82f6"}),
+                    "자치구 선택"
+                ], style={
+                    "font-weight": "bold",
+                    "font-size": "0.95rem",
+                    "color": "#1e293b",
+                    "margin-bottom": "10px",
+                    "display": "block"
+                }),
+                dcc.Dropdown(
+                    id='district-dropdown',
+                    options=[{'label': dist, 'value': dist} for dist in districts],
+                    value=[],
+                    multi=True,
+                    placeholder="전체 자치구",
+                    style={"font-size": "0.9rem"}
+                )
+            ], style={"margin-bottom": "30px"}),
         
-        # 기상 조건 선택
-        html.Div([
-            html.Label([
-                html.I(className="fas fa-cloud-sun", 
-                       style={"margin-right": "8px", "color": "#3b82f6"}),
-                "기상 조건"
-            ], style={
-                "font-weight": "bold",
-                "font-size": "0.95rem",
-                "color": "#1e293b",
-                "margin-bottom": "10px",
-                "display": "block"
-            }),
-            dcc.Checklist(
-                id='weather-checklist',
-                options=[{'label': w, 'value': w} for w in weather_conditions],
-                value=weather_conditions,
-                style={"font-size": "0.85rem"},
-                labelStyle={"display": "block", "margin-bottom": "8px"}
-            )
-        ], style={"margin-bottom": "30px"}),
+            # 기상 조건 선택
+            html.Div([
+                html.Label([
+                    html.I(className="fas fa-cloud-sun", 
+                           style={"margin-right": "8px", "color": "#3b82f6"}),
+                    "기상 조건"
+                ], style={
+                    "font-weight": "bold",
+                    "font-size": "0.95rem",
+                    "color": "#1e293b",
+                    "margin-bottom": "10px",
+                    "display": "block"
+                }),
+                dcc.Checklist(
+                    id='weather-checklist',
+                    options=[{'label': w, 'value': w} for w in weather_conditions],
+                    value=weather_conditions,
+                    style={"font-size": "0.85rem"},
+                    labelStyle={"display": "block", "margin-bottom": "8px"}
+                )
+            ], style={"margin-bottom": "30px"}),
         
         
-        # 푸터 정보
-        html.Hr(style={"border-color": "#3b82f6", "opacity": "0.3", "margin-top": "30px"}),
-        html.Div([
-            html.P([
-                html.I(className="fas fa-database", 
-                       style={"margin-right": "5px", "color": "#3b82f6"}),
-                "2020-2024"
-            ], style={"font-size": "0.8rem", "color": "#64748b", "margin-bottom": "5px"}),
-            html.P([
-                html.I(className="fas fa-map-marked-alt", 
-                       style={"margin-right": "5px", "color": "#3b82f6"}),
-                "25개 자치구"
-            ], style={"font-size": "0.8rem", "color": "#64748b", "margin-bottom": "5px"}),
-        ])
+            # 푸터 정보
+            html.Hr(style={"border-color": "#3b82f6", "opacity": "0.3", "margin-top": "30px"}),
+            html.Div([
+                html.P([
+                    html.I(className="fas fa-database", 
+                           style={"margin-right": "5px", "color": "#3b82f6"}),
+                    "2020-2024"
+                ], style={"font-size": "0.8rem", "color": "#64748b", "margin-bottom": "5px"}),
+                html.P([
+                    html.I(className="fas fa-map-marked-alt", 
+                           style={"margin-right": "5px", "color": "#3b82f6"}),
+                    "25개 자치구"
+                ], style={"font-size": "0.8rem", "color": "#64748b", "margin-bottom": "5px"}),
+            ])
         
-    ], className="sidebar"),
+        ], className="sidebar"),
     
-    # 오른쪽 메인 콘텐츠
-    html.Div([
-        # 헤더
+        # 오른쪽 메인 콘텐츠
         html.Div([
-            html.H1(
-                [html.I(className="fas fa-car-crash", 
-                        style={"margin-right": "15px", "color": "#3b82f6"}),
-                 "서울시 교통사고 안전 대시보드"],
-                style={
-                    "color": "#1e40af",
-                    "font-weight": "700",
-                    "letter-spacing": "2px",
-                    "margin-bottom": "10px"
-                }
-            ),
-            html.P(
-                "Seoul Traffic Accident Safety Dashboard",
-                style={
-                    "font-size": "1.1rem",
-                    "color": "#64748b",
-                    "letter-spacing": "1px",
-                    "margin-bottom": "20px"
-                }
-            ),
-            html.Hr(style={
-                "border-top": "3px solid #3b82f6",
-                "opacity": "0.3",
-                "margin-bottom": "30px"
-            })
-        ]),
-        
-        # 통계 카드 (1행 4열)
-        dbc.Row([
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardBody([
-                        html.I(className="fas fa-exclamation-triangle fa-2x",
-                               style={"color": "#3b82f6", "margin-bottom": "10px"}),
-                        html.H6("TOTAL ACCIDENTS",
-                               style={"color": "#64748b", "font-size": "0.75rem", "letter-spacing": "1px"}),
-                        html.H2([
-                            html.Span(f"{df_district['발생건수'].sum():,.0f}",
-                                     id="total-accidents",
-                                     style={"color": "#1e40af", "font-weight": "700"}),
-                            html.Span(" 건", style={"color": "#64748b", "font-size": "1.2rem", "font-weight": "500"})
-                        ], style={"margin": "10px 0"})
-                    ], style={"text-align": "center"})
-                ], style={
-                    "border": "2px solid #3b82f6",
-                    "box-shadow": "0 4px 15px rgba(59, 130, 246, 0.2)"
+            # 헤더
+            html.Div([
+                html.H1(
+                    [html.I(className="fas fa-car-crash", 
+                            style={"margin-right": "15px", "color": "#3b82f6"}),
+                     "서울시 교통사고 안전 대시보드"],
+                    style={
+                        "color": "#1e40af",
+                        "font-weight": "700",
+                        "letter-spacing": "2px",
+                        "margin-bottom": "10px"
+                    }
+                ),
+                html.P(
+                    "Seoul Traffic Accident Safety Dashboard",
+                    style={
+                        "font-size": "1.1rem",
+                        "color": "#64748b",
+                        "letter-spacing": "1px",
+                        "margin-bottom": "20px"
+                    }
+                ),
+                html.Hr(style={
+                    "border-top": "3px solid #3b82f6",
+                    "opacity": "0.3",
+                    "margin-bottom": "30px"
                 })
-            ], width=12, lg=3, md=6, className="mb-3"),
+            ]),
+        
+            # 통계 카드 (1행 4열)
+            dbc.Row([
+                dbc.Col([
+                    dbc.Card([
+                        dbc.CardBody([
+                            html.I(className="fas fa-exclamation-triangle fa-2x",
+                                   style={"color": "#3b82f6", "margin-bottom": "10px"}),
+                            html.H6("TOTAL ACCIDENTS",
+                                   style={"color": "#64748b", "font-size": "0.75rem", "letter-spacing": "1px"}),
+                            html.H2([
+                                html.Span(f"{initial_totals['발생건수']:,.0f}",
+                                         id="total-accidents",
+                                         style={"color": "#1e40af", "font-weight": "700"}),
+                                html.Span(" 건", style={"color": "#64748b", "font-size": "1.2rem", "font-weight": "500"})
+                            ], style={"margin": "10px 0"})
+                        ], style={"text-align": "center"})
+                    ], style={
+                        "border": "2px solid #3b82f6",
+                        "box-shadow": "0 4px 15px rgba(59, 130, 246, 0.2)"
+                    })
+                ], width=12, lg=3, md=6, className="mb-3"),
             
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardBody([
-                        html.I(className="fas fa-skull-crossbones fa-2x",
-                               style={"color": "#ef4444", "margin-bottom": "10px"}),
-                        html.H6("DEATHS",
-                               style={"color": "#64748b", "font-size": "0.75rem", "letter-spacing": "1px"}),
-                        html.H2([
-                            html.Span(f"{df_district['사망자수'].sum():,.0f}",
-                                     id="total-deaths",
-                                     style={"color": "#dc2626", "font-weight": "700"}),
-                            html.Span(" 명", style={"color": "#64748b", "font-size": "1.2rem", "font-weight": "500"})
-                        ], style={"margin": "10px 0"})
-                    ], style={"text-align": "center"})
-                ], style={
-                    "border": "2px solid #ef4444",
-                    "box-shadow": "0 4px 15px rgba(239, 68, 68, 0.2)"
-                })
-            ], width=12, lg=3, md=6, className="mb-3"),
+                dbc.Col([
+                    dbc.Card([
+                        dbc.CardBody([
+                            html.I(className="fas fa-skull-crossbones fa-2x",
+                                   style={"color": "#ef4444", "margin-bottom": "10px"}),
+                            html.H6("DEATHS",
+                                   style={"color": "#64748b", "font-size": "0.75rem", "letter-spacing": "1px"}),
+                            html.H2([
+                                html.Span(f"{initial_totals['사망자수']:,.0f}",
+                                         id="total-deaths",
+                                         style={"color": "#dc2626", "font-weight": "700"}),
+                                html.Span(" 명", style={"color": "#64748b", "font-size": "1.2rem", "font-weight": "500"})
+                            ], style={"margin": "10px 0"})
+                        ], style={"text-align": "center"})
+                    ], style={
+                        "border": "2px solid #ef4444",
+                        "box-shadow": "0 4px 15px rgba(239, 68, 68, 0.2)"
+                    })
+                ], width=12, lg=3, md=6, className="mb-3"),
             
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardBody([
-                        html.I(className="fas fa-user-injured fa-2x",
-                               style={"color": "#f59e0b", "margin-bottom": "10px"}),
-                        html.H6("INJURIES",
-                               style={"color": "#64748b", "font-size": "0.75rem", "letter-spacing": "1px"}),
-                        html.H2([
-                            html.Span(f"{df_district['부상자수'].sum():,.0f}",
-                                     id="total-injuries",
-                                     style={"color": "#d97706", "font-weight": "700"}),
-                            html.Span(" 명", style={"color": "#64748b", "font-size": "1.2rem", "font-weight": "500"})
-                        ], style={"margin": "10px 0"})
-                    ], style={"text-align": "center"})
-                ], style={
-                    "border": "2px solid #f59e0b",
-                    "box-shadow": "0 4px 15px rgba(245, 158, 11, 0.2)"
-                })
-            ], width=12, lg=3, md=6, className="mb-3"),
+                dbc.Col([
+                    dbc.Card([
+                        dbc.CardBody([
+                            html.I(className="fas fa-user-injured fa-2x",
+                                   style={"color": "#f59e0b", "margin-bottom": "10px"}),
+                            html.H6("INJURIES",
+                                   style={"color": "#64748b", "font-size": "0.75rem", "letter-spacing": "1px"}),
+                            html.H2([
+                                html.Span(f"{initial_totals['부상자수']:,.0f}",
+                                         id="total-injuries",
+                                         style={"color": "#d97706", "font-weight": "700"}),
+                                html.Span(" 명", style={"color": "#64748b", "font-size": "1.2rem", "font-weight": "500"})
+                            ], style={"margin": "10px 0"})
+                        ], style={"text-align": "center"})
+                    ], style={
+                        "border": "2px solid #f59e0b",
+                        "box-shadow": "0 4px 15px rgba(245, 158, 11, 0.2)"
+                    })
+                ], width=12, lg=3, md=6, className="mb-3"),
             
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardBody([
-                        html.I(className="fas fa-clock fa-2x",
-                               style={"color": "#06b6d4", "margin-bottom": "10px"}),
-                        html.H6("PERIOD",
-                               style={"color": "#64748b", "font-size": "0.75rem", "letter-spacing": "1px"}),
-                        html.H2([
-                            html.Span(f"{min_year}~{max_year}",
-                                     style={"color": "#0891b2", "font-weight": "700"})
-                        ], style={"margin": "10px 0"})
-                    ], style={"text-align": "center"})
-                ], style={
-                    "border": "2px solid #06b6d4",
-                    "box-shadow": "0 4px 15px rgba(6, 182, 212, 0.2)"
-                })
-            ], width=12, lg=3, md=6, className="mb-3"),
-        ], className="mb-4"),
+                dbc.Col([
+                    dbc.Card([
+                        dbc.CardBody([
+                            html.I(className="fas fa-clock fa-2x",
+                                   style={"color": "#06b6d4", "margin-bottom": "10px"}),
+                            html.H6("PERIOD",
+                                   style={"color": "#64748b", "font-size": "0.75rem", "letter-spacing": "1px"}),
+                            html.H2([
+                                html.Span(f"{min_year}~{max_year}",
+                                         style={"color": "#0891b2", "font-weight": "700"})
+                            ], style={"margin": "10px 0"})
+                        ], style={"text-align": "center"})
+                    ], style={
+                        "border": "2px solid #06b6d4",
+                        "box-shadow": "0 4px 15px rgba(6, 182, 212, 0.2)"
+                    })
+                ], width=12, lg=3, md=6, className="mb-3"),
+            ], className="mb-4"),
         
-        # 2x2 그리드 레이아웃
-        # 첫 번째 행 (지도 + 랭킹)
-        dbc.Row([
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardHeader([
-                        html.I(className="fas fa-map-marked-alt",
-                               style={"margin-right": "8px"}),
-                        "서울시 자치구별 지도"
-                    ]),
-                    dbc.CardBody([
-                        dcc.Dropdown(
-                            id='map-metric-dropdown',
-                            options=[
-                                {'label': '총 사상자 수', 'value': 'total'},
-                                {'label': '사망자 수', 'value': 'deaths'},
-                                {'label': '부상자 수', 'value': 'injuries'},
-                                {'label': '발생 건수', 'value': 'count'}
-                            ],
-                            value='total',
-                            clearable=False,
-                            style={"margin-bottom": "10px"}
-                        ),
-                        dcc.Graph(id='map-chart', config={'displayModeBar': False},
-                                 style={"height": "500px"})
-                    ])
-                ], className="mb-3")
-            ], width=12, lg=6, md=12),
+            # 2x2 그리드 레이아웃
+            # 첫 번째 행 (지도 + 랭킹)
+            dbc.Row([
+                dbc.Col([
+                    dbc.Card([
+                        dbc.CardHeader([
+                            html.I(className="fas fa-map-marked-alt",
+                                   style={"margin-right": "8px"}),
+                            "서울시 자치구별 지도",
+                            chart_progress('map-chart')
+                        ]),
+                        dbc.CardBody([
+                            dcc.Dropdown(
+                                id='map-metric-dropdown',
+                                options=[
+                                    {'label': '총 사상자 수', 'value': 'total'},
+                                    {'label': '사망자 수', 'value': 'deaths'},
+                                    {'label': '부상자 수', 'value': 'injuries'},
+                                    {'label': '발생 건수', 'value': 'count'}
+                                ],
+                                value='total',
+                                clearable=False,
+                                style={"margin-bottom": "10px"}
+                            ),
+                            dcc.Graph(id='map-chart', config={'displayModeBar': False},
+                                     style={"height": "500px"})
+                        ])
+                    ], className="mb-3")
+                ], width=12, lg=6, md=12),
             
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardHeader([
-                        html.I(className="fas fa-trophy",
-                               style={"margin-right": "8px"}),
-                        "TOP 10 다발지역"
-                    ]),
-                    dbc.CardBody([
-                        dcc.Graph(id='ranking-chart', config={'displayModeBar': False},
-                                 style={"height": "500px"})
-                    ])
-                ], className="mb-3")
-            ], width=12, lg=6, md=12),
-        ]),
+                dbc.Col([
+                    dbc.Card([
+                        dbc.CardHeader([
+                            html.I(className="fas fa-trophy",
+                                   style={"margin-right": "8px"}),
+                            "TOP 10 다발지역"
+                        ]),
+                        dbc.CardBody([
+                            dcc.Graph(id='ranking-chart', config={'displayModeBar': False},
+                                     style={"height": "500px"})
+                        ])
+                    ], className="mb-3")
+                ], width=12, lg=6, md=12),
+            ]),
         
-        # 두 번째 행 (연도별 + 기상별)
-        dbc.Row([
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardHeader([
-                        html.I(className="fas fa-chart-line",
-                               style={"margin-right": "8px"}),
-                        "연도별 추이"
-                    ]),
-                    dbc.CardBody([
-                        dcc.Graph(id='trend-chart', config={'displayModeBar': False},
-                                 style={"height": "500px"})
-                    ])
-                ], className="mb-3")
-            ], width=12, lg=6, md=12),
+            # 두 번째 행 (연도별 + 기상별)
+            dbc.Row([
+                dbc.Col([
+                    dbc.Card([
+                        dbc.CardHeader([
+                            html.I(className="fas fa-chart-line",
+                                   style={"margin-right": "8px"}),
+                            "연도별 추이"
+                        ]),
+                        dbc.CardBody([
+                            dcc.Graph(id='trend-chart', config={'displayModeBar': False},
+                                     style={"height": "500px"})
+                        ])
+                    ], className="mb-3")
+                ], width=12, lg=6, md=12),
             
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardHeader([
-                        html.I(className="fas fa-cloud-sun",
-                               style={"margin-right": "8px"}),
-                        "기상별 분석"
-                    ]),
-                    dbc.CardBody([
-                        dcc.RadioItems(
-                            id='weather-metric-radio',
-                            options=[
-                                {'label': ' 사망자', 'value': 'deaths'},
-                                {'label': ' 부상자', 'value': 'injuries'}
-                            ],
-                            value='deaths',
-                            inline=True,
-                            style={"margin-bottom": "10px"},
-                            labelStyle={"margin-right": "15px"}
-                        ),
-                        dcc.Graph(id='weather-chart', config={'displayModeBar': False},
-                                 style={"height": "470px"})
-                    ])
-                ], className="mb-3")
-            ], width=12, lg=6, md=12),
-        ]),
+                dbc.Col([
+                    dbc.Card([
+                        dbc.CardHeader([
+                            html.I(className="fas fa-cloud-sun",
+                                   style={"margin-right": "8px"}),
+                            "기상별 분석"
+                        ]),
+                        dbc.CardBody([
+                            dcc.RadioItems(
+                                id='weather-metric-radio',
+                                options=[
+                                    {'label': ' 사망자', 'value': 'deaths'},
+                                    {'label': ' 부상자', 'value': 'injuries'}
+                                ],
+                                value='deaths',
+                                inline=True,
+                                style={"margin-bottom": "10px"},
+                                labelStyle={"margin-right": "15px"}
+                            ),
+                            dcc.Graph(id='weather-chart', config={'displayModeBar': False},
+                                     style={"height": "470px"})
+                        ])
+                    ], className="mb-3")
+                ], width=12, lg=6, md=12),
+            ]),
         
-        # 세 번째 행 (차종별 + 히트맵을 2x1로 - 히트맵이 더 크게)
-        dbc.Row([
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardHeader([
-                        html.I(className="fas fa-car",
-                               style={"margin-right": "8px"}),
-                        "차종별 분석"
-                    ]),
-                    dbc.CardBody([
-                        dcc.Graph(id='vehicle-chart', config={'displayModeBar': False},
-                                 style={"height": "700px"})
-                    ])
-                ], className="mb-3")
-            ], width=12, lg=6, md=12),
+            # 세 번째 행 (차종별 + 히트맵을 2x1로 - 히트맵이 더 크게)
+            dbc.Row([
+                dbc.Col([
+                    dbc.Card([
+                        dbc.CardHeader([
+                            html.I(className="fas fa-car",
+                                   style={"margin-right": "8px"}),
+                            "차종별 분석"
+                        ]),
+                        dbc.CardBody([
+                            dcc.Graph(id='vehicle-chart', config={'displayModeBar': False},
+                                     style={"height": "700px"})
+                        ])
+                    ], className="mb-3")
+                ], width=12, lg=6, md=12),
             
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardHeader([
-                        html.I(className="fas fa-th",
-                               style={"margin-right": "8px"}),
-                        "자치구 × 연도 히트맵"
-                    ]),
-                    dbc.CardBody([
-                        html.Div([
-                            dcc.Graph(id='heatmap-chart', config={'displayModeBar': False},
-                                     style={"height": "700px", "width": "100%"})
-                        ], style={"max-height": "700px", "overflow": "hidden"})
-                    ], style={"padding": "10px", "overflow": "hidden"})
-                ], className="mb-3", style={"max-height": "780px", "overflow": "hidden"})
-            ], width=12, lg=6, md=12),
-        ]),
+                dbc.Col([
+                    dbc.Card([
+                        dbc.CardHeader([
+                            html.I(className="fas fa-th",
+                                   style={"margin-right": "8px"}),
+                            "자치구 × 연도 히트맵",
+                            chart_progress('heatmap-chart')
+                        ]),
+                        dbc.CardBody([
+                            html.Div([
+                                dcc.Graph(id='heatmap-chart', config={'displayModeBar': False},
+                                         style={"height": "700px", "width": "100%"})
+                            ], style={"max-height": "700px", "overflow": "hidden"})
+                        ], style={"padding": "10px", "overflow": "hidden"})
+                    ], className="mb-3", style={"max-height": "780px", "overflow": "hidden"})
+                ], width=12, lg=6, md=12),
+            ]),
         
-        # 푸터
-        html.Hr(style={"border-top": "2px solid #3b82f6", "opacity": "0.3", "margin-top": "40px"}),
-        html.Div([
-            html.P([
-                html.I(className="fas fa-copyright", style={"margin-right": "5px"}),
-                "2024 서울시 교통사고 안전 대시보드"
-            ], style={"color": "#94a3b8", "font-size": "0.9rem", "text-align": "center", "margin-bottom": "10px"}),
-            html.P([
-                html.I(className="fas fa-database", style={"margin-right": "5px"}),
-                "데이터 출처: 서울 열린데이터광장"
-            ], style={"color": "#94a3b8", "font-size": "0.9rem", "text-align": "center"})
-        ], style={"padding": "20px 0"})
+            # 푸터
+            html.Hr(style={"border-top": "2px solid #3b82f6", "opacity": "0.3", "margin-top": "40px"}),
+            html.Div([
+                html.P([
+                    html.I(className="fas fa-copyright", style={"margin-right": "5px"}),
+                    "2024 서울시 교통사고 안전 대시보드"
+                ], style={"color": "#94a3b8", "font-size": "0.9rem", "text-align": "center", "margin-bottom": "10px"}),
+                html.P([
+                    html.I(className="fas fa-database", style={"margin-right": "5px"}),
+                    "데이터 출처: 서울 열린데이터광장"
+                ], style={"color": "#94a3b8", "font-size": "0.9rem", "text-align": "center"})
+            ], style={"padding": "20px 0"}),
+        
+            # 차트별 Figure 구조 식별자 (부분 업데이트 판단용)
+            html.Div([dcc.Store(id=f'{graph_id}-signature') for graph_id in GRAPH_IDS]),
         
-    ], className="main-content")
-], style={"margin": "0", "padding": "0"})
+            # 브라우저 지표 전환용 표시 정보 (지도/기상별 지표 선택은 서버 요청 없이 처리)
+            dcc.Store(id='metric-specs', data=metric_specs())
+        
+        ], className="main-content")
+    ], style={"margin": "0", "padding": "0"})
+
+
+def loading_layout():
+    """데이터 준비 전 화면 (1초마다 준비 여부를 확인해 준비되면 새로고침)"""
+    return html.Div([
+        dbc.Spinner(color="primary", spinner_style={"width": "3rem", "height": "3rem"}),
+        html.H4("데이터 준비 중...", style={"margin-top": "20px"}),
+        html.P(id='startup-message', style={"color": "#64748b"}),
+        dcc.Interval(id='startup-poll', interval=1000),
+        dcc.Store(id='startup-ready'),
+    ], style={"text-align": "center", "padding-top": "30vh"})
+
+
+_layout_cache = (None, None)  # (데이터 버전, 레이아웃)
+
+
+def serve_layout():
+    """페이지 요청마다 호출: 준비 전에는 로딩 화면, 이후에는 데이터 버전별로 한 번 만든 레이아웃"""
+    global _layout_cache
+    current, version = current_data()
+    if current is None:
+        return loading_layout()
+    cached_version, layout = _layout_cache
+    if cached_version != version:
+        layout = build_layout(current)
+        _layout_cache = (version, layout)
+    return layout
+
+
+app.layout = serve_layout
+
+
+@app.callback(
+    [Output('startup-ready', 'data'), Output('startup-message', 'children')],
+    Input('startup-poll', 'n_intervals')
+)
+def poll_startup(n_intervals):
+    """로딩 화면: 준비되면 startup-ready를 True로 (실패하면 에러 메시지 표시)"""
+    if is_ready():
+        return True, ""
+    if load_error:
+        return False, f"데이터 로딩 실패: {load_error}"
+    raise PreventUpdate
+
+
+# 준비되면 브라우저에서 페이지를 다시 불러 대시보드 레이아웃을 받음
+app.clientside_callback(
+    """
+    function(ready) {
+        if (ready) {
+            window.location.reload();
+        }
+        return window.dash_clientside.no_update;
+    }
+    """,
+    Output('startup-poll', 'disabled'),
+    Input('startup-ready', 'data')
+)
+
+
+def chart_figure(key, builder, version):
+    """
+    figure_cache에서 Figure를 찾거나 builder()로 만들어 저장
+
+    백그라운드 작업 프로세스에서는 캐시를 거치지 않고 바로 만듭니다
+    (작업 프로세스가 끝나면 저장한 값도 사라지고, 결과는 jobs의 diskcache에 입력값 기준으로 남음).
+    실패 안내 Figure(경계 파일 없음 등)는 저장하지 않아 원인이 해결되면 다음 요청에서 다시 그립니다.
+    """
+    if in_background_job():
+        return builder()
+    return figure_cache.get_or_create(key, builder, data_version=version,
+                                      cacheable=lambda fig: not is_failed_figure(fig))
+
+
+def select_data(cube, year_range, selected_districts):
+    """연도 범위/자치구 선택을 큐브 인덱스로 변환 (빈 선택이면 전체, cube는 콜백이 읽은 current_data())"""
+    selection = cube.select(year_range, selected_districts)
+    if selection.empty:
+        selection = cube.select()
+    return selection
+
+
+def log_callback_error(e):
+    print(f"❌ 콜백 에러: {e}")
+    import traceback
+    traceback.print_exc()
+
+
+# 콜백: 차트마다 실제로 사용하는 입력만 연결 (바뀐 입력에 해당하는 차트만 다시 그림)
+# 같은 필터 조합은 figure_cache에서 직렬화된 Figure를 바로 반환
+# 지도/히트맵은 백그라운드 작업으로 실행 (슬라이더 드래그 중 이전 작업은 종료됨)
+# 지도/기상별 지표 선택은 State로만 읽고, 지표 전환 자체는 아래 clientside 콜백이 브라우저에서 처리
+@app.callback(
+    [Output('map-chart', 'figure'), Output('map-chart-signature', 'data')],
+    [Input('year-slider', 'value'), Input('district-dropdown', 'value')],
+    [State('map-metric-dropdown', 'value'), State('map-chart-signature', 'data')],
+    **background_options(background_manager, 'map-chart')
+)
+def update_map(year_range, selected_districts, map_metric, signature):
+    """지도 업데이트"""
+    cube, version = current_data()
+    try:
+        fig = chart_figure(
+            filter_key('map', year_range, selected_districts, metric=map_metric),
+            lambda: create_map_chart(
+                cube.district_totals(select_data(cube, year_range, selected_districts)), map_metric),
+            version
+        )
+    except Exception as e:
+        log_callback_error(e)
+        fig = create_map_chart(cube.district_totals(cube.select()), 'total')
+    return figure_update(fig, signature)
+
+
+@app.callback(
+    [Output('trend-chart', 'figure'), Output('trend-chart-signature', 'data')],
+    [Input('year-slider', 'value'), Input('district-dropdown', 'value')],
+    State('trend-chart-signature', 'data')
+)
+def update_trend(year_range, selected_districts, signature):
+    """연도별 추이 업데이트"""
+    cube, version = current_data()
+    try:
+        fig = chart_figure(
+            filter_key('trend', year_range, selected_districts),
+            lambda: create_trend_chart(
+                cube.district_frame(select_data(cube, year_range, selected_districts)), selected_districts),
+            version
+        )
+    except Exception as e:
+        log_callback_error(e)
+        fig = create_trend_chart(cube.district_frame(cube.select()), [])
+    return figure_update(fig, signature)
+
+
+@app.callback(
+    [Output('weather-chart', 'figure'), Output('weather-chart-signature', 'data')],
+    [
+        Input('year-slider', 'value'),
+        Input('district-dropdown', 'value'),
+        Input('weather-checklist', 'value')
+    ],
+    [State('weather-metric-radio', 'value'), State('weather-chart-signature', 'data')]
+)
+def update_weather(year_range, selected_districts, selected_weather, weather_metric, signature):
+    """기상별 분석 업데이트"""
+    cube, version = current_data()
+    try:
+        fig = chart_figure(
+            filter_key('weather', year_range, selected_districts, selected_weather, weather_metric),
+            lambda: create_weather_chart(
+                cube.weather_totals(select_data(cube, year_range, selected_districts), selected_weather),
+                weather_metric),
+            version
+        )
+    except Exception as e:
+        log_callback_error(e)
+        fig = create_weather_chart(cube.weather_totals(cube.select()), 'deaths')
+    return figure_update(fig, signature)
+
+
+# 지도 지표 전환: customdata에 담긴 네 지표 중 선택한 값으로 색상 값과 제목만 교체
+app.clientside_callback(
+    """
+    function(metric, figure, specs) {
+        var spec = specs && specs.map[metric];
+        if (!spec || !figure || !figure.data || !figure.data.length || !figure.data[0].customdata) {
+            return window.dash_clientside.no_update;
+        }
+        var trace = Object.assign({}, figure.data[0], {
+            z: figure.data[0].customdata.map(function(row) { return row[spec.index]; })
+        });
+        var layout = Object.assign({}, figure.layout);
+        layout.title = Object.assign({}, layout.title, {text: spec.title});
+        var coloraxis = Object.assign({}, layout.coloraxis);
+        var colorbar = Object.assign({}, coloraxis.colorbar);
+        colorbar.title = Object.assign({}, colorbar.title, {text: spec.colorbar});
+        coloraxis.colorbar = colorbar;
+        layout.coloraxis = coloraxis;
+        return Object.assign({}, figure, {data: [trace].concat(figure.data.slice(1)), layout: layout});
+    }
+    """,
+    Output('map-chart', 'figure', allow_duplicate=True),
+    Input('map-metric-dropdown', 'value'),
+    [State('map-chart', 'figure'), State('metric-specs', 'data')],
+    prevent_initial_call=True
+)
+
+
+# 기상별 지표 전환: customdata에 담긴 사망자/부상자 중 선택한 값으로 막대와 이름/색상만 교체
+app.clientside_callback(
+    """
+    function(metric, figure, specs) {
+        var spec = specs && specs.weather[metric];
+        if (!spec || !figure || !figure.data || !figure.data.length || !figure.data[0].customdata) {
+            return window.dash_clientside.no_update;
+        }
+        var values = figure.data[0].customdata.map(function(row) { return row[spec.index]; });
+        var trace = Object.assign({}, figure.data[0], {
+            y: values,
+            text: values,
+            name: spec.name,
+            hovertemplate: spec.hovertemplate,
+            marker: Object.assign({}, figure.data[0].marker, {color: spec.color})
+        });
+        return Object.assign({}, figure, {data: [trace].concat(figure.data.slice(1))});
+    }
+    """,
+    Output('weather-chart', 'figure', allow_duplicate=True),
+    Input('weather-metric-radio', 'value'),
+    [State('weather-chart', 'figure'), State('metric-specs', 'data')],
+    prevent_initial_call=True
+)
+
+
+@app.callback(
+    [Output('vehicle-chart', 'figure'), Output('vehicle-chart-signature', 'data')],
+    [Input('year-slider', 'value'), Input('district-dropdown', 'value')],
+    State('vehicle-chart-signature', 'data')
+)
+def update_vehicle(year_range, selected_districts, signature):
+    """차종별 분석 업데이트"""
+    cube, version = current_data()
+    try:
+        fig = chart_figure(
+            filter_key('vehicle', year_range, selected_districts),
+            lambda: create_vehicle_chart(cube.vehicle_totals(select_data(cube, year_range, selected_districts))),
+            version
+        )
+    except Exception as e:
+        log_callback_error(e)
+        fig = create_vehicle_chart(cube.vehicle_totals(cube.select()))
+    return figure_update(fig, signature)
+
+
+@app.callback(
+    [Output('heatmap-chart', 'figure'), Output('heatmap-chart-signature', 'data')],
+    [Input('year-slider', 'value'), Input('district-dropdown', 'value')],
+    State('heatmap-chart-signature', 'data'),
+    **background_options(background_manager, 'heatmap-chart')
+)
+def update_heatmap(year_range, selected_districts, signature):
+    """자치구 × 연도 히트맵 업데이트"""
+    cube, version = current_data()
+    try:
+        fig = chart_figure(
+            filter_key('heatmap', year_range, selected_districts),
+            lambda: create_heatmap_chart(cube.district_frame(select_data(cube, year_range, selected_districts))),
+            version
+        )
+    except Exception as e:
+        log_callback_error(e)
+        fig = create_heatmap_chart(cube.district_frame(cube.select()))
+    return figure_update(fig, signature)
+
+
+@app.callback(
+    [Output('ranking-chart', 'figure'), Output('ranking-chart-signature', 'data')],
+    [Input('year-slider', 'value'), Input('district-dropdown', 'value')],
+    State('ranking-chart-signature', 'data')
+)
+def update_ranking(year_range, selected_districts, signature):
+    """TOP 10 랭킹 업데이트"""
+    cube, version = current_data()
+    try:
+        fig = chart_figure(
+            filter_key('ranking', year_range, selected_districts),
+            lambda: create_ranking_chart(cube.district_frame(select_data(cube, year_range, selected_districts))),
+            version
+        )
+    except Exception as e:
+        log_callback_error(e)
+        fig = create_ranking_chart(cube.district_frame(cube.select()))
+    return figure_update(fig, signature)
 
 
-# 콜백: 모든 차트 업데이트
 @app.callback(
     [
-        Output('map-chart', 'figure'),
-        Output('trend-chart', 'figure'),
-        Output('weather-chart', 'figure'),
-        Output('vehicle-chart', 'figure'),
-        Output('heatmap-chart', 'figure'),
-        Output('ranking-chart', 'figure'),
         Output('total-accidents', 'children'),
         Output('total-deaths', 'children'),
         Output('total-injuries', 'children'),
     ],
-    [
-        Input('year-slider', 'value'),
-        Input('district-dropdown', 'value'),
-        Input('weather-checklist', 'value'),
-        Input('map-metric-dropdown', 'value'),
-        Input('weather-metric-radio', 'value')
-    ]
+    [Input('year-slider', 'value'), Input('district-dropdown', 'value')]
 )
-def update_charts(year_range, selected_districts, selected_weather, map_metric, weather_metric):
-    """모든 차트와 통계를 업데이트"""
-    
+def update_stats(year_range, selected_districts):
+    """통계 카드 업데이트 (숫자만 반환, 단위는 HTML에서 처리)"""
+    cube, _ = current_data()
     try:
-        # 데이터 필터링
-        # 1. 연도 필터
-        df_dist_filtered = df_district[
-            (df_district['연도'] >= year_range[0]) &
-            (df_district['연도'] <= year_range[1])
-        ].copy()
-        
-        df_weather_filtered = df_weather[
-            (df_weather['연도'] >= year_range[0]) &
-            (df_weather['연도'] <= year_range[1])
-        ].copy()
-        
-        df_vehicle_filtered = df_vehicle[
-            (df_vehicle['연도'] >= year_range[0]) &
-            (df_vehicle['연도'] <= year_range[1])
-        ].copy()
-        
-        # 2. 자치구 필터
-        if selected_districts and len(selected_districts) > 0:
-            df_dist_filtered = df_dist_filtered[df_dist_filtered['자치구'].isin(selected_districts)]
-            df_weather_filtered = df_weather_filtered[df_weather_filtered['자치구'].isin(selected_districts)]
-            df_vehicle_filtered = df_vehicle_filtered[df_vehicle_filtered['자치구'].isin(selected_districts)]
-        
-        # 3. 기상 필터
-        if selected_weather and len(selected_weather) > 0:
-            df_weather_filtered = df_weather_filtered[
-                df_weather_filtered['기상상태'].isin(selected_weather + ['소계'])
-            ]
-        
-        # 빈 데이터 체크
-        if len(df_dist_filtered) == 0:
-            df_dist_filtered = df_district.copy()
-        if len(df_weather_filtered) == 0:
-            df_weather_filtered = df_weather.copy()
-        if len(df_vehicle_filtered) == 0:
-            df_vehicle_filtered = df_vehicle.copy()
-        
-        # 차트 생성
-        fig_map = create_map_chart(df_dist_filtered, map_metric)
-        fig_trend = create_trend_chart(df_dist_filtered, selected_districts)
-        fig_weather = create_weather_chart(df_weather_filtered, weather_metric)
-        fig_vehicle = create_vehicle_chart(df_vehicle_filtered)
-        fig_heatmap = create_heatmap_chart(df_dist_filtered)
-        fig_ranking = create_ranking_chart(df_dist_filtered)
-        
-        # 통계 업데이트 (숫자만 반환, 단위는 HTML에서 처리)
-        total_accidents = f"{df_dist_filtered['발생건수'].sum():,.0f}"
-        total_deaths = f"{df_dist_filtered['사망자수'].sum():,.0f}"
-        total_injuries = f"{df_dist_filtered['부상자수'].sum():,.0f}"
-        
+        totals = cube.totals(select_data(cube, year_range, selected_districts))
         return (
-            fig_map, fig_trend, fig_weather, fig_vehicle,
-            fig_heatmap, fig_ranking,
-            total_accidents, total_deaths, total_injuries
+            f"{totals['발생건수']:,.0f}",
+            f"{totals['사망자수']:,.0f}",
+            f"{totals['부상자수']:,.0f}"
         )
-    
     except Exception as e:
-        print(f"❌ 콜백 에러: {e}")
-        import traceback
-        traceback.print_exc()
-        
-        # 에러 발생 시 기본 차트 반환
-        return (
-            create_map_chart(df_district, 'total'),
-            create_trend_chart(df_district, []),
-            create_weather_chart(df_weather, 'deaths'),
-            create_vehicle_chart(df_vehicle),
-            create_heatmap_chart(df_district),
-            create_ranking_chart(df_district),
-            "N/A", "N/A", "N/A"
-        )
+        log_callback_error(e)
+        return "N/A", "N/A", "N/A"
 
 
 # ✅ 배포용으로 수정
@@ -627,4 +1047,7 @@ if __name__ == '__main__':
     print("⏹️  종료: Ctrl + C")
     print("=" * 70 + "\n")
     
+    if lazy_start:
+        start_loading()
+    start_watching()
     app.run_server(debug=False, host='0.0.0.0', port=8050)
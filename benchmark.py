@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+성능 벤치마크 스크립트
+CSV 로드, 차트 생성, 콜백 전체 경로의 소요 시간을 측정해 JSON으로 저장합니다.
+
+사용법:
+    python benchmark.py                      # 전체 실행 → benchmarks/<시각>-<커밋>.json
+    python benchmark.py --scales 10 100      # 합성 데이터 배율 지정
+    python benchmark.py --only load          # 이름에 'load'가 들어간 항목만
+    python benchmark.py --compare benchmarks/이전결과.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RESULTS_DIR = 'benchmarks'
+
+# 콜백 전체 경로 측정용 필터 조합 (연도 범위, 자치구, 기상 조건, 지도 지표, 기상 지표)
+FILTER_SCENARIOS = {
+    'all': ([2020, 2024], [], ['맑음', '흐림', '비', '안개', '눈', '기타/불명'], 'total', 'deaths'),
+    'single_year': ([2024, 2024], [], ['맑음', '흐림', '비', '안개', '눈', '기타/불명'], 'count', 'deaths'),
+    'three_districts': ([2021, 2023], ['강남구', '송파구', '종로구'], ['비', '눈'], 'deaths', 'injuries'),
+    'one_district': ([2020, 2024], ['중구'], ['맑음'], 'injuries', 'deaths'),
+}
+
+
+def run_benchmark(func, min_rounds=5, min_time=0.5, max_rounds=200):
+    """func를 반복 실행해 소요 시간 통계 반환 (첫 실행은 워밍업으로 제외)"""
+    start = time.perf_counter()
+    func()
+    first = time.perf_counter() - start
+
+    timings = []
+    if first > min_time:
+        # 한 번에 오래 걸리는 항목은 워밍업 결과도 포함해 최소 횟수만 반복
+        timings.append(first)
+        min_rounds = 2
+    deadline = time.perf_counter() + min_time
+    while len(timings) < max_rounds and (len(timings) < min_rounds or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return {
+        'rounds': len(timings),
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.mean(timings),
+        'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+
+
+def write_test_geometry(districts, path):
+    """경계 파일이 없을 때 쓰는 격자형 가상 경계 (오프라인 벤치마크용)"""
+    features = []
+    for i, name in enumerate(districts):
+        x0 = 126.8 + (i % 5) * 0.06
+        y0 = 37.45 + (i // 5) * 0.04
+        ring = [[x0, y0], [x0 + 0.06, y0], [x0 + 0.06, y0 + 0.04], [x0, y0 + 0.04], [x0, y0]]
+        features.append({
+            'type': 'Feature',
+            'properties': {'name': name},
+            'geometry': {'type': 'Polygon', 'coordinates': [ring]},
+        })
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'type': 'FeatureCollection', 'features': features}, f, ensure_ascii=False)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def load_benchmarks(scales, workdir):
+    """load_*_data: 번들 CSV와 배율별 합성 CSV (지역 수 = 25 × 배율)"""
+    import preprocessing
+    from generate_data import generate_dataset
+
+    synthetic = {
+        factor: generate_dataset(os.path.join(workdir, f'x{factor}'), n_regions=25 * factor)
+        for factor in scales
+    }
+
+    loaders = {
+        'district': preprocessing.load_district_data,
+        'weather': preprocessing.load_weather_data,
+        'vehicle': preprocessing.load_vehicle_data,
+    }
+    sources = preprocessing.find_data_files()
+    cases = {}
+    for name, loader in loaders.items():
+        src = sources[name]
+        cases[f'load_{name}_data[x1]'] = (lambda loader=loader, src=src: loader(src))
+        for factor in scales:
+            dest = synthetic[factor][name]
+            cases[f'load_{name}_data[x{factor}]'] = (lambda loader=loader, dest=dest: loader(dest))
+    return cases
+
+
+def chart_benchmarks(app):
+    """charts.py의 모든 create_*_chart (전체 기간/전체 자치구 입력)"""
+    import charts
+
+    cube = app.cube
+    selection = cube.select()
+    district_frame = cube.district_frame(selection)
+    return {
+        'create_map_chart': lambda: charts.create_map_chart(cube.district_totals(selection), 'total'),
+        'create_trend_chart': lambda: charts.create_trend_chart(district_frame, []),
+        'create_trend_chart[districts]': lambda: charts.create_trend_chart(
+            district_frame, ['강남구', '송파구', '종로구']),
+        'create_weather_chart': lambda: charts.create_weather_chart(cube.weather_totals(selection), 'deaths'),
+        'create_vehicle_chart': lambda: charts.create_vehicle_chart(cube.vehicle_totals(selection)),
+        'create_heatmap_chart': lambda: charts.create_heatmap_chart(district_frame),
+        'create_ranking_chart': lambda: charts.create_ranking_chart(district_frame),
+        'create_comparison_chart': lambda: charts.create_comparison_chart(district_frame),
+    }
+
+
+def callback_benchmarks(app):
+    """필터 조합별 전체 콜백 경로 (캐시 비움/적중 각각)"""
+    from figure_cache import figure_cache
+
+    def update_all(year_range, districts, weather, map_metric, weather_metric):
+        app.update_map(year_range, districts, map_metric, None)
+        app.update_trend(year_range, districts, None)
+        app.update_weather(year_range, districts, weather, weather_metric, None)
+        app.update_vehicle(year_range, districts, None)
+        app.update_heatmap(year_range, districts, None)
+        app.update_ranking(year_range, districts, None)
+        app.update_stats(year_range, districts)
+
+    def cold(args):
+        figure_cache.clear()
+        update_all(*args)
+
+    cases = {}
+    for name, args in FILTER_SCENARIOS.items():
+        cases[f'update_charts[{name},cold]'] = (lambda args=args: cold(args))
+        cases[f'update_charts[{name},warm]'] = (lambda args=args: update_all(*args))
+    return cases
+
+
+def compare(results, baseline_path):
+    """이전 결과와 중앙값 비교 출력"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    print("\n" + "=" * 70)
+    print(f"📊 비교: {baseline['meta']['commit']} → {results['meta']['commit']}")
+    print("=" * 70)
+    for name, stats in results['benchmarks'].items():
+        old = baseline['benchmarks'].get(name)
+        if old is None:
+            continue
+        ratio = stats['median'] / old['median'] if old['median'] else float('inf')
+        mark = '🔺' if ratio > 1.1 else ('🔻' if ratio < 0.9 else '  ')
+        print(f"{mark} {name:<45} {old['median'] * 1000:10.2f}ms → {stats['median'] * 1000:10.2f}ms  (x{ratio:.2f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='대시보드 성능 벤치마크')
+    parser.add_argument('--scales', type=int, nargs='*', default=[10, 100, 1000],
+                        help='합성 CSV 배율 (기본: 10 100 1000)')
+    parser.add_argument('--only', help='이름에 이 문자열이 들어간 항목만 실행')
+    parser.add_argument('--output', help='결과 JSON 경로 (기본: benchmarks/<시각>-<커밋>.json)')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='dashboard-bench-')
+
+    # 지도는 항상 로컬 경계 파일로 측정 (없으면 가상 경계 사용)
+    from geo import GEOJSON_PATH_ENV, DEFAULT_GEOJSON_PATH
+    if not os.environ.get(GEOJSON_PATH_ENV) and not os.path.exists(DEFAULT_GEOJSON_PATH):
+        from preprocessing import load_and_clean_data
+        _, _, df_district = load_and_clean_data()
+        geometry_path = os.path.join(workdir, 'geometry.json')
+        write_test_geometry(list(dict.fromkeys(df_district['자치구'])), geometry_path)
+        os.environ[GEOJSON_PATH_ENV] = geometry_path
+        print(f"⚠️ {DEFAULT_GEOJSON_PATH} 없음 → 가상 경계 사용")
+
+    import app
+
+    cases = {}
+    cases.update(load_benchmarks(args.scales, workdir))
+    cases.update(chart_benchmarks(app))
+    cases.update(callback_benchmarks(app))
+    if args.only:
+        cases = {name: func for name, func in cases.items() if args.only in name}
+
+    # 차트/콜백 내부 로그 출력은 측정 중 숨김
+    results = {}
+    print("\n" + "=" * 70)
+    print(f"⏱️ 벤치마크 실행 중... ({len(cases)}개)")
+    print("=" * 70)
+    for name, func in cases.items():
+        stdout, stderr = sys.stdout, sys.stderr
+        sys.stdout = sys.stderr = open(os.devnull, 'w')
+        try:
+            stats = run_benchmark(func)
+        finally:
+            sys.stdout.close()
+            sys.stdout, sys.stderr = stdout, stderr
+        results[name] = stats
+        print(f"  {name:<45} median {stats['median'] * 1000:10.2f}ms  ({stats['rounds']}회)")
+
+    import numpy as np
+    import pandas as pd
+    import plotly
+    import dash
+    output = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'versions': {
+                'pandas': pd.__version__, 'numpy': np.__version__,
+                'plotly': plotly.__version__, 'dash': dash.__version__,
+            },
+            'scales': args.scales,
+        },
+        'benchmarks': results,
+    }
+
+    path = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.datetime.now():%Y%m%d-%H%M%S}-{output['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(output, f, ensure_ascii=False, indent=2)
+    print(f"\n✅ 결과 저장: {path}")
+
+    if args.compare:
+        compare(output, args.compare)
+
+
+if __name__ == '__main__':
+    main()
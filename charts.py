@@ -3,11 +3,16 @@
 각 차트는 필터링된 데이터를 받아 Plotly Figure를 반환합니다.
 """
 
+import hashlib
+import json
+
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 import pandas as pd
-import requests
-import json
+from dash import Patch
+from geo import get_geometry, geometry_url, GeometryError
+from metrics import timed
 
 # 색상 팔레트 (더 생동감 있는 색상)
 COLORS = {
@@ -50,7 +55,149 @@ TITLE_STYLE = {
     'xanchor': 'center'
 }
 
+# 지도 지표: 값 → (색상 컬럼, 컬러바 제목, 차트 제목)
+MAP_METRICS = {
+    'total': ('사상자수', '사상자 수 (명)', '<b>🗺️ 서울시 자치구별 총 사상자 수</b>'),
+    'deaths': ('사망자수', '사망자 수 (명)', '<b>🗺️ 서울시 자치구별 총 사망자 수</b>'),
+    'injuries': ('부상자수', '부상자 수 (명)', '<b>🗺️ 서울시 자치구별 총 부상자 수</b>'),
+    'count': ('발생건수', '발생 건수 (건)', '<b>🗺️ 서울시 자치구별 총 사고 발생 건수</b>'),
+}
+
+# 지도 customdata 컬럼 (호버 표시, 브라우저에서 지표 전환 시 색상 값으로 사용)
+MAP_CUSTOMDATA = ['발생건수', '사망자수', '부상자수', '사상자수']
+
+# 기상별 지표: 값 → (컬럼, 이름, 막대 색상)
+WEATHER_METRICS = {
+    'deaths': ('사망자수', '사망자', COLORS['사망']),
+    'injuries': ('부상자수', '부상자', COLORS['부상']),
+}
+
+# 기상별 customdata 컬럼 (브라우저에서 지표 전환 시 막대 값으로 사용)
+WEATHER_CUSTOMDATA = ['사망자수', '부상자수']
+
+
+def metric_specs():
+    """
+    브라우저 지표 전환(clientside callback)에 넘길 지표별 표시 정보
+
+    지도/기상별 Figure의 customdata에서 몇 번째 값을 쓸지와 제목/색상을 담습니다.
+    """
+    return {
+        'map': {
+            metric: {'index': MAP_CUSTOMDATA.index(column), 'colorbar': f'<b>{label}</b>', 'title': title}
+            for metric, (column, label, title) in MAP_METRICS.items()
+        },
+        'weather': {
+            metric: {
+                'index': WEATHER_CUSTOMDATA.index(column),
+                'name': name,
+                'color': color,
+                'hovertemplate': f'<b>{name}</b><br>기상: %{{x}}<br>인원: %{{y:,.0f}}명<extra></extra>',
+            }
+            for metric, (column, name, color) in WEATHER_METRICS.items()
+        },
+    }
+
+
+# 부분 업데이트(Patch)로 보내는 trace 데이터 경로
+PATCH_TRACE_PATHS = [
+    ('x',), ('y',), ('z',), ('text',), ('customdata',), ('hovertext',),
+    ('locations',), ('labels',), ('values',), ('pull',), ('lat',), ('lon',),
+    ('marker', 'color'), ('marker', 'colors'),
+]
+
+# 데이터에 따라 바뀌는 레이아웃 값 (제목의 연도, 총계 주석, 축 범위, 컬러바 제목)
+PATCH_LAYOUT_PATHS = [
+    ('title', 'text'),
+    ('annotations',),
+    ('xaxis', 'range'),
+    ('coloraxis', 'colorbar', 'title', 'text'),
+]
+
+_MISSING = object()
+
+
+def _get_path(obj, path):
+    for key in path:
+        if not isinstance(obj, dict) or key not in obj:
+            return _MISSING
+        obj = obj[key]
+    return obj
 
+
+def _without_path(obj, path):
+    """path 값을 뺀 사본 (경로상의 dict만 얕게 복사)"""
+    if not isinstance(obj, dict) or path[0] not in obj:
+        return obj
+    out = dict(obj)
+    if len(path) == 1:
+        del out[path[0]]
+    else:
+        out[path[0]] = _without_path(obj[path[0]], path[1:])
+    return out
+
+
+def figure_signature(fig):
+    """
+    Figure 구조 식별자
+
+    데이터 배열과 데이터 의존 레이아웃 값을 뺀 나머지(trace 종류/스타일, 레이아웃)의 해시입니다.
+    식별자가 같으면 데이터 경로만 바꿔도 같은 Figure가 됩니다.
+    Figure에 포함된 지도 경계(geojson 객체)는 바뀌지 않는 값이므로 해시에서 제외하고,
+    경계 주소(문자열)는 경계가 교체되면 바뀌므로 해시에 포함합니다.
+    """
+    traces, present = [], []
+    for trace in fig.get('data', []):
+        for path in PATCH_TRACE_PATHS:
+            present.append(_get_path(trace, path) is not _MISSING)
+            trace = _without_path(trace, path)
+        if isinstance(trace.get('geojson'), dict):
+            trace = _without_path(trace, ('geojson',))
+        traces.append(trace)
+    layout = fig.get('layout', {})
+    for path in PATCH_LAYOUT_PATHS:
+        present.append(_get_path(layout, path) is not _MISSING)
+        layout = _without_path(layout, path)
+
+    payload = json.dumps({'data': traces, 'layout': layout, 'present': present},
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+@timed('figure_update')
+def figure_update(fig, prev_signature=None):
+    """
+    콜백 반환값 생성: (Figure 또는 Patch, 구조 식별자)
+
+    첫 로드이거나 구조가 바뀌었으면 전체 Figure를, 아니면 데이터 배열과
+    데이터 의존 레이아웃 값만 담은 Patch를 반환합니다.
+    """
+    if not isinstance(fig, dict):
+        fig = json.loads(pio.to_json(fig, validate=False))
+    signature = figure_signature(fig)
+    if prev_signature is None or signature != prev_signature:
+        return fig, signature
+
+    patched = Patch()
+    for i, trace in enumerate(fig.get('data', [])):
+        for path in PATCH_TRACE_PATHS:
+            value = _get_path(trace, path)
+            if value is not _MISSING:
+                target = patched['data'][i]
+                for key in path[:-1]:
+                    target = target[key]
+                target[path[-1]] = value
+    for path in PATCH_LAYOUT_PATHS:
+        value = _get_path(fig.get('layout', {}), path)
+        if value is not _MISSING:
+            target = patched['layout']
+            for key in path[:-1]:
+                target = target[key]
+            target[path[-1]] = value
+    return patched, signature
+
+
+@timed('create_trend_chart')
 def create_trend_chart(df_district, selected_districts=None):
     """
     차트 1: 연도별 사고 추이 (Line Chart)
@@ -74,7 +221,7 @@ def create_trend_chart(df_district, selected_districts=None):
         if selected_districts and len(selected_districts) > 0:
             df = df_district[df_district['자치구'].isin(selected_districts)].copy()
             # 자치구별 추이 표시
-            df_trend = df.groupby(['연도', '자치구'])['발생건수'].sum().reset_index()
+            df_trend = df.groupby(['연도', '자치구'], observed=True)['발생건수'].sum().reset_index()
             
             fig = px.line(
                 df_trend,
@@ -94,7 +241,7 @@ def create_trend_chart(df_district, selected_districts=None):
             )
         else:
             # 전체 서울시 추이 (발생건수만 표시 - 단순화)
-            df_trend = df_district.groupby('연도').agg({
+            df_trend = df_district.groupby('연도', observed=True).agg({
                 '발생건수': 'sum',
                 '사망자수': 'sum',
                 '부상자수': 'sum'
@@ -194,6 +341,7 @@ def create_trend_chart(df_district, selected_districts=None):
     return fig
 
 
+@timed('create_weather_chart')
 def create_weather_chart(df_weather, weather_metric='deaths'):
     """
     차트 2: 기상별 사고 비율 (Stacked Bar Chart)
@@ -232,7 +380,7 @@ def create_weather_chart(df_weather, weather_metric='deaths'):
         return fig
     
     # 기상별 사망자/부상자 집계
-    df_agg = df.groupby('기상상태').agg({
+    df_agg = df.groupby('기상상태', observed=True).agg({
         '사망자수': 'sum',
         '부상자수': 'sum'
     }).reset_index()
@@ -244,29 +392,19 @@ def create_weather_chart(df_weather, weather_metric='deaths'):
     # 차트 생성
     fig = go.Figure()
     
-    # 선택된 지표에 따라 표시
-    if weather_metric == 'deaths':
+    # 선택된 지표에 따라 표시 (두 지표 값을 customdata로 함께 보내 브라우저에서 전환 가능)
+    if weather_metric in WEATHER_METRICS:
+        column, name, color = WEATHER_METRICS[weather_metric]
         fig.add_trace(go.Bar(
-            name='사망자',
+            name=name,
             x=df_agg['기상상태'],
-            y=df_agg['사망자수'],
-            marker=dict(color=COLORS['사망'], line=dict(width=1.5, color='white')),
-            text=df_agg['사망자수'],
+            y=df_agg[column],
+            customdata=df_agg[WEATHER_CUSTOMDATA].to_numpy(),
+            marker=dict(color=color, line=dict(width=1.5, color='white')),
+            text=df_agg[column],
             textposition='auto',
             textfont=dict(size=12, color='white', family='Malgun Gothic'),
-            hovertemplate='<b>사망자</b><br>기상: %{x}<br>인원: %{y:,.0f}명<extra></extra>',
-            showlegend=False
-        ))
-    elif weather_metric == 'injuries':
-        fig.add_trace(go.Bar(
-            name='부상자',
-            x=df_agg['기상상태'],
-            y=df_agg['부상자수'],
-            marker=dict(color=COLORS['부상'], line=dict(width=1.5, color='white')),
-            text=df_agg['부상자수'],
-            textposition='auto',
-            textfont=dict(size=12, color='white', family='Malgun Gothic'),
-            hovertemplate='<b>부상자</b><br>기상: %{x}<br>인원: %{y:,.0f}명<extra></extra>',
+            hovertemplate=f'<b>{name}</b><br>기상: %{{x}}<br>인원: %{{y:,.0f}}명<extra></extra>',
             showlegend=False
         ))
     
@@ -308,6 +446,7 @@ def create_weather_chart(df_weather, weather_metric='deaths'):
     return fig
 
 
+@timed('create_vehicle_chart')
 def create_vehicle_chart(df_vehicle):
     """
     차트 3: 차종별 사고 비율 (Donut Chart)
@@ -331,7 +470,7 @@ def create_vehicle_chart(df_vehicle):
     df = df_vehicle[df_vehicle['차종'] != '소계'].copy()
     
     # 차종별 발생건수 집계
-    df_agg = df.groupby('차종')['발생건수'].sum().reset_index()
+    df_agg = df.groupby('차종', observed=True)['발생건수'].sum().reset_index()
     df_agg = df_agg.sort_values('발생건수', ascending=False)
     
     total = df_agg['발생건수'].sum()
@@ -380,6 +519,7 @@ def create_vehicle_chart(df_vehicle):
     return fig
 
 
+@timed('create_heatmap_chart')
 def create_heatmap_chart(df_district):
     """
     차트 4: 자치구별 사고 밀도 히트맵
@@ -411,7 +551,8 @@ def create_heatmap_chart(df_district):
         index='자치구',
         columns='연도',
         values='발생건수',
-        aggfunc='sum'
+        aggfunc='sum',
+        observed=True
     )
     
     fig = go.Figure(data=go.Heatmap(
@@ -480,6 +621,7 @@ def create_heatmap_chart(df_district):
     return fig
 
 
+@timed('create_ranking_chart')
 def create_ranking_chart(df_district, top_n=10):
     """
     차트 5: 위험 자치구 랭킹 (Horizontal Bar)
@@ -503,8 +645,9 @@ def create_ranking_chart(df_district, top_n=10):
     latest_year = df_district['연도'].max()
     df_latest = df_district[df_district['연도'] == latest_year].copy()
     
-    # 상위 N개 자치구
+    # 상위 N개 자치구 (선택한 자치구가 N개보다 적으면 선택한 자치구 전체)
     df_top = df_latest.nlargest(top_n, '발생건수')
+    top_n = len(df_top)
     df_top = df_top.sort_values('발생건수')  # 오름차순 정렬 (그래프에서 큰 값이 위로)
     
     # 순위 추가 (역순)
@@ -556,6 +699,7 @@ def create_ranking_chart(df_district, top_n=10):
     return fig
 
 
+@timed('create_comparison_chart')
 def create_comparison_chart(df_district, selected_districts=None):
     """
     차트 6: 사망자/부상자 비교 (Grouped Bar)
@@ -660,6 +804,17 @@ def create_comparison_chart(df_district, selected_districts=None):
     return fig
 
 
+# 실패 안내 Figure 표시 (경계 파일 없음 등, 캐시에 저장하지 않고 다음 요청에서 다시 그리도록)
+FAILED_META = {'failed': True}
+
+
+def is_failed_figure(fig):
+    """create_map_chart가 실패 안내로 만든 Figure이면 True"""
+    meta = fig.layout.meta if isinstance(fig, go.Figure) else fig.get('layout', {}).get('meta')
+    return isinstance(meta, dict) and bool(meta.get('failed'))
+
+
+@timed('create_map_chart')
 def create_map_chart(df_district, map_metric='total'):
     """
     차트 7: 서울시 자치구별 교통사고 Choropleth 지도
@@ -689,16 +844,13 @@ def create_map_chart(df_district, map_metric='total'):
         return fig
     
     try:
-        # 서울시 자치구 GeoJSON 로드 (인터넷에서)
-        print("🗺️ GeoJSON 다운로드 중...")
-        geojson_url = "https://raw.githubusercontent.com/southkorea/seoul-maps/master/kostat/2013/json/seoul_municipalities_geo_simple.json"
-        response = requests.get(geojson_url, timeout=60)  # 타임아웃 60초로 증가 (Render 환경 고려)
-        response.raise_for_status()  # HTTP 에러 체크
-        seoul_geo = response.json()
-        print(f"✓ GeoJSON 다운로드 완료! ({len(seoul_geo.get('features', []))}개 자치구)")
+        # 서울시 자치구 GeoJSON (DATA/ 번들 파일, 프로세스당 1회 로드)
+        # 경계 라우트가 있으면 주소만 넘기고 브라우저가 경계를 한 번 받아 캐시
+        geometry = get_geometry()
+        seoul_geo = geometry_url(geometry) or geometry.geojson
         
         # 자치구별 데이터 집계
-        df_agg = df_district.groupby('자치구').agg({
+        df_agg = df_district.groupby('자치구', observed=True).agg({
             '발생건수': 'sum',
             '사망자수': 'sum',
             '부상자수': 'sum'
@@ -711,10 +863,7 @@ def create_map_chart(df_district, map_metric='total'):
         
         # GeoJSON의 자치구명과 데이터의 자치구명 매칭
         # GeoJSON은 '종로구', '중구' 등으로 되어 있음
-        geojson_districts = []
-        for feature in seoul_geo['features']:
-            name = feature['properties']['name']
-            geojson_districts.append(name)
+        geojson_districts = geometry.names
         
         print(f"🗺️ GeoJSON 자치구: {sorted(geojson_districts)}")
         
@@ -725,23 +874,8 @@ def create_map_chart(df_district, map_metric='total'):
         if unmatched:
             print(f"⚠️ 매칭되지 않는 자치구: {unmatched}")
         
-        # 표시할 지표 선택
-        if map_metric == 'total':
-            color_column = '사상자수'
-            color_label = '사상자 수 (명)'
-            title_text = '<b>🗺️ 서울시 자치구별 총 사상자 수</b>'
-        elif map_metric == 'deaths':
-            color_column = '사망자수'
-            color_label = '사망자 수 (명)'
-            title_text = '<b>🗺️ 서울시 자치구별 총 사망자 수</b>'
-        elif map_metric == 'injuries':
-            color_column = '부상자수'
-            color_label = '부상자 수 (명)'
-            title_text = '<b>🗺️ 서울시 자치구별 총 부상자 수</b>'
-        else:  # count
-            color_column = '발생건수'
-            color_label = '발생 건수 (건)'
-            title_text = '<b>🗺️ 서울시 자치구별 총 사고 발생 건수</b>'
+        # 표시할 지표 선택 (알 수 없는 값은 발생 건수)
+        color_column, color_label, title_text = MAP_METRICS.get(map_metric, MAP_METRICS['count'])
         
         # Choropleth Mapbox 생성
         fig = px.choropleth_mapbox(
@@ -779,28 +913,16 @@ def create_map_chart(df_district, map_metric='total'):
             opacity=0.7
         )
         
-        # 자치구 이름 텍스트 추가
-        for feature in seoul_geo['features']:
-            district_name = feature['properties']['name']
-            # 자치구의 중심 좌표 계산 (간단한 평균)
-            coords = feature['geometry']['coordinates'][0]
-            if isinstance(coords[0][0], list):  # MultiPolygon 처리
-                coords = coords[0]
-            lons = [c[0] for c in coords]
-            lats = [c[1] for c in coords]
-            center_lon = sum(lons) / len(lons)
-            center_lat = sum(lats) / len(lats)
-            
-            # 텍스트 추가 (구 포함)
-            fig.add_scattermapbox(
-                lon=[center_lon],
-                lat=[center_lat],
-                mode='text',
-                text=[district_name],
-                textfont=dict(size=10, color='#1e293b', family='Malgun Gothic', weight='bold'),
-                hoverinfo='skip',
-                showlegend=False
-            )
+        # 자치구 이름 텍스트 추가 (경계 로드 시 계산해둔 중심 좌표, 단일 trace)
+        fig.add_scattermapbox(
+            lon=[lon for lon, _ in geometry.centroids],
+            lat=[lat for _, lat in geometry.centroids],
+            mode='text',
+            text=list(geometry.names),
+            textfont=dict(size=10, color='#1e293b', family='Malgun Gothic', weight='bold'),
+            hoverinfo='skip',
+            showlegend=False
+        )
         
         # 레이아웃 업데이트 (COMMON_LAYOUT의 margin과 충돌하지 않도록 별도 처리)
         fig.update_layout(
@@ -821,7 +943,12 @@ def create_map_chart(df_district, map_metric='total'):
             )
         )
         
-        # 호버 템플릿 커스터마이징
+        # 호버 템플릿 커스터마이징 (customdata 순서는 MAP_CUSTOMDATA, 네 지표 값을 모두 담아
+        # 브라우저에서 지표를 바꿀 때 서버 요청 없이 색상 값만 교체)
+        fig.update_traces(
+            customdata=df_agg[MAP_CUSTOMDATA].to_numpy(),
+            selector=dict(type='choroplethmapbox')
+        )
         fig.update_traces(
             hovertemplate='<b>%{hovertext}</b><br><br>' +
                          '사고 건수: %{customdata[0]}<br>' +
@@ -832,8 +959,8 @@ def create_map_chart(df_district, map_metric='total'):
         
         return fig
         
-    except requests.exceptions.RequestException as e:
-        # 네트워크/GeoJSON 로딩 에러
+    except GeometryError as e:
+        # 경계 파일 로딩 에러
         print(f"❌ GeoJSON 로딩 실패: {e}")
         import traceback
         traceback.print_exc()
@@ -845,14 +972,15 @@ def create_map_chart(df_district, map_metric='total'):
             paper_bgcolor=COMMON_LAYOUT['paper_bgcolor'],
             title={**TITLE_STYLE, 'text': '<b>🗺️ 서울시 자치구별 교통사고 지도</b>'},
             annotations=[dict(
-                text=f'지도 로딩 실패<br><span style="font-size:14px">인터넷 연결을 확인해주세요</span><br><span style="font-size:12px; color:#94a3b8">{str(e)[:100]}</span>',
+                text=f'지도 로딩 실패<br><span style="font-size:14px">DATA/ 폴더의 경계 파일을 확인해주세요</span><br><span style="font-size:12px; color:#94a3b8">{str(e)[:100]}</span>',
                 xref='paper', yref='paper',
                 x=0.5, y=0.5,
                 showarrow=False,
                 font=dict(size=18, color='#64748b')
             )],
             height=600,
-            margin={'l': 10, 'r': 10, 't': 70, 'b': 10}
+            margin={'l': 10, 'r': 10, 't': 70, 'b': 10},
+            meta=FAILED_META
         )
         return fig
     except Exception as e:
@@ -875,6 +1003,7 @@ def create_map_chart(df_district, map_metric='total'):
                 font=dict(size=18, color='#64748b')
             )],
             height=600,
-            margin={'l': 10, 'r': 10, 't': 70, 'b': 10}
+            margin={'l': 10, 'r': 10, 't': 70, 'b': 10},
+            meta=FAILED_META
         )
         return fig
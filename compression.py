@@ -0,0 +1,107 @@
+"""
+응답 압축/캐시 헤더 모듈
+콜백(/_dash-update-component), API, 정적 자원 응답을 brotli/gzip으로 압축하고,
+내용이 바뀌지 않는 응답에는 본문 해시 ETag를 붙여 조건부 요청(304)으로 재전송을 막습니다.
+
+압축은 flask-compress가 설치되어 있을 때만 켜지며, 없으면 압축 없이 그대로 응답합니다.
+
+환경 변수:
+    DASHBOARD_COMPRESS=0            압축 끄기 (리버스 프록시에서 압축하는 경우)
+    DASHBOARD_COMPRESS_MIN_SIZE     이 크기(바이트)보다 작은 응답은 압축하지 않음 (기본 1024)
+    DASHBOARD_COMPRESS_LEVEL        gzip 압축 레벨 1~9 (기본 6)
+    DASHBOARD_COMPRESS_BR_LEVEL     brotli 압축 레벨 0~11 (기본 4)
+"""
+
+import hashlib
+import os
+import threading
+
+from metrics import measure, register_value
+
+COMPRESS_ENV = 'DASHBOARD_COMPRESS'
+MIN_SIZE_ENV = 'DASHBOARD_COMPRESS_MIN_SIZE'
+LEVEL_ENV = 'DASHBOARD_COMPRESS_LEVEL'
+BR_LEVEL_ENV = 'DASHBOARD_COMPRESS_BR_LEVEL'
+
+DEFAULT_MIN_SIZE = 1024
+DEFAULT_LEVEL = 6
+DEFAULT_BR_LEVEL = 4  # 11은 압축률이 조금 낫지만 콜백마다 수십 ms가 걸림
+
+# 내용이 바뀌지 않는 응답 캐시 시간 (1년)
+IMMUTABLE_MAX_AGE = 31536000
+
+_lock = threading.Lock()
+_bytes = {'in': 0, 'out': 0}  # 압축 전/후 누적 바이트
+
+register_value('dashboard_compress_input_bytes_total', 'counter',
+               '압축 전 응답 크기 누적 (바이트)', lambda: _bytes['in'])
+register_value('dashboard_compress_output_bytes_total', 'counter',
+               '압축 후 응답 크기 누적 (바이트)', lambda: _bytes['out'])
+
+
+def cached_response(body, mimetype, max_age, immutable=False):
+    """
+    본문 해시 ETag와 Cache-Control이 붙은 응답 (If-None-Match가 일치하면 304)
+
+    Args:
+        body: 응답 본문 (bytes)
+        max_age: 캐시 유효 시간 (초)
+        immutable: 주소에 내용 해시가 들어있어 절대 바뀌지 않는 응답이면 True
+    """
+    from flask import Response, request
+
+    response = Response(body, mimetype=mimetype)
+    response.set_etag(hashlib.sha1(body).hexdigest())
+    response.headers['Cache-Control'] = f'public, max-age={max_age}' + (', immutable' if immutable else '')
+    return response.make_conditional(request)
+
+
+def _algorithms():
+    """사용 가능한 압축 방식 (선호 순서)"""
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        return ['gzip']
+    return ['br', 'gzip']
+
+
+def register_compression(server):
+    """
+    Flask 서버에 응답 압축 훅 등록
+
+    after_request 훅은 등록의 역순으로 실행되므로, 계측(register_metrics_route)보다 먼저 등록하면
+    /metrics의 응답 크기 히스토그램은 압축 전 크기를 기록합니다.
+
+    Returns:
+        사용하는 압축 방식 목록 (압축을 쓰지 않으면 빈 목록)
+    """
+    if os.environ.get(COMPRESS_ENV, '1') == '0':
+        return []
+    try:
+        from flask_compress import Compress
+    except ImportError:
+        print("⚠️ flask-compress가 설치되어 있지 않아 응답을 압축하지 않습니다")
+        return []
+
+    algorithms = _algorithms()
+    server.config.update(
+        COMPRESS_REGISTER=False,  # 아래 훅에서 직접 호출
+        COMPRESS_ALGORITHM=algorithms,
+        COMPRESS_MIN_SIZE=int(os.environ.get(MIN_SIZE_ENV, DEFAULT_MIN_SIZE)),
+        COMPRESS_LEVEL=int(os.environ.get(LEVEL_ENV, DEFAULT_LEVEL)),
+        COMPRESS_BR_LEVEL=int(os.environ.get(BR_LEVEL_ENV, DEFAULT_BR_LEVEL)),
+    )
+    compress = Compress(server)
+
+    @server.after_request
+    def compress_response(response):
+        size = None if response.is_streamed or response.direct_passthrough else response.content_length
+        with measure('compress'):
+            response = compress.after_request(response)
+        if size is not None and response.headers.get('Content-Encoding') in algorithms:
+            with _lock:
+                _bytes['in'] += size
+                _bytes['out'] += response.content_length or 0
+        return response
+
+    return algorithms
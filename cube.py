@@ -0,0 +1,361 @@
+"""
+사전 집계 큐브 모듈
+정제된 long format 데이터를 (연도, 자치구, 기상상태|차종, 지표) 밀집 배열로 한 번 집계해두고,
+콜백에서는 연도축 누적합과 인덱스 선택만으로 필요한 조각을 계산합니다.
+"""
+
+import json
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from metrics import timed
+
+# 큐브에 담는 지표 (합산 가능한 값만)
+METRICS = ['발생건수', '사망자수', '부상자수']
+
+# 큐브를 구성하는 배열 (save/attach 대상)
+# *_all: 자치구 축을 미리 합친 누적합 (전체 자치구 선택 시 자치구 수와 무관하게 계산)
+ARRAY_NAMES = [
+    'district_values', 'district_present', 'district_cum', 'district_cum_all',
+    'weather_values', 'weather_present', 'weather_cum', 'weather_present_cum',
+    'weather_cum_all', 'weather_present_cum_all',
+    'vehicle_values', 'vehicle_present', 'vehicle_cum', 'vehicle_present_cum',
+    'vehicle_cum_all', 'vehicle_present_cum_all',
+]
+
+# 배열 구성이 바뀌면 올려서 저장된 공유 큐브를 다시 만들게 함
+CUBE_FORMAT = 2
+
+# 공유 큐브 디렉터리 이름 접두어 (cache_dir()/cube-<지문>-<시작연도>-<끝연도>-v<형식>)
+SHARED_CUBE_PREFIX = 'cube-'
+
+# 이 시간(초) 동안 아무 워커도 연결하지 않은 이전 공유 큐브는 remove_stale_cubes()가 삭제
+CUBE_RETENTION_ENV = 'DASHBOARD_CUBE_RETENTION'
+DEFAULT_CUBE_RETENTION = 600
+
+
+@dataclass(frozen=True)
+class CubeSelection:
+    """
+    연도 구간(연도축 slice)과 자치구 선택
+
+    districts는 인덱스 배열 또는 slice입니다. 전체/연속 구간 선택은 slice로 두어
+    배열 조각이 복사 없는 view가 되도록 합니다.
+    """
+    years: slice
+    districts: object
+
+    @property
+    def all_districts(self):
+        return isinstance(self.districts, slice) and self.districts == slice(None)
+
+    @property
+    def empty(self):
+        if self.years.start >= self.years.stop:
+            return True
+        if isinstance(self.districts, slice):
+            return self.districts.start is not None and self.districts.start >= self.districts.stop
+        return len(self.districts) == 0
+
+
+def _take(values, districts, axis):
+    """자치구 축 선택 (slice면 view, 인덱스 배열이면 take)"""
+    if isinstance(districts, slice):
+        return values[(slice(None),) * axis + (districts,)]
+    return values.take(districts, axis=axis)
+
+
+def _cumsum_years(values):
+    """연도축(0번 축) 누적합 (맨 앞에 0 행 추가: cum[b] - cum[a] = a~b-1년 합계)"""
+    zeros = np.zeros((1,) + values.shape[1:], dtype=values.dtype)
+    return np.concatenate([zeros, np.cumsum(values, axis=0)])
+
+
+def _positions(labels, column):
+    """column 값들의 labels 내 위치 (범주형 컬럼은 카테고리만 찾고 정수 코드로 변환)"""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        lookup = pd.Index(labels).get_indexer(column.cat.categories)
+        return lookup[column.cat.codes.to_numpy()]
+    return pd.Index(labels).get_indexer(column)
+
+
+def _dense(df, years, districts, category_col, categories):
+    """long format → (연도, 자치구[, 범주], 지표) 배열과 존재 여부 마스크"""
+    year_idx = np.searchsorted(years, df['연도'].to_numpy())
+    district_idx = _positions(districts, df['자치구'])
+    shape = (len(years), len(districts))
+    index = (year_idx, district_idx)
+    if category_col is not None:
+        shape += (len(categories),)
+        index += (_positions(categories, df[category_col]),)
+
+    values = np.zeros(shape + (len(METRICS),))
+    np.add.at(values, index, df[METRICS].to_numpy(dtype=float))
+    present = np.zeros(shape, dtype=bool)
+    present[index] = True
+    return values, present
+
+
+class AccidentCube:
+    """
+    교통사고 사전 집계 큐브
+
+    - district: (연도, 자치구, 지표)
+    - weather: (연도, 자치구, 기상상태, 지표)
+    - vehicle: (연도, 자치구, 차종, 지표)
+
+    각 조각 메서드는 차트 함수가 그대로 받을 수 있는 작은 DataFrame을 반환합니다.
+    """
+
+    def __init__(self, years, districts, weathers, vehicles, arrays):
+        """
+        Args:
+            years, districts, weathers, vehicles: 각 축의 라벨
+            arrays: ARRAY_NAMES의 배열 dict (메모리 매핑된 읽기 전용 배열도 가능)
+        """
+        self.years = np.asarray(years)
+        self.districts = list(districts)
+        self.weathers = list(weathers)
+        self.vehicles = list(vehicles)
+
+        for name in ARRAY_NAMES:
+            setattr(self, name, arrays[name])
+
+        self._district_pos = {name: i for i, name in enumerate(self.districts)}
+        self._district_names = np.array(self.districts, dtype=object)
+        self._weather_names = np.array(self.weathers, dtype=object)
+        self._vehicle_names = np.array(self.vehicles, dtype=object)
+
+    @classmethod
+    @timed('build_cube')
+    def from_frames(cls, df_weather, df_vehicle, df_district):
+        """정제된 3개 DataFrame으로 큐브 생성"""
+        years = np.unique(np.concatenate([
+            df['연도'].to_numpy(dtype=np.int64) for df in (df_district, df_weather, df_vehicle)
+        ]))
+        # 자치구/범주 순서는 원본 등장 순서 유지 (동률 정렬 결과를 기존과 같게)
+        districts = list(pd.unique(df_district['자치구']))
+        weathers = list(pd.unique(df_weather['기상상태']))
+        vehicles = list(pd.unique(df_vehicle['차종']))
+
+        arrays = {}
+        arrays['district_values'], arrays['district_present'] = _dense(
+            df_district, years, districts, None, None)
+        arrays['weather_values'], arrays['weather_present'] = _dense(
+            df_weather, years, districts, '기상상태', weathers)
+        arrays['vehicle_values'], arrays['vehicle_present'] = _dense(
+            df_vehicle, years, districts, '차종', vehicles)
+
+        # 연도 구간 합계용 누적합
+        for name in ('district', 'weather', 'vehicle'):
+            arrays[f'{name}_cum'] = _cumsum_years(arrays[f'{name}_values'])
+        for name in ('weather', 'vehicle'):
+            arrays[f'{name}_present_cum'] = _cumsum_years(arrays[f'{name}_present'].astype(np.int32))
+            arrays[f'{name}_present_cum_all'] = arrays[f'{name}_present_cum'].sum(axis=1)
+        for name in ('district', 'weather', 'vehicle'):
+            arrays[f'{name}_cum_all'] = arrays[f'{name}_cum'].sum(axis=1)
+
+        return cls(years, districts, weathers, vehicles, arrays)
+
+    def save(self, directory):
+        """큐브를 디렉터리에 저장 (라벨은 meta.json, 배열은 .npy)"""
+        os.makedirs(directory, exist_ok=True)
+        for name in ARRAY_NAMES:
+            np.save(os.path.join(directory, f'{name}.npy'), np.ascontiguousarray(getattr(self, name)))
+        meta = {
+            'years': [int(y) for y in self.years],
+            'districts': self.districts,
+            'weathers': self.weathers,
+            'vehicles': self.vehicles,
+        }
+        with open(os.path.join(directory, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+    @classmethod
+    def attach(cls, directory):
+        """저장된 큐브를 읽기 전용 메모리 매핑으로 연결 (여러 프로세스가 같은 물리 페이지를 공유)"""
+        with open(os.path.join(directory, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        arrays = {
+            name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r')
+            for name in ARRAY_NAMES
+        }
+        return cls(meta['years'], meta['districts'], meta['weathers'], meta['vehicles'], arrays)
+
+    @timed('filter.select')
+    def select(self, year_range=None, selected_districts=None):
+        """
+        연도 범위와 자치구 목록을 배열 인덱스로 변환
+
+        Args:
+            year_range: [시작, 끝] (양 끝 포함), None이면 전체
+            selected_districts: 자치구 이름 목록, 비어 있으면 전체
+        """
+        if year_range is None:
+            years = slice(0, len(self.years))
+        else:
+            start = int(np.searchsorted(self.years, year_range[0], side='left'))
+            stop = int(np.searchsorted(self.years, year_range[1], side='right'))
+            years = slice(start, max(start, stop))
+
+        if selected_districts:
+            districts = np.array(
+                [self._district_pos[d] for d in selected_districts if d in self._district_pos],
+                dtype=int
+            )
+            # 연속 구간이면 slice로 (선택 순서가 유지되는 경우만)
+            if len(districts) and np.array_equal(districts, np.arange(districts[0], districts[0] + len(districts))):
+                districts = slice(int(districts[0]), int(districts[0]) + len(districts))
+        else:
+            districts = slice(None)
+
+        return CubeSelection(years=years, districts=districts)
+
+    def _range_sum(self, cum, selection):
+        """선택된 연도 구간 합계 (자치구 선택 먼저 적용)"""
+        stop = _take(cum[selection.years.stop], selection.districts, axis=0)
+        start = _take(cum[selection.years.start], selection.districts, axis=0)
+        return stop - start
+
+    def _range_total(self, cum, cum_all, selection):
+        """선택된 연도 구간·자치구 전체 합계 (전체 자치구면 미리 합친 누적합 사용)"""
+        if selection.all_districts:
+            return cum_all[selection.years.stop] - cum_all[selection.years.start]
+        return self._range_sum(cum, selection).sum(axis=0)
+
+    @timed('filter.district_frame')
+    def district_frame(self, selection):
+        """(연도, 자치구)별 지표 – 추이/히트맵/랭킹 차트용"""
+        values = _take(self.district_values[selection.years], selection.districts, axis=1)
+        present = _take(self.district_present[selection.years], selection.districts, axis=1)
+        years = self.years[selection.years]
+        names = self._district_names[selection.districts]
+
+        # 자치구 순서 → 연도 내림차순 (원본 long format과 같은 순서)
+        values = values[::-1].transpose(1, 0, 2)
+        present = present[::-1].T
+        mask = present.ravel()
+
+        df = pd.DataFrame(values.reshape(-1, len(METRICS))[mask], columns=METRICS)
+        df.insert(0, '연도', np.tile(years[::-1], len(names))[mask])
+        df.insert(1, '자치구', np.repeat(names, len(years))[mask])
+        return df
+
+    @timed('filter.district_totals')
+    def district_totals(self, selection):
+        """자치구별 기간 합계 – 지도 차트용"""
+        totals = self._range_sum(self.district_cum, selection)
+        has_data = _take(self.district_present[selection.years], selection.districts, axis=1).any(axis=0)
+
+        df = pd.DataFrame(totals[has_data], columns=METRICS)
+        df.insert(0, '자치구', self._district_names[selection.districts][has_data])
+        return df
+
+    @timed('filter.weather_totals')
+    def weather_totals(self, selection, selected_weather=None):
+        """기상상태별 기간·자치구 합계 – 기상 차트용"""
+        totals = self._range_total(self.weather_cum, self.weather_cum_all, selection)
+        present = self._range_total(self.weather_present_cum, self.weather_present_cum_all, selection) > 0
+        if selected_weather:
+            present &= np.isin(self.weathers, list(selected_weather) + ['소계'])
+
+        df = pd.DataFrame(totals[present], columns=METRICS)
+        df.insert(0, '기상상태', self._weather_names[present])
+        return df
+
+    @timed('filter.vehicle_totals')
+    def vehicle_totals(self, selection):
+        """차종별 기간·자치구 합계 – 차종 차트용"""
+        totals = self._range_total(self.vehicle_cum, self.vehicle_cum_all, selection)
+        present = self._range_total(self.vehicle_present_cum, self.vehicle_present_cum_all, selection) > 0
+
+        df = pd.DataFrame(totals[present], columns=METRICS)
+        df.insert(0, '차종', self._vehicle_names[present])
+        return df
+
+    @timed('filter.totals')
+    def totals(self, selection):
+        """선택 구간 전체 합계 – 통계 카드용 {지표: 값}"""
+        totals = self._range_total(self.district_cum, self.district_cum_all, selection)
+        return dict(zip(METRICS, totals))
+
+
+@contextmanager
+def _build_lock(directory):
+    """
+    같은 공유 큐브를 한 프로세스만 만들도록 하는 파일 잠금 (<directory>.lock)
+
+    fcntl이 없는 환경(Windows)에서는 잠그지 않으며, 이때는 동시에 만들더라도 rename으로 하나만 남습니다.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    with open(f"{directory}.lock", 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def load_shared_cube(directory, build):
+    """
+    공유 큐브 연결 (없으면 build()로 만들어 저장한 뒤 연결)
+
+    여러 워커가 동시에 요청하면 잠금을 얻은 하나만 만들고 나머지는 기다렸다가 연결합니다.
+    연결할 때마다 디렉터리 수정 시각을 갱신해 remove_stale_cubes()가 사용 중인 큐브를 지우지 않게 합니다.
+    """
+    with _build_lock(directory):
+        if not os.path.exists(os.path.join(directory, 'meta.json')):
+            tmp_dir = f"{directory}.{os.getpid()}.tmp"
+            build().save(tmp_dir)
+            try:
+                os.rename(tmp_dir, directory)
+            except OSError:
+                # 다른 워커가 먼저 저장함
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.utime(directory)
+    return AccidentCube.attach(directory)
+
+
+def remove_stale_cubes(keep_dir, retention=None):
+    """
+    keep_dir 옆의 이전 공유 큐브(만들다 남은 임시 디렉터리, 잠금 파일 포함) 중 retention초 이상 쓰이지 않은 것을 삭제
+
+    아직 이전 큐브에 연결된 워커가 있어도 POSIX에서는 삭제 후에도 매핑이 유지되고,
+    삭제하지 못한 파일(Windows에서 매핑 중인 파일 등)은 다음 정리 때 다시 시도합니다.
+
+    Returns:
+        삭제한 항목 수
+    """
+    if retention is None:
+        retention = float(os.environ.get(CUBE_RETENTION_ENV, DEFAULT_CUBE_RETENTION))
+    parent = os.path.dirname(keep_dir) or '.'
+    keep = os.path.basename(keep_dir)
+    cutoff = time.time() - retention
+    removed = 0
+    for name in os.listdir(parent):
+        if not name.startswith(SHARED_CUBE_PREFIX) or name in (keep, f"{keep}.lock"):
+            continue
+        path = os.path.join(parent, name)
+        try:
+            if os.path.getmtime(path) > cutoff:
+                continue
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+        except OSError:
+            continue
+        removed += 1
+    if removed:
+        print(f"🧹 이전 공유 큐브 {removed}개 삭제 ({retention:.0f}초 이상 사용되지 않음)")
+    return removed
@@ -0,0 +1,175 @@
+"""
+전처리 결과 캐시 모듈
+정제된 DataFrame을 비압축 Feather(Arrow IPC) 파일로 저장하고 다음 실행 시 CSV 파싱 없이 바로 읽습니다.
+캐시 키는 원본 CSV의 SHA-256과 파서 버전이므로 원본이나 파서가 바뀌면 자동으로 무효화됩니다.
+
+캐시 파일 옆에는 메타데이터(JSON, 예: 파싱에 쓴 컬럼 계획, 원본 폴더/해시)를 함께 저장해
+원본이 바뀌었을 때 같은 폴더에서 온 이전 캐시를 갱신하는 데 쓸 수 있습니다.
+"""
+
+import hashlib
+import json
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow가 없으면 캐시 없이 매번 파싱
+    pa = None
+    feather = None
+
+CACHE_DIR_ENV = 'DASHBOARD_CACHE_DIR'
+DEFAULT_CACHE_DIR = '.cache'
+
+
+def cache_dir():
+    return os.environ.get(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """파일 내용의 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path(name, source_path, version, sha=None):
+    """데이터셋 이름 + 원본 해시 + 파서 버전으로 만든 캐시 파일 경로"""
+    sha = sha or file_sha256(source_path)
+    return os.path.join(cache_dir(), f"{name}-{sha[:16]}-v{version}.feather")
+
+
+def source_dir(source_path):
+    """원본이 있는 폴더 (절대 경로, 같은 폴더의 파일끼리만 이전 캐시를 이어 씀)"""
+    return os.path.dirname(os.path.abspath(source_path))
+
+
+def _cache_source(path):
+    """캐시 파일을 만든 원본 폴더 (메타데이터가 없거나 기록되지 않았으면 None)"""
+    meta = read_meta(path)
+    return (meta or {}).get('source', {}).get('dir')
+
+
+def read_frame(path):
+    """
+    캐시 파일을 읽어 DataFrame으로 반환
+
+    DataFrame으로 바꿀 때 어차피 복사되므로 메모리 매핑은 쓰지 않고,
+    변환한 컬럼의 Arrow 버퍼는 바로 해제해(self_destruct) 읽는 동안 두 벌을 모두 들고 있지 않도록 합니다.
+    """
+    table = feather.read_table(path, memory_map=False)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def _meta_path(path):
+    return path[:-len('.feather')] + '.json'
+
+
+def write_frame(df, path, meta=None):
+    """DataFrame을 비압축 Feather로 저장 (읽을 때 압축 해제 비용이 없도록 압축하지 않음)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    feather.write_feather(table, tmp_path, compression='uncompressed')
+    if meta is not None:
+        # 메타데이터를 먼저 두어 캐시 파일이 보이면 메타데이터도 항상 있도록 함
+        with open(f"{tmp_path}.json", 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(f"{tmp_path}.json", _meta_path(path))
+    os.replace(tmp_path, path)
+
+
+def read_meta(path):
+    """캐시 파일의 메타데이터 (없으면 None)"""
+    try:
+        with open(_meta_path(path), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def previous_cache(name, version, source, exclude=None):
+    """같은 데이터셋/파서 버전이고 같은 원본 폴더(source)에서 만든 가장 최근 캐시 파일 경로 (없으면 None)"""
+    directory = cache_dir()
+    suffix = f"-v{version}.feather"
+    try:
+        candidates = [
+            os.path.join(directory, filename) for filename in os.listdir(directory)
+            if filename.startswith(f"{name}-") and filename.endswith(suffix)
+        ]
+    except OSError:
+        return None
+    candidates = [path for path in candidates if path != exclude and _cache_source(path) == source]
+    return max(candidates, key=os.path.getmtime) if candidates else None
+
+
+def _remove_stale(name, keep_path, source):
+    """
+    같은 데이터셋/원본 폴더의 이전 캐시 파일(메타데이터 포함) 삭제
+
+    다른 폴더(예: DASHBOARD_DATA_DIR로 지정한 합성 데이터)에서 만든 캐시는 그 폴더로 다시 실행할 때
+    쓰이므로 남겨둡니다. 원본 폴더가 기록되지 않은 이전 형식의 캐시는 삭제합니다.
+    """
+    directory = os.path.dirname(keep_path) or '.'
+    keep = os.path.basename(keep_path)
+    for filename in os.listdir(directory):
+        if filename.startswith(f"{name}-") and filename.endswith('.feather') and filename != keep:
+            stale = os.path.join(directory, filename)
+            if _cache_source(stale) not in (None, source):
+                continue
+            for path in (stale, _meta_path(stale)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+def load_cached(name, source_path, loader, version, meta=None, update=None):
+    """
+    캐시가 있으면 읽고, 없으면 loader(source_path)로 파싱한 뒤 저장
+
+    Args:
+        name: 데이터셋 이름 (캐시 파일명 접두어)
+        source_path: 원본 CSV 경로
+        loader: 원본을 DataFrame으로 변환하는 함수
+        version: 파서 버전 (변경 시 기존 캐시 무효화)
+        meta: 캐시와 함께 저장할 메타데이터 (JSON 직렬화 가능한 dict, 원본 폴더/해시는 자동으로 추가)
+        update: 원본이 바뀌어 캐시가 없을 때 같은 원본 폴더의 이전 캐시를
+            update(이전 DataFrame, 이전 메타데이터, source_path)로 갱신 (None을 반환하면 loader로 전체 파싱)
+    """
+    if feather is None:
+        return loader(source_path)
+
+    sha = file_sha256(source_path)
+    source = source_dir(source_path)
+    path = cache_path(name, source_path, version, sha)
+    meta = dict(meta or {}, source={'dir': source, 'file': os.path.basename(source_path), 'sha256': sha})
+    if os.path.exists(path):
+        try:
+            df = read_frame(path)
+            print(f"✓ 캐시 사용: {path}")
+            return df
+        except (OSError, pa.ArrowException) as e:
+            print(f"⚠️ 캐시 읽기 실패, 다시 파싱합니다: {e}")
+
+    df = None
+    previous = previous_cache(name, version, source, exclude=path) if update is not None else None
+    previous_meta = read_meta(previous) if previous else None
+    if previous_meta is not None:
+        try:
+            df = update(read_frame(previous), previous_meta, source_path)
+        except (OSError, pa.ArrowException) as e:
+            print(f"⚠️ 이전 캐시 읽기 실패, 전체를 파싱합니다: {e}")
+        if df is not None:
+            print(f"✓ 이전 캐시 갱신: {previous} → {path}")
+
+    if df is None:
+        df = loader(source_path)
+    try:
+        write_frame(df, path, meta)
+        _remove_stale(name, path, source)
+    except (OSError, pa.ArrowException) as e:
+        print(f"⚠️ 캐시 저장 실패: {e}")
+    return df
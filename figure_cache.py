@@ -0,0 +1,147 @@
+"""
+차트 Figure 캐시 모듈
+같은 필터 조합으로 다시 요청된 차트는 다시 그리지 않고 직렬화해둔 Figure JSON을 돌려줍니다.
+- LRU + TTL, 전체 크기(바이트) 상한
+- 데이터 버전이 바뀌면 자동으로 비움
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import plotly.io as pio
+
+from metrics import measure, register_value
+
+MAX_BYTES_ENV = 'FIGURE_CACHE_MAX_BYTES'
+TTL_ENV = 'FIGURE_CACHE_TTL'
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL = 600  # 초
+
+
+def filter_key(chart, year_range=None, selected_districts=None, selected_weather=None, metric=None):
+    """
+    필터 상태를 정규화한 캐시 키
+
+    자치구/기상 목록은 선택 순서와 무관하게 정렬하고, 빈 선택은 ()로 통일합니다.
+    """
+    years = tuple(int(y) for y in year_range) if year_range else ()
+    districts = tuple(sorted(set(selected_districts))) if selected_districts else ()
+    weather = tuple(sorted(set(selected_weather))) if selected_weather else ()
+    return (chart, years, districts, weather, metric)
+
+
+class FigureCache:
+    """직렬화된 Figure JSON을 담는 LRU/TTL 캐시 (스레드 안전)"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, ttl=DEFAULT_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.data_version = None
+
+        self._entries = OrderedDict()  # key -> (json 문자열, 크기, 만료 시각)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """캐시된 Figure(dict) 반환, 없거나 만료되면 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] < time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            payload = entry[0]
+        return json.loads(payload)
+
+    def put(self, key, fig):
+        """Figure를 JSON으로 직렬화해 저장하고 dict로 반환"""
+        with measure('serialize'):
+            payload = fig if isinstance(fig, str) else pio.to_json(fig, validate=False)
+        size = len(payload.encode('utf-8'))
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size <= self.max_bytes:
+                self._entries[key] = (payload, size, time.monotonic() + self.ttl)
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    oldest = next(iter(self._entries))
+                    self._remove(oldest)
+                    self.evictions += 1
+        return json.loads(payload)
+
+    def get_or_create(self, key, builder, data_version=None, cacheable=None):
+        """
+        캐시에 있으면 반환, 없으면 builder()로 만들어 저장
+
+        data_version을 주면 만드는 도중 데이터가 교체된 경우(버전 불일치) 저장하지 않고 반환만 합니다.
+        cacheable(fig)가 False인 Figure(실패 안내 등)도 저장하지 않습니다.
+        """
+        fig = self.get(key)
+        if fig is None:
+            fig = builder()
+            if data_version is not None and data_version != self.data_version:
+                return fig
+            if cacheable is not None and not cacheable(fig):
+                return fig
+            fig = self.put(key, fig)
+        return fig
+
+    def _remove(self, key):
+        payload, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def set_data_version(self, version):
+        """기반 데이터가 바뀌면(버전 변경) 캐시 전체 무효화"""
+        with self._lock:
+            changed = version != self.data_version
+            self.data_version = version
+        if changed:
+            self.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+
+# 프로세스 공용 캐시
+figure_cache = FigureCache(
+    max_bytes=int(os.environ.get(MAX_BYTES_ENV, DEFAULT_MAX_BYTES)),
+    ttl=float(os.environ.get(TTL_ENV, DEFAULT_TTL))
+)
+
+register_value('dashboard_figure_cache_hits_total', 'counter', '차트 캐시 적중 수',
+               lambda: figure_cache.hits)
+register_value('dashboard_figure_cache_misses_total', 'counter', '차트 캐시 미적중 수',
+               lambda: figure_cache.misses)
+register_value('dashboard_figure_cache_evictions_total', 'counter', '크기 상한으로 밀려난 항목 수',
+               lambda: figure_cache.evictions)
+register_value('dashboard_figure_cache_entries', 'gauge', '차트 캐시 항목 수',
+               lambda: len(figure_cache._entries))
+register_value('dashboard_figure_cache_bytes', 'gauge', '차트 캐시 크기 (바이트)',
+               lambda: figure_cache._bytes)
+register_value('dashboard_figure_cache_hit_ratio', 'gauge', '차트 캐시 적중률',
+               lambda: figure_cache.hits / max(1, figure_cache.hits + figure_cache.misses))
@@ -0,0 +1,287 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+KOSIS 형식 합성 데이터 생성 스크립트
+DATA/ 의 원본 CSV 3개와 같은 레이아웃(헤더 행 수, 연도당 컬럼 수, '-' 표기)으로
+지역 수/연도 수를 늘린 파일을 만들어 대규모 부하 테스트에 사용합니다.
+
+사용법:
+    python generate_data.py --output synthetic --regions 250           # 전국 시군구 규모
+    python generate_data.py --output synthetic --regions 3500 --years 10 --dash 0.3
+    DASHBOARD_DATA_DIR=synthetic python app.py                          # 생성한 데이터로 실행
+"""
+
+import argparse
+import csv
+import os
+
+import numpy as np
+
+from preprocessing import DATA_FILES
+
+# 원본과 같은 순서의 서울 자치구 (앞 25개 지역 이름, 지도 경계와 일치)
+SEOUL_DISTRICTS = [
+    '종로구', '중구', '용산구', '성동구', '광진구', '동대문구', '중랑구', '성북구', '강북구',
+    '도봉구', '노원구', '은평구', '서대문구', '마포구', '양천구', '강서구', '구로구', '금천구',
+    '영등포구', '동작구', '관악구', '서초구', '강남구', '송파구', '강동구'
+]
+
+DISTRICT_HEADERS = [
+    '발생건수 (건)', '자동차 1만대당 발생건수 (건)', '사망자수 (명)',
+    '인구 10만명당 사망자수 (명)', '부상자수 (명)', '인구 10만명당 부상자수 (명)'
+]
+
+WEATHER_ITEMS = ['발생건수 (건)', '사망자 (명)', '부상자 (명)']
+WEATHER_TYPES = ['맑음', '흐림', '비', '안개', '눈', '기타/불명']
+WEATHER_SHARES = [0.88, 0.035, 0.06, 0.0005, 0.005, 0.0195]
+# 원본 2024년 블록에는 '안개' 컬럼이 없음 (연도당 6개 컬럼)
+WEATHER_NO_FOG_YEARS = {2024}
+
+VEHICLE_METRIC_HEADERS = ['발생건수 (건)', '사망자수 (명)', '부상자수 (명)']
+# 차량용도별 연도 블록의 17개 (발생, 사망, 부상) 묶음: (대분류, 중분류, 소분류), 소계는 하위 합
+VEHICLE_GROUPS = [
+    ('소계', '소계', '소계'),
+    ('사업용차량', '소계', '소계'),
+    ('사업용차량', '노선버스', '시내버스'),
+    ('사업용차량', '노선버스', '시외·고속버스'),
+    ('사업용차량', '전세버스', '소계'),
+    ('사업용차량', '택시', '소계'),
+    ('사업용차량', '화물', '소계'),
+    ('사업용차량', '렌터카', '소계'),
+    ('사업용차량', '기타', '소계'),
+    ('비사업용차량', '소계', '소계'),
+    ('비사업용차량', '승용차', '소계'),
+    ('비사업용차량', '버스', '소계'),
+    ('비사업용차량', '어린이통학버스', '소계'),
+    ('비사업용차량', '기타', '소계'),
+    ('이륜차', '소계', '소계'),
+    ('자전거', '소계', '소계'),
+    ('기타불명', '소계', '소계'),
+]
+VEHICLE_SHARES = [0.052, 0.007, 0.008, 0.117, 0.029, 0.056, 0.01,
+                  0.475, 0.011, 0.003, 0.058, 0.109, 0.05, 0.017]
+
+
+def region_names(n_regions):
+    """지역 이름 목록 (서울 25개 자치구 다음은 가상 지역)"""
+    names = SEOUL_DISTRICTS[:n_regions]
+    names += [f"가상{i:04d}구" for i in range(len(names) + 1, n_regions + 1)]
+    return names
+
+
+def _counts(rng, totals, shares):
+    """총 건수를 비율대로 나눈 (지역, 연도, 범주) 건수"""
+    return rng.multinomial(totals, np.asarray(shares) / np.sum(shares))
+
+
+def _casualties(rng, counts):
+    """발생건수로부터 사망자/부상자 수 생성"""
+    deaths = rng.binomial(counts, 0.006)
+    injuries = rng.binomial(counts * 2, 0.66)
+    return deaths, injuries
+
+
+def _blank(rng, values, dash_ratio, null_ratio):
+    """일부 값을 0으로 만들고 '-'(0) 또는 빈칸(결측)으로 표기할 위치 반환"""
+    u = rng.random(values.shape)
+    dash = u < dash_ratio
+    null = (u >= dash_ratio) & (u < dash_ratio + null_ratio)
+    values[dash | null] = 0
+    return dash, null
+
+
+def _format(values, dash, null, decimals=0):
+    """숫자 행렬을 KOSIS 표기 문자열 행렬로 ('-' / 빈칸 포함)"""
+    if decimals:
+        cells = np.char.mod(f'%.{decimals}f', values)
+    else:
+        cells = values.astype(np.int64).astype(str)
+    cells = cells.astype(object)
+    cells[dash] = '-'
+    cells[null] = ''
+    return cells
+
+
+def _write(path, header, label_rows, cells):
+    """헤더 + (라벨, 값) 행을 utf-8-sig CSV로 저장"""
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerows(header)
+        for labels, row in zip(label_rows, cells.tolist()):
+            writer.writerow(labels + row)
+
+
+def generate_district(path, names, years, totals, rng, dash_ratio, null_ratio):
+    """자치구별 현황 (헤더 2행, 연도당 6개 컬럼)"""
+    counts = totals.copy()
+    deaths, injuries = _casualties(rng, counts)
+    stacked = np.stack([counts, deaths, injuries], axis=-1)  # (지역, 연도, 3)
+    dash, null = _blank(rng, stacked, dash_ratio, null_ratio)
+    stacked = np.concatenate([stacked.sum(axis=0, keepdims=True), stacked])
+    dash = np.concatenate([np.zeros_like(dash[:1]), dash])
+    null = np.concatenate([np.zeros_like(null[:1]), null])
+
+    # 자동차 1만대당 / 인구 10만명당 비율 (지역별 분모 고정)
+    vehicles = rng.uniform(50_000, 400_000, size=(len(names) + 1, 1))
+    vehicles[0] = vehicles[1:].sum()
+    population = vehicles * rng.uniform(1.5, 3.5, size=vehicles.shape)
+    population[0] = population[1:].sum()
+    rates = np.stack([
+        stacked[..., 0] / vehicles * 1e4,
+        stacked[..., 1] / population * 1e5,
+        stacked[..., 2] / population * 1e5,
+    ], axis=-1)
+
+    n_rows, n_years = stacked.shape[:2]
+    cells = np.empty((n_rows, n_years, 6), dtype=object)
+    cells[..., 0::2] = _format(stacked, dash, null)
+    cells[..., 1::2] = _format(np.round(rates, 1), dash, null, decimals=1)
+
+    header = [
+        ['자치구별(1)', '자치구별(2)'] + [str(y) for y in years for _ in DISTRICT_HEADERS],
+        ['자치구별(1)', '자치구별(2)'] + DISTRICT_HEADERS * len(years),
+    ]
+    labels = [['합계', name] for name in ['소계'] + names]
+    _write(path, header, labels, cells.reshape(n_rows, -1))
+
+
+def generate_weather(path, names, years, totals, rng, dash_ratio, null_ratio):
+    """기상상태별 현황 (헤더 3행, 지역당 3개 항목 행, 연도당 소계 + 기상상태 컬럼)"""
+    counts = _counts(rng, totals, WEATHER_SHARES)  # (지역, 연도, 기상)
+    deaths, injuries = _casualties(rng, counts)
+    values = np.stack([counts, deaths, injuries], axis=1)  # (지역, 항목, 연도, 기상)
+    dash, null = _blank(rng, values, dash_ratio, null_ratio)
+
+    fog = WEATHER_TYPES.index('안개')
+    for j, year in enumerate(years):
+        if year in WEATHER_NO_FOG_YEARS:
+            values[:, :, j, fog] = 0
+
+    # 소계 컬럼 / 소계 행 추가
+    subtotal = values.sum(axis=-1, keepdims=True)
+    values = np.concatenate([subtotal, values], axis=-1)
+    dash = np.concatenate([np.zeros_like(subtotal, dtype=bool), dash], axis=-1)
+    null = np.concatenate([np.zeros_like(subtotal, dtype=bool), null], axis=-1)
+    values = np.concatenate([values.sum(axis=0, keepdims=True), values])
+    dash = np.concatenate([np.zeros_like(dash[:1]), dash])
+    null = np.concatenate([np.zeros_like(null[:1]), null])
+    cells = _format(values, dash, null)
+
+    # 연도별 컬럼 선택 ('안개' 없는 연도는 6개 컬럼)
+    header_years, header_types, blocks = [], [], []
+    for j, year in enumerate(years):
+        types = ['소계'] + [w for w in WEATHER_TYPES if not (year in WEATHER_NO_FOG_YEARS and w == '안개')]
+        idx = [0] + [1 + WEATHER_TYPES.index(w) for w in types[1:]]
+        blocks.append(cells[:, :, j, idx])
+        header_years += [str(year)] * len(types)
+        header_types += types
+    cells = np.concatenate(blocks, axis=-1).reshape(-1, len(header_types))
+
+    prefix = ['자치구별(1)', '자치구별(2)', '항목']
+    header = [prefix + header_years, prefix + ['계'] * len(header_types), prefix + header_types]
+    labels = [['합계', name, item] for name in ['소계'] + names for item in WEATHER_ITEMS]
+    _write(path, header, labels, cells)
+
+
+def generate_vehicle(path, names, years, totals, rng, dash_ratio, null_ratio):
+    """차량용도별 현황 (헤더 6행 + 소계 행, 연도당 51개 컬럼)"""
+    # 하위 분류가 있는 대분류의 소계는 합으로 채우고, 나머지(말단)만 난수 생성
+    parents = {level1 for level1, level2, _ in VEHICLE_GROUPS if level2 != '소계'}
+    leaves = [i for i, (level1, level2, _) in enumerate(VEHICLE_GROUPS)
+              if level1 != '소계' and (level2 != '소계' or level1 not in parents)]
+    counts = _counts(rng, totals, VEHICLE_SHARES)  # (지역, 연도, 말단 차종)
+    deaths, injuries = _casualties(rng, counts)
+    leaf_values = np.stack([counts, deaths, injuries], axis=-1)
+    leaf_dash, leaf_null = _blank(rng, leaf_values, dash_ratio, null_ratio)
+
+    n_regions, n_years = totals.shape
+    shape = (n_regions, n_years, len(VEHICLE_GROUPS), 3)
+    values = np.zeros(shape, dtype=np.int64)
+    dash = np.zeros(shape, dtype=bool)
+    null = np.zeros(shape, dtype=bool)
+    values[:, :, leaves] = leaf_values
+    dash[:, :, leaves] = leaf_dash
+    null[:, :, leaves] = leaf_null
+
+    # 대분류 소계 → 전체 소계 순서로 하위 합계
+    for i, (level1, level2, _) in enumerate(VEHICLE_GROUPS):
+        if level1 in parents and level2 == '소계':
+            children = [k for k in leaves if VEHICLE_GROUPS[k][0] == level1]
+            values[:, :, i] = values[:, :, children].sum(axis=2)
+    top = [i for i, group in enumerate(VEHICLE_GROUPS) if group[0] != '소계' and group[1] == '소계']
+    values[:, :, 0] = values[:, :, top].sum(axis=2)
+
+    values = np.concatenate([values.sum(axis=0, keepdims=True), values])
+    dash = np.concatenate([np.zeros_like(dash[:1]), dash])
+    null = np.concatenate([np.zeros_like(null[:1]), null])
+    cells = _format(values, dash, null).reshape(n_regions + 1, -1)
+
+    prefix = ['자치구별(1)', '자치구별(2)']
+    span = len(VEHICLE_GROUPS) * 3
+    header = [
+        prefix + [str(y) for y in years for _ in range(span)],
+        prefix + ['합계'] * span * len(years),
+    ]
+    for level in range(3):
+        header.append(prefix + [group[level] for group in VEHICLE_GROUPS for _ in range(3)] * len(years))
+    header.append(prefix + VEHICLE_METRIC_HEADERS * len(VEHICLE_GROUPS) * len(years))
+    labels = [['합계', name] for name in ['소계'] + names]
+    _write(path, header, labels, cells)
+
+
+def generate_dataset(output_dir, n_regions=25, n_years=15, latest_year=2024,
+                     dash_ratio=0.05, null_ratio=0.0, seed=0):
+    """
+    KOSIS 형식 CSV 3개를 output_dir에 생성 (파일명은 DATA/ 원본과 동일)
+
+    Args:
+        n_regions: 지역 수 (앞 25개는 서울 자치구 이름)
+        n_years: 연도 수 (latest_year부터 역순)
+        dash_ratio: 0으로 만들고 '-'로 표기할 값 비율
+        null_ratio: 0으로 만들고 빈칸으로 둘 값 비율
+        seed: 난수 시드 (같은 인자면 같은 파일)
+
+    Returns:
+        {'district' | 'weather' | 'vehicle': 파일 경로}
+    """
+    rng = np.random.default_rng(seed)
+    names = region_names(n_regions)
+    years = list(range(latest_year, latest_year - n_years, -1))
+
+    # 지역별 규모는 고정, 연도별로 약간씩 변동
+    scale = rng.lognormal(mean=np.log(1300), sigma=0.35, size=(n_regions, 1))
+    totals = rng.poisson(scale * rng.uniform(0.85, 1.15, size=(n_regions, n_years)))
+
+    os.makedirs(output_dir, exist_ok=True)
+    generators = {
+        'district': generate_district,
+        'weather': generate_weather,
+        'vehicle': generate_vehicle,
+    }
+    paths = {}
+    for name, generate in generators.items():
+        paths[name] = os.path.join(output_dir, DATA_FILES[name])
+        generate(paths[name], names, years, totals, rng, dash_ratio, null_ratio)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='KOSIS 형식 합성 데이터 생성')
+    parser.add_argument('--output', default='synthetic', help='출력 폴더 (기본: synthetic)')
+    parser.add_argument('--regions', type=int, default=250, help='지역 수 (기본: 250, 전국 시군구 규모)')
+    parser.add_argument('--years', type=int, default=15, help='연도 수 (기본: 15)')
+    parser.add_argument('--latest-year', type=int, default=2024, help='가장 최근 연도 (기본: 2024)')
+    parser.add_argument('--dash', type=float, default=0.05, help="'-' 표기 비율 (기본: 0.05)")
+    parser.add_argument('--null', type=float, default=0.0, help='빈칸 비율 (기본: 0)')
+    parser.add_argument('--seed', type=int, default=0, help='난수 시드 (기본: 0)')
+    args = parser.parse_args()
+
+    print(f"🧪 합성 데이터 생성 중... (지역 {args.regions}개, {args.years}년)")
+    paths = generate_dataset(args.output, args.regions, args.years, args.latest_year,
+                             args.dash, args.null, args.seed)
+    for name, path in paths.items():
+        print(f"✓ {name}: {path} ({os.path.getsize(path) / 1024 / 1024:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
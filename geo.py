@@ -0,0 +1,264 @@
+"""
+서울시 자치구 경계(GeoJSON) 저장소
+DATA/ 폴더에 번들된 경계 파일을 한 번만 읽어 모든 콜백이 공유합니다.
+경계 파일은 저장소에 포함되어 있지 않으므로 배포 전에 python geo.py 로 DATA/에 받아 두세요.
+준비하지 않았으면 앱 시작 시 ensure_geometry_file()이 한 번만 내려받기를 시도하며,
+콜백에서 호출하는 get_geometry()는 네트워크에 접근하지 않습니다.
+
+register_geometry_route()로 경계 파일을 내용 해시가 들어간 주소로 제공하면,
+지도 Figure는 geojson 대신 이 주소만 담고 브라우저가 경계를 한 번만 받아 재사용합니다.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from metrics import timed
+
+GEOJSON_FILENAME = 'seoul_municipalities_geo_simple.json'
+DEFAULT_GEOJSON_PATH = os.path.join('DATA', GEOJSON_FILENAME)
+
+# 원본 경계 파일 주소 (python geo.py 또는 시작 시 ensure_geometry_file()에서만 사용)
+GEOJSON_URL = "https://raw.githubusercontent.com/southkorea/seoul-maps/master/kostat/2013/json/seoul_municipalities_geo_simple.json"
+
+# 시작 시 내려받기 제한 시간 (초, 오프라인이면 첫 로드가 이만큼 늦어짐)
+DOWNLOAD_TIMEOUT = 10
+
+# 환경 변수로 경계 파일 경로와 체크섬을 바꿀 수 있음
+GEOJSON_PATH_ENV = 'SEOUL_GEOJSON_PATH'
+GEOJSON_SHA256_ENV = 'SEOUL_GEOJSON_SHA256'
+
+
+class GeometryError(Exception):
+    """경계 파일을 찾을 수 없거나 검증에 실패한 경우"""
+
+
+@dataclass(frozen=True)
+class SeoulGeometry:
+    """
+    파싱된 자치구 경계 (읽기 전용)
+
+    모든 콜백이 같은 객체를 공유하므로 geojson을 수정하면 안 됩니다.
+    frozen은 필드 재할당만 막으므로, 바꿔야 하면 copy.deepcopy(geometry.geojson)로 사본을 만드세요.
+    """
+    geojson: dict  # 공유 객체, 수정 금지 (위 참고)
+    names: tuple
+    centroids: tuple  # names와 같은 순서의 (경도, 위도)
+    sha256: str
+    source: str
+    raw: bytes  # 원본 파일 내용 (경계 라우트 응답)
+
+
+def _ring_moments(ring):
+    """링의 부호 있는 면적과 면적 가중 중심 모멘트 (신발끈 공식)"""
+    xy = np.asarray(ring, dtype=float)[:, :2]
+    x, y = xy[:, 0], xy[:, 1]
+    x1, y1 = np.roll(x, -1), np.roll(y, -1)
+    cross = x * y1 - x1 * y
+    area = cross.sum() / 2
+    return area, ((x + x1) * cross).sum() / 6, ((y + y1) * cross).sum() / 6
+
+
+def polygon_centroid(geometry):
+    """
+    Polygon/MultiPolygon의 면적 가중 중심 (경도, 위도)
+
+    외곽 링은 더하고 구멍(내부 링)은 빼며, 면적이 0이면 꼭짓점 평균을 사용합니다.
+    """
+    if geometry['type'] == 'Polygon':
+        polygons = [geometry['coordinates']]
+    elif geometry['type'] == 'MultiPolygon':
+        polygons = geometry['coordinates']
+    else:
+        raise GeometryError(f"지원하지 않는 geometry 타입: {geometry['type']}")
+
+    total_area = moment_x = moment_y = 0.0
+    for rings in polygons:
+        for i, ring in enumerate(rings):
+            area, mx, my = _ring_moments(ring)
+            # 링 방향과 무관하게 외곽은 +, 구멍은 -
+            sign = (1 if i == 0 else -1) * (1 if area >= 0 else -1)
+            total_area += sign * area
+            moment_x += sign * mx
+            moment_y += sign * my
+
+    if abs(total_area) < 1e-15:
+        points = np.concatenate([np.asarray(rings[0], dtype=float)[:, :2] for rings in polygons])
+        lon, lat = points.mean(axis=0)
+        return float(lon), float(lat)
+    return float(moment_x / total_area), float(moment_y / total_area)
+
+
+_lock = threading.Lock()
+_geometry = None
+_download_attempted = False  # ensure_geometry_file()은 프로세스당 한 번만 시도
+
+
+def _configured_path():
+    return os.environ.get(GEOJSON_PATH_ENV) or DEFAULT_GEOJSON_PATH
+
+
+@timed('load_geometry')
+def load_geometry(path=None, expected_sha256=None):
+    """
+    경계 파일을 읽어 SeoulGeometry로 반환
+
+    Args:
+        path: GeoJSON 파일 경로 (기본값: 환경 변수 또는 DATA/ 번들 파일)
+        expected_sha256: 지정하면 파일의 SHA-256과 비교해 불일치 시 GeometryError
+    """
+    path = path or _configured_path()
+    if expected_sha256 is None:
+        expected_sha256 = os.environ.get(GEOJSON_SHA256_ENV)
+
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    except OSError as e:
+        raise GeometryError(
+            f"경계 파일을 읽을 수 없습니다: {path} "
+            f"(python geo.py 로 {DEFAULT_GEOJSON_PATH} 를 준비하세요)"
+        ) from e
+
+    digest = hashlib.sha256(raw).hexdigest()
+    if expected_sha256 and digest != expected_sha256.lower():
+        raise GeometryError(f"경계 파일 체크섬 불일치: {path} ({digest})")
+
+    try:
+        geojson = json.loads(raw.decode('utf-8'))
+        names = tuple(feature['properties']['name'] for feature in geojson['features'])
+        # 자치구 라벨 위치 (로드 시 1회 계산)
+        centroids = tuple(polygon_centroid(feature['geometry']) for feature in geojson['features'])
+    except (ValueError, KeyError, TypeError, IndexError) as e:
+        raise GeometryError(f"GeoJSON 형식이 올바르지 않습니다: {path}") from e
+
+    return SeoulGeometry(geojson=geojson, names=names, centroids=centroids,
+                         sha256=digest, source=path, raw=raw)
+
+
+def ensure_geometry_file(timeout=DOWNLOAD_TIMEOUT):
+    """
+    기본 경로에 경계 파일이 없으면 원본 주소에서 내려받음 (앱 시작 시 호출, 콜백 경로에서는 호출하지 않음)
+
+    SEOUL_GEOJSON_PATH로 지정한 파일은 내려받지 않고, 실패해도 프로세스 안에서 다시 시도하지 않습니다
+    (그동안 지도는 '지도 로딩 실패'로 표시되며 python geo.py 로 파일을 준비하면 다음 렌더링부터 표시).
+
+    Returns:
+        경계 파일이 준비되어 있으면 True
+    """
+    global _download_attempted
+    path = _configured_path()
+    if path != DEFAULT_GEOJSON_PATH or os.path.exists(path):
+        return os.path.exists(path)
+    if _download_attempted:
+        return False
+    _download_attempted = True
+
+    print(f"🗺️ {path} 가 없어 경계 파일을 내려받는 중... ({GEOJSON_URL})")
+    try:
+        digest = download_geometry(path, timeout=timeout)
+    except Exception as e:
+        print(f"⚠️ 경계 파일 내려받기 실패 (python geo.py 로 준비하세요): {type(e).__name__}: {e}")
+        return False
+    print(f"✓ 경계 파일 저장: {path} (sha256={digest})")
+    return True
+
+
+def get_geometry():
+    """프로세스 전체에서 공유하는 경계 객체 반환 (최초 호출 시 1회 로드, 파일이 없으면 GeometryError)"""
+    global _geometry
+    geometry = _geometry
+    if geometry is None:
+        with _lock:
+            if _geometry is None:
+                _geometry = load_geometry()
+                print(f"✓ GeoJSON 로드 완료! ({len(_geometry.names)}개 자치구, {_geometry.source})")
+            geometry = _geometry
+    return geometry
+
+
+def geometry_digest():
+    """현재 경계 파일의 SHA-256, 파일이 없거나 검증에 실패하면 None (결과 캐시 키에 사용)"""
+    try:
+        return get_geometry().sha256
+    except GeometryError:
+        return None
+
+
+def refresh_geometry(path=None, expected_sha256=None):
+    """
+    경계 파일을 다시 읽어 공유 객체를 교체
+
+    검증에 실패하면 예외를 던지고 기존 객체를 그대로 유지합니다.
+    """
+    global _geometry
+    geometry = load_geometry(path, expected_sha256)
+    with _lock:
+        _geometry = geometry
+    print(f"✓ GeoJSON 갱신 완료! ({geometry.source}, sha256={geometry.sha256[:12]})")
+    return geometry
+
+
+_route_prefix = None  # register_geometry_route() 호출 전에는 None
+
+
+def geometry_url(geometry):
+    """
+    지도 Figure가 참조할 경계 파일 주소
+
+    경계 라우트가 등록되지 않았으면(벤치마크 등 서버 없이 차트만 만드는 경우) None을 반환하며,
+    이때 지도는 geojson을 Figure에 그대로 포함합니다.
+    """
+    if _route_prefix is None:
+        return None
+    return f"{_route_prefix}geo/seoul-{geometry.sha256[:16]}.json"
+
+
+def register_geometry_route(server, prefix='/'):
+    """
+    Flask 서버에 경계 파일 라우트 등록 (/geo/seoul-<해시>.json)
+
+    주소에 내용 해시가 들어있으므로 1년 immutable 캐시와 ETag를 붙입니다.
+    경계가 교체되면(refresh_geometry) 주소가 바뀌고, 캐시된 Figure가 들고 있던 이전 주소는
+    새 주소로 리다이렉트합니다.
+    """
+    global _route_prefix
+    from flask import redirect
+    from compression import IMMUTABLE_MAX_AGE, cached_response
+
+    @server.route(f'{prefix}geo/seoul-<digest>.json')
+    def geometry_endpoint(digest):
+        geometry = get_geometry()
+        if digest != geometry.sha256[:16]:
+            return redirect(geometry_url(geometry))
+        return cached_response(geometry.raw, 'application/json', IMMUTABLE_MAX_AGE, immutable=True)
+
+    _route_prefix = prefix
+
+
+def download_geometry(dest=DEFAULT_GEOJSON_PATH, url=GEOJSON_URL, timeout=60):
+    """원본 경계 파일을 내려받아 dest에 저장 (배포 준비용, 파일이 없으면 시작 시 ensure_geometry_file()이 한 번 호출)"""
+    import requests
+
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+    json.loads(response.content.decode('utf-8'))  # 형식 확인
+
+    os.makedirs(os.path.dirname(dest) or '.', exist_ok=True)
+    tmp_path = f"{dest}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(response.content)
+    os.replace(tmp_path, dest)
+    return hashlib.sha256(response.content).hexdigest()
+
+
+if __name__ == '__main__':
+    # DATA/ 폴더에 경계 파일 준비
+    print(f"🗺️ GeoJSON 다운로드 중... ({GEOJSON_URL})")
+    digest = download_geometry()
+    print(f"✓ 저장 완료: {DEFAULT_GEOJSON_PATH}")
+    print(f"  sha256: {digest}")
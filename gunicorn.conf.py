@@ -0,0 +1,43 @@
+"""
+gunicorn 설정
+실행: gunicorn app:server -c gunicorn.conf.py
+
+- DASHBOARD_PRELOAD=1 (기본): 마스터에서 app.py를 한 번 import해 큐브/경계를 로드하고,
+  fork된 워커는 같은 메모리 페이지를 공유합니다.
+- DASHBOARD_DATA_PLANE=mmap: 큐브를 .cache/ 아래 .npy 파일로 저장하고 워커는 읽기 전용
+  메모리 매핑으로 연결합니다 (preload 없이도 워커 간 물리 메모리 공유).
+- DASHBOARD_LAZY_START=1: import 시 데이터를 읽지 않아 마스터/워커가 바로 요청을 받고,
+  각 워커가 시작 직후 백그라운드에서 로드합니다. 준비 전에는 /ready가 503을 반환하므로
+  로드밸런서 readiness 체크를 /ready로 지정하세요 (mmap과 함께 쓰면 두 번째 워커부터는 공유 큐브에 연결만 함).
+- DASHBOARD_RELOAD_INTERVAL (기본 60초, 0이면 끔): 워커마다 DATA/의 최신 파일을 확인해
+  바뀌면 재시작 없이 교체합니다. 갱신은 DATA_PLANE과 무관하게 공유 큐브를 거치므로 원본은 워커 하나만
+  다시 읽고, DASHBOARD_CUBE_RETENTION초(기본 600) 동안 쓰이지 않은 이전 공유 큐브는 삭제합니다.
+- 지도/히트맵 콜백은 워커에서 fork한 작업 프로세스가 그립니다 (jobs.py, DASHBOARD_BACKGROUND_CALLBACKS=0이면 끔).
+  워커는 작업을 시작만 하고 바로 다음 요청을 받으므로 슬라이더 드래그가 워커를 붙잡지 않습니다.
+"""
+
+import gc
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8050')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+timeout = 120
+
+preload_app = os.environ.get('DASHBOARD_PRELOAD', '1') != '0'
+
+
+def post_worker_init(worker):
+    # fork 이후 워커마다 백그라운드 스레드 시작 (마스터의 스레드는 fork로 넘어가지 않음)
+    import app
+    # 지연 시작: 데이터 로드
+    if os.environ.get('DASHBOARD_LAZY_START') == '1':
+        app.start_loading()
+    # 원본 파일 감시 (DASHBOARD_RELOAD_INTERVAL 주기, 최신 파일로 바뀌면 다시 읽어 교체)
+    app.start_watching()
+
+
+def when_ready(server):
+    # 미리 로드한 객체를 GC 추적 대상에서 빼서 워커의 GC가 공유 페이지를 건드리지 않도록 함
+    if preload_app:
+        gc.freeze()
@@ -0,0 +1,90 @@
+"""
+백그라운드 콜백 모듈
+오래 걸리는 차트 콜백을 gunicorn 워커 대신 별도 작업 프로세스에서 실행합니다 (Dash 백그라운드 콜백 + DiskcacheManager).
+워커는 작업을 시작만 하고 바로 다음 요청을 받으며, 브라우저가 결과를 주기적으로 확인해 받아갑니다.
+
+- 슬라이더를 드래그해 같은 차트 콜백이 다시 호출되면 같은 브라우저의 이전 작업 프로세스는 종료됩니다.
+- 작업이 도는 동안 차트 제목 옆에 '계산 중' 표시를 띄웁니다.
+- 결과는 .cache/callbacks/ 에 (입력값, 원본 파일) 기준으로 남아 다른 워커도 재사용합니다.
+
+diskcache, multiprocess, psutil이 모두 설치되어 있고 fork로 작업 프로세스를 만들 수 있을 때만 켜지며
+(작업 프로세스가 워커의 큐브를 그대로 물려받음), 아니면 기존처럼 요청 스레드에서 실행합니다.
+
+환경 변수:
+    DASHBOARD_BACKGROUND_CALLBACKS=0   백그라운드 실행 끄기
+    DASHBOARD_BACKGROUND_POLL_MS       브라우저가 결과를 확인하는 주기 (밀리초, 기본 200)
+    DASHBOARD_BACKGROUND_EXPIRE        결과 캐시 유지 시간 (초, 기본 600)
+"""
+
+import os
+
+from dash import Output
+
+from data_cache import cache_dir
+
+BACKGROUND_ENV = 'DASHBOARD_BACKGROUND_CALLBACKS'
+POLL_MS_ENV = 'DASHBOARD_BACKGROUND_POLL_MS'
+EXPIRE_ENV = 'DASHBOARD_BACKGROUND_EXPIRE'
+
+DEFAULT_POLL_MS = 200  # Dash 기본값(1초)이면 작업이 금방 끝나도 1초를 기다림
+DEFAULT_EXPIRE = 600  # 초
+CACHE_SIZE_LIMIT = 256 * 1024 * 1024  # 결과 캐시 디스크 상한 (바이트)
+
+# 작업 중 표시 (차트별 '<id>-progress' 요소의 style)
+RUNNING_STYLE = {'display': 'inline-block', 'float': 'right'}
+IDLE_STYLE = {'display': 'none'}
+
+
+def create_background_manager(cache_by):
+    """
+    백그라운드 콜백 관리자 생성
+
+    Args:
+        cache_by: 결과 캐시 키에 더할 값을 반환하는 함수 (원본 파일이 바뀌면 이전 결과를 쓰지 않도록)
+
+    Returns:
+        DiskcacheManager (사용할 수 없으면 None → 요청 스레드에서 실행)
+    """
+    if os.environ.get(BACKGROUND_ENV, '1') == '0':
+        return None
+    try:
+        import diskcache
+        import multiprocess
+        import psutil  # noqa: F401  (작업 종료/상태 확인에 사용)
+        from dash import DiskcacheManager
+    except ImportError:
+        print("⚠️ diskcache/multiprocess/psutil이 설치되어 있지 않아 차트를 요청 스레드에서 그립니다")
+        return None
+    if multiprocess.get_start_method() != 'fork':
+        # spawn이면 작업마다 app.py를 다시 import해 데이터를 새로 읽어야 함 (Windows/macOS)
+        print("⚠️ fork를 사용할 수 없어 차트를 요청 스레드에서 그립니다")
+        return None
+
+    cache = diskcache.Cache(os.path.join(cache_dir(), 'callbacks'), size_limit=CACHE_SIZE_LIMIT)
+    expire = int(os.environ.get(EXPIRE_ENV, DEFAULT_EXPIRE))
+    return DiskcacheManager(cache, cache_by=[cache_by], expire=expire)
+
+
+def background_options(manager, graph_id):
+    """
+    차트 콜백을 백그라운드로 실행하는 app.callback 인자 (manager가 None이면 빈 dict)
+
+    같은 차트 콜백이 다시 호출되면 Dash가 진행 중인 이전 작업을 종료하므로 cancel 입력은 따로 두지 않습니다.
+    """
+    if manager is None:
+        return {}
+    return {
+        'background': True,
+        'manager': manager,
+        'interval': int(os.environ.get(POLL_MS_ENV, DEFAULT_POLL_MS)),
+        'running': [(Output(f'{graph_id}-progress', 'style'), RUNNING_STYLE, IDLE_STYLE)],
+    }
+
+
+def in_background_job():
+    """지금 백그라운드 작업 프로세스 안에서 실행 중이면 True"""
+    try:
+        import multiprocess
+    except ImportError:
+        return False
+    return multiprocess.parent_process() is not None
@@ -0,0 +1,189 @@
+"""
+KOSIS CSV 레이아웃 감지 모듈
+다중 행 헤더에서 연도/범주/지표 컬럼을 찾아 컬럼 선택 계획(ColumnPlan)으로 컴파일합니다.
+새 연도가 추가되거나 컬럼 순서가 바뀌어도 코드 수정 없이 헤더만 보고 읽을 수 있습니다.
+
+계획은 헤더 내용의 해시로 메모리와 .cache/ 에 JSON으로 저장해 재사용합니다.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from data_cache import cache_dir
+
+# 헤더 행은 첫 컬럼이 '자치구별(1)' 형태
+HEADER_PREFIX = '자치구별'
+
+
+class LayoutError(Exception):
+    """헤더에서 필요한 연도/지표 컬럼을 찾을 수 없는 경우"""
+
+
+@dataclass(frozen=True)
+class ColumnPlan:
+    """
+    컴파일된 컬럼 선택 계획
+
+    columns[g, m]은 (연도, 범주) 그룹 g의 지표 m이 들어있는 원본 컬럼 위치입니다.
+    그룹 순서는 원본 헤더 순서(최신 연도부터)를 따릅니다.
+    """
+    header_rows: int
+    years: tuple       # 그룹별 연도
+    categories: tuple  # 그룹별 범주 (범주가 없는 레이아웃은 None)
+    metrics: tuple     # 지표 이름
+    columns: np.ndarray
+
+    def to_dict(self):
+        return {
+            'header_rows': self.header_rows,
+            'years': list(self.years),
+            'categories': list(self.categories),
+            'metrics': list(self.metrics),
+            'columns': self.columns.tolist(),
+        }
+
+    def year_blocks(self):
+        """연도별 블록 구성 {연도: (범주들, 지표들)} (이전 계획과 연도 블록 비교용)"""
+        blocks = {}
+        for year, category in zip(self.years, self.categories):
+            blocks.setdefault(year, []).append(category)
+        return {year: (tuple(categories), self.metrics) for year, categories in blocks.items()}
+
+    def select_years(self, years):
+        """지정한 연도의 그룹만 남긴 계획"""
+        keep = [g for g, year in enumerate(self.years) if year in years]
+        return ColumnPlan(
+            header_rows=self.header_rows,
+            years=tuple(self.years[g] for g in keep),
+            categories=tuple(self.categories[g] for g in keep),
+            metrics=self.metrics,
+            columns=self.columns[keep],
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            header_rows=data['header_rows'],
+            years=tuple(data['years']),
+            categories=tuple(data['categories']),
+            metrics=tuple(data['metrics']),
+            columns=np.asarray(data['columns'], dtype=np.intp),
+        )
+
+
+def normalize_label(label):
+    """'자동차 1만대당 발생건수 (건)' → '자동차1만대당발생건수' (단위/공백 제거)"""
+    return re.sub(r'\s*\(.*?\)', '', label).replace(' ', '')
+
+
+def read_header(filepath, max_rows=20):
+    """첫 컬럼이 '자치구별'로 시작하는 헤더 행들 반환"""
+    header = []
+    with open(filepath, encoding='utf-8-sig', newline='') as f:
+        for row in csv.reader(f):
+            if not row or not row[0].startswith(HEADER_PREFIX) or len(header) >= max_rows:
+                break
+            header.append(row)
+    if not header:
+        raise LayoutError(f"KOSIS 헤더를 찾을 수 없습니다: {filepath}")
+    return header
+
+
+def compile_plan(header, metrics=None, category_rows=(), metric_row=None, select_category=None):
+    """
+    헤더 행들을 ColumnPlan으로 컴파일
+
+    Args:
+        header: read_header() 결과
+        metrics: 필요한 지표 이름 (정규화된 이름, 이 순서로 열 배치). None이면 컬럼당 값 1개
+        category_rows: 범주를 이루는 헤더 행 번호들
+        metric_row: 지표 이름이 있는 헤더 행 번호
+        select_category: 범주 레벨 튜플 → 범주 이름 (None이면 제외). 기본은 첫 레벨
+    """
+    if select_category is None:
+        select_category = (lambda levels: levels[0]) if category_rows else (lambda levels: None)
+
+    groups = {}  # (연도, 범주) -> {지표: 컬럼}
+    for col, year in enumerate(header[0]):
+        if not year.strip().isdigit():
+            continue  # 자치구/항목 라벨 컬럼
+        category = select_category(tuple(header[row][col] for row in category_rows))
+        if category is None and category_rows:
+            continue
+        metric = normalize_label(header[metric_row][col]) if metric_row is not None else None
+        if metrics is not None and metric not in metrics:
+            continue
+        groups.setdefault((int(year), category), {})[metric] = col
+
+    if not groups:
+        raise LayoutError("헤더에서 연도 컬럼을 찾을 수 없습니다")
+
+    wanted = list(metrics) if metrics is not None else [None]
+    columns = np.empty((len(groups), len(wanted)), dtype=np.intp)
+    for g, ((year, category), found) in enumerate(groups.items()):
+        missing = [m for m in wanted if m not in found]
+        if missing:
+            raise LayoutError(f"{year}년 {category or ''} 블록에 지표 컬럼이 없습니다: {missing}")
+        columns[g] = [found[m] for m in wanted]
+
+    return ColumnPlan(
+        header_rows=len(header),
+        years=tuple(year for year, _ in groups),
+        categories=tuple(category for _, category in groups),
+        metrics=tuple(wanted) if metrics is not None else ('값',),
+        columns=columns,
+    )
+
+
+_lock = threading.Lock()
+_plans = {}
+
+
+def _plan_path(kind, header_sha, version):
+    return os.path.join(cache_dir(), f"layout-{kind}-{header_sha[:16]}-v{version}.json")
+
+
+def load_plan(kind, filepath, version=0, **spec):
+    """
+    파일 헤더에 맞는 ColumnPlan 반환 (같은 헤더면 메모리/디스크에 캐시된 계획 재사용)
+
+    Args:
+        kind: 레이아웃 종류 (캐시 키 접두어)
+        filepath: KOSIS CSV 경로
+        version: 파서 버전 (spec이 바뀌면 올려서 디스크 캐시 무효화)
+        **spec: compile_plan()의 나머지 인자 (같은 kind에는 항상 같은 spec 사용)
+    """
+    header = read_header(filepath)
+    header_sha = hashlib.sha256(json.dumps(header, ensure_ascii=False).encode('utf-8')).hexdigest()
+    key = (kind, header_sha, version)
+
+    with _lock:
+        plan = _plans.get(key)
+    if plan is not None:
+        return plan
+
+    path = _plan_path(kind, header_sha, version)
+    try:
+        with open(path, encoding='utf-8') as f:
+            plan = ColumnPlan.from_dict(json.load(f))
+    except (OSError, ValueError, KeyError):
+        plan = compile_plan(header, **spec)
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(plan.to_dict(), f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ 레이아웃 캐시 저장 실패: {e}")
+
+    with _lock:
+        _plans[key] = plan
+    return plan
@@ -0,0 +1,148 @@
+"""
+대시보드 성능 계측 모듈
+단계별 처리 시간/응답 크기 히스토그램과 캐시 카운터를 모아 Prometheus 텍스트 형식으로 /metrics에 노출합니다.
+
+계측 값은 프로세스(워커) 단위입니다.
+"""
+
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# 처리 시간 구간 (초)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Prometheus 텍스트 노출 형식
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# 응답 크기 구간 (바이트)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+class Histogram:
+    """누적 구간 히스토그램 (라벨 조합별)"""
+
+    def __init__(self, name, help_text, label, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = buckets
+        self._series = {}  # 라벨 값 -> [구간별 개수..., 합계, 개수]
+        self._lock = threading.Lock()
+
+    def observe(self, label_value, value):
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        for label_value, series in items:
+            label = f'{self.label}="{_escape(label_value)}"'
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{{{label},le="{bound:g}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {series[-1]}')
+            lines.append(f'{self.name}_sum{{{label}}} {series[-2]:.6f}')
+            lines.append(f'{self.name}_count{{{label}}} {series[-1]}')
+        return lines
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+stage_seconds = Histogram(
+    'dashboard_stage_seconds', '처리 단계별 소요 시간 (초)', 'stage', LATENCY_BUCKETS)
+request_seconds = Histogram(
+    'dashboard_callback_seconds', '콜백 요청 처리 시간 (초)', 'output', LATENCY_BUCKETS)
+response_bytes = Histogram(
+    'dashboard_callback_response_bytes', '콜백 응답 크기 (바이트)', 'output', SIZE_BUCKETS)
+
+
+def _reset_locks():
+    # fork된 자식(백그라운드 콜백 작업 등)에서는 fork 시점에 다른 스레드가 잡고 있던 잠금이 풀리지 않으므로 새로 만듦
+    for histogram in (stage_seconds, request_seconds, response_bytes):
+        histogram._lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_locks)
+
+_values = []  # (이름, 종류, 설명, 값 함수)
+
+
+def register_value(name, kind, help_text, fn):
+    """조회 시점에 fn()으로 값을 읽는 counter/gauge 등록 (예: 캐시 적중 수)"""
+    _values.append((name, kind, help_text, fn))
+
+
+@contextmanager
+def measure(stage):
+    """with 블록 소요 시간을 stage로 기록"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_seconds.observe(stage, time.perf_counter() - start)
+
+
+def timed(stage):
+    """함수 소요 시간을 stage로 기록하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with measure(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def render_prometheus():
+    """모든 계측 값을 Prometheus 텍스트 형식으로"""
+    lines = []
+    for histogram in (stage_seconds, request_seconds, response_bytes):
+        lines.extend(histogram.render())
+    for name, kind, help_text, fn in _values:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"{name} {fn()}")
+    return "\n".join(lines) + "\n"
+
+
+def register_metrics_route(server, path='/metrics'):
+    """
+    Flask 서버에 /metrics 라우트와 콜백 요청 계측 훅 등록
+
+    Dash 콜백 요청(/_dash-update-component)마다 처리 시간과 응답 크기를 출력 id별로 기록합니다.
+    """
+    from flask import Response, g, request
+
+    @server.route(path)
+    def metrics_endpoint():
+        # mimetype=에 charset을 넣으면 Werkzeug가 charset을 한 번 더 붙여 Prometheus 3.x가 거부하므로 content_type으로 지정
+        return Response(render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+    @server.before_request
+    def start_timer():
+        if request.path.endswith('/_dash-update-component'):
+            g.metrics_start = time.perf_counter()
+
+    @server.after_request
+    def record_callback(response):
+        start = g.pop('metrics_start', None)
+        if start is not None:
+            body = request.get_json(silent=True) or {}
+            output = body.get('output', 'unknown')
+            request_seconds.observe(output, time.perf_counter() - start)
+            if not response.direct_passthrough:
+                response_bytes.observe(output, len(response.get_data()))
+        return response
@@ -6,147 +6,301 @@
 import pandas as pd
 import numpy as np
 import os
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import repeat
+from data_cache import load_cached, file_sha256
+from kosis import ColumnPlan, load_plan
+from metrics import timed
 
-def load_and_clean_data():
+# 파서 버전 (변환 결과가 바뀌는 수정 시 올려서 캐시를 무효화)
+PARSER_VERSION = 3
+
+# 원본 CSV 폴더 (DASHBOARD_DATA_DIR로 합성 데이터 폴더 등을 지정 가능)
+DATA_DIR = os.environ.get('DASHBOARD_DATA_DIR', 'DATA')
+
+# 데이터셋별 원본 파일 (번들 파일, 최신 파일을 찾지 못할 때 기본값)
+DATA_FILES = {
+    'district': '교통사고+현황(구별)_20251025143628.csv',
+    'weather': '기상상태별+교통사고+현황_20251025143706.csv',
+    'vehicle': '차량용도별+교통사고+현황_20251025143808.csv',
+}
+
+# KOSIS 내려받기 파일명 접두어 (뒤에 _YYYYMMDDhhmmss.csv 시각이 붙음)
+DATA_PREFIXES = {
+    'district': '교통사고+현황(구별)_',
+    'weather': '기상상태별+교통사고+현황_',
+    'vehicle': '차량용도별+교통사고+현황_',
+}
+
+
+# 병렬 로드 설정 (워커 수가 1이면 순차 로드)
+LOAD_WORKERS_ENV = 'DASHBOARD_LOAD_WORKERS'
+# thread(기본) 또는 process. process는 Windows 등 spawn 환경에서 app.py를 다시 import하므로 주의
+LOAD_EXECUTOR_ENV = 'DASHBOARD_LOAD_EXECUTOR'
+
+# 차량용도별 파일을 워커에 나눠 줄 때 구간당 최소 행 수
+MIN_CHUNK_ROWS = 500
+
+# 스트리밍 읽기 청크 크기 (행). 원본을 이 크기씩만 메모리에 올려 변환
+CHUNK_ROWS_ENV = 'DASHBOARD_CHUNK_ROWS'
+DEFAULT_CHUNK_ROWS = 2000
+
+# 증분 로드: 원본이 바뀌면 이전 캐시에 새로/바뀐 연도 블록만 파싱해 합침 (1이면 사용)
+INCREMENTAL_ENV = 'DASHBOARD_INCREMENTAL_LOAD'
+# 이전 파일의 최근 N개 연도는 잠정치 → 확정치로 바뀔 수 있어 항상 다시 파싱
+REPARSE_YEARS_ENV = 'DASHBOARD_INCREMENTAL_REPARSE_YEARS'
+DEFAULT_REPARSE_YEARS = 1
+
+
+def find_data_files(data_dir=None):
+    """
+    데이터셋별 최신 원본 파일 경로
+
+    파일명 끝의 내려받기 시각(_YYYYMMDDhhmmss)이 가장 늦은 파일을 고르고,
+    해당 접두어 파일이 없으면 번들 파일명(DATA_FILES)을 돌려줍니다.
+    """
+    data_dir = data_dir or DATA_DIR
+    try:
+        filenames = os.listdir(data_dir)
+    except OSError:
+        filenames = []
+
+    paths = {}
+    for name, prefix in DATA_PREFIXES.items():
+        candidates = [f for f in filenames if f.startswith(prefix) and f.endswith('.csv')]
+        # 같은 길이의 시각 문자열이므로 이름순 = 시각순
+        filename = max(candidates) if candidates else DATA_FILES[name]
+        paths[name] = os.path.join(data_dir, filename)
+    return paths
+
+
+def _load(name, loader, use_cache, path):
+    """데이터셋 하나 로드 (캐시 사용 시 Feather 캐시 경유, 캐시에 컬럼 계획을 함께 저장)"""
+    if use_cache:
+        update = partial(_update_frame, name, loader) if os.environ.get(INCREMENTAL_ENV) == '1' else None
+        return load_cached(name, path, loader, PARSER_VERSION,
+                           meta={'layout': _plan(name, path).to_dict()}, update=update)
+    return loader(path)
+
+
+@timed('load_and_clean_data')
+def load_and_clean_data(use_cache=True, workers=None, executor=None, paths=None):
     """
     3개 CSV 파일 로드 및 전처리
     
+    세 파일은 서로 독립이므로 동시에 읽고, 가장 큰 차량용도별 파일은 행 단위로 나눠
+    같은 워커 풀에서 변환합니다.
+    
+    Args:
+        use_cache: True면 .cache/ 의 Feather 캐시를 사용 (원본 해시/파서 버전으로 무효화)
+        workers: 동시 작업 수 (기본: DASHBOARD_LOAD_WORKERS 또는 min(3, CPU 수))
+        executor: 'thread' 또는 'process' (기본: DASHBOARD_LOAD_EXECUTOR 또는 'thread')
+        paths: 데이터셋별 원본 경로 (기본: find_data_files())
+    
     반환값:
     - df_weather: 기상별 데이터 (long format)
     - df_vehicle: 차종별 데이터 (long format)
     - df_district: 자치구별 데이터 (long format)
     """
+    workers = workers or int(os.environ.get(LOAD_WORKERS_ENV) or min(3, os.cpu_count() or 1))
+    executor = executor or os.environ.get(LOAD_EXECUTOR_ENV) or 'thread'
+    paths = paths or find_data_files()
     
-    data_dir = 'DATA'
-    
-    # 1. 자치구별 데이터 로드 및 변환
-    print("자치구별 데이터 로드 중...")
-    df_district = load_district_data(os.path.join(data_dir, '교통사고+현황(구별)_20251025143628.csv'))
-    
-    # 2. 기상 데이터 로드 및 변환
-    print("기상별 데이터 로드 중...")
-    df_weather = load_weather_data(os.path.join(data_dir, '기상상태별+교통사고+현황_20251025143706.csv'))
+    if workers <= 1:
+        # 1. 자치구별 데이터 로드 및 변환
+        print("자치구별 데이터 로드 중...")
+        df_district = _load('district', load_district_data, use_cache, paths['district'])
+        
+        # 2. 기상 데이터 로드 및 변환
+        print("기상별 데이터 로드 중...")
+        df_weather = _load('weather', load_weather_data, use_cache, paths['weather'])
+        
+        # 3. 차량 데이터 로드 및 변환
+        print("차량용도별 데이터 로드 중...")
+        df_vehicle = _load('vehicle', load_vehicle_data, use_cache, paths['vehicle'])
+    else:
+        print(f"자치구별/기상별/차량용도별 데이터 동시 로드 중... ({executor} × {workers})")
+        pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+        with pool_class(max_workers=workers) as pool:
+            district = pool.submit(_load, 'district', load_district_data, use_cache, paths['district'])
+            weather = pool.submit(_load, 'weather', load_weather_data, use_cache, paths['weather'])
+            # 차량 데이터는 현재 스레드에서 청크 작업을 같은 풀에 나눠 제출
+            vehicle_loader = partial(load_vehicle_data, pool=pool, chunks=workers)
+            df_vehicle = _load('vehicle', vehicle_loader, use_cache, paths['vehicle'])
+            df_district = district.result()
+            df_weather = weather.result()
     
-    # 3. 차량 데이터 로드 및 변환
-    print("차량용도별 데이터 로드 중...")
-    df_vehicle = load_vehicle_data(os.path.join(data_dir, '차량용도별+교통사고+현황_20251025143808.csv'))
+    # 세 데이터셋의 자치구 카테고리(코드)를 같은 사전으로 맞춤
+    _align_categories([df_weather, df_vehicle, df_district], '자치구')
     
     print("데이터 로드 완료!")
     return df_weather, df_vehicle, df_district
 
 
-def load_district_data(filepath):
-    """자치구별 데이터 로드 및 변환"""
-    df = pd.read_csv(filepath, encoding='utf-8-sig', header=None)
-    
-    # 데이터는 3행(index 2)부터 시작 (0,1행은 헤더)
-    new_data = []
+def _align_categories(frames, column):
+    """여러 DataFrame의 범주형 컬럼을 합집합 사전(정렬 순서)으로 통일"""
+    frames = [df for df in frames if column in df.columns]
+    categories = sorted(set().union(*(df[column].cat.categories for df in frames)))
+    for df in frames:
+        if list(df[column].cat.categories) != categories:
+            df[column] = df[column].cat.set_categories(categories)
 
-    for idx in range(2, len(df)):
-        row = df.iloc[idx]
-        district_1 = str(row[0])  # 항상 "합계"
-        district_2 = str(row[1])  # "소계" 또는 자치구명
 
-        # '소계' 제외 (전체 합계는 제외)
-        if district_2 == '소계':
-            continue
-        
-        # 각 연도별 데이터 추출
-        col_idx = 2
-        for year in range(2024, 2009, -1):  # 2024부터 2010까지
-            # 각 연도는 6개 컬럼: 발생건수, 자동차1만대당, 사망자수, 인구10만명당사망, 부상자수, 인구10만명당부상
-            try:
-                발생건수 = float(row[col_idx]) if pd.notna(row[col_idx]) and row[col_idx] != '-' else 0
-                자동차대당 = float(row[col_idx + 1]) if pd.notna(row[col_idx + 1]) and row[col_idx + 1] != '-' else 0
-                사망자수 = float(row[col_idx + 2]) if pd.notna(row[col_idx + 2]) and row[col_idx + 2] != '-' else 0
-                사망자비율 = float(row[col_idx + 3]) if pd.notna(row[col_idx + 3]) and row[col_idx + 3] != '-' else 0
-                부상자수 = float(row[col_idx + 4]) if pd.notna(row[col_idx + 4]) and row[col_idx + 4] != '-' else 0
-                부상자비율 = float(row[col_idx + 5]) if pd.notna(row[col_idx + 5]) and row[col_idx + 5] != '-' else 0
-                
-                new_data.append({
-                    '연도': year,
-                    '자치구': district_2,
-                    '발생건수': 발생건수,
-                    '자동차1만대당발생건수': 자동차대당,
-                    '사망자수': 사망자수,
-                    '인구10만명당사망자수': 사망자비율,
-                    '부상자수': 부상자수,
-                    '인구10만명당부상자수': 부상자비율
-                })
-            except Exception as e:
-                pass
-            
-            col_idx += 6
-    
-    df_clean = pd.DataFrame(new_data)
-    return df_clean
+def data_fingerprint(paths=None):
+    """원본 CSV 3개의 내용과 파서 버전으로 만든 식별자 (파생 데이터 캐시 키)"""
+    paths = paths or find_data_files()
+    digest = hashlib.sha256(f"parser-v{PARSER_VERSION}".encode())
+    for name in sorted(paths):
+        digest.update(file_sha256(paths[name]).encode())
+    return digest.hexdigest()
+
+
+# 자치구별: 연도당 6개 지표
+DISTRICT_METRICS = [
+    '발생건수', '자동차1만대당발생건수', '사망자수',
+    '인구10만명당사망자수', '부상자수', '인구10만명당부상자수'
+]
+
+# 인구/차량 대비 비율 지표 (float32), 나머지 건수/인원 지표는 int32
+RATE_METRICS = {'자동차1만대당발생건수', '인구10만명당사망자수', '인구10만명당부상자수'}
+
+# 차량용도별: 대분류 소계 컬럼만 사용 (중분류/소분류가 '소계'인 컬럼)
+VEHICLE_TYPES = ['소계', '사업용차량', '비사업용차량', '이륜차', '자전거']
+VEHICLE_METRICS = ['발생건수', '사망자수', '부상자수']
+
+# 범주형 컬럼의 고정 사전 (헤더에 새 범주가 있으면 추가)
+# 카테고리 순서는 문자열 정렬 순서와 같게 두어 groupby/pivot 결과 순서가 문자열 컬럼일 때와 같음
+CATEGORIES = {
+    '기상상태': sorted(['소계', '맑음', '흐림', '비', '안개', '눈', '기타/불명']),
+    '차종': sorted(VEHICLE_TYPES),
+    '항목': sorted(['발생건수 (건)', '사망자 (명)', '부상자 (명)']),
+}
+
+
+def _vehicle_type(levels):
+    """헤더 (대분류, 중분류, 소분류) → 차종 이름, 사용하지 않는 컬럼은 None"""
+    vtype, *sublevels = levels
+    if vtype in VEHICLE_TYPES and all(level == '소계' for level in sublevels):
+        return vtype
+    return None
+
+
+# 데이터셋별 헤더 해석 방법 (kosis.compile_plan 인자)
+LAYOUTS = {
+    # 0행: 연도, 1행: 지표
+    'district': dict(metrics=DISTRICT_METRICS, metric_row=1),
+    # 0행: 연도, 2행: 기상상태 (지표는 행 방향 '항목' 컬럼)
+    'weather': dict(category_rows=(2,)),
+    # 0행: 연도, 2~4행: 대/중/소분류, 5행: 지표
+    'vehicle': dict(metrics=VEHICLE_METRICS, category_rows=(2, 3, 4), metric_row=5,
+                    select_category=_vehicle_type),
+}
+
+
+def _plan(name, filepath):
+    """헤더에서 감지한 컬럼 선택 계획"""
+    return load_plan(name, filepath, version=PARSER_VERSION, **LAYOUTS[name])
+
+
+def _chunk_rows():
+    return int(os.environ.get(CHUNK_ROWS_ENV) or DEFAULT_CHUNK_ROWS)
+
+
+def _numeric_block(df, cols):
+    """지정 컬럼들을 숫자 행렬로 변환 (결측/'-'는 0)"""
+    block = df[cols].apply(pd.to_numeric, errors='coerce')
+    return block.fillna(0).to_numpy(dtype=float)
+
+
+def _categorical(codes, categories):
+    return pd.Categorical.from_codes(codes, categories=pd.Index(categories, dtype=object))
 
 
-def load_weather_data(filepath):
-    """기상별 데이터 로드 및 변환"""
-    # 간단한 방식으로 재작성 - 연도별로 직접 매핑
-    df = pd.read_csv(filepath, encoding='utf-8-sig', header=None)
+def _concat_frames(frames):
+    """
+    범주형 컬럼을 합집합 사전(정렬 순서)으로 맞춘 뒤 이어붙임
+
+    조각마다 자기 행에 있는 값으로만 사전을 만들기 때문에 사전이 다르면 concat 결과가 object가 됩니다.
+    정렬된 합집합은 전체를 한 번에 읽었을 때의 사전과 같습니다.
+    """
+    for column in frames[0].columns:
+        if isinstance(frames[0][column].dtype, pd.CategoricalDtype):
+            categories = sorted(set().union(*(df[column].cat.categories for df in frames)))
+            dtype = pd.CategoricalDtype(pd.Index(categories, dtype=object))
+            for df in frames:
+                df[column] = df[column].astype(dtype)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _read_long(filepath, plan, labels, category=None, start=0, nrows=None):
+    """
+    KOSIS CSV를 청크 단위로 읽어 long format DataFrame으로 변환
     
-    new_data = []
+    usecols로 라벨 컬럼과 계획에 있는 컬럼만 읽고, 청크마다 변환한 결과를 컬럼별로 모았다가
+    마지막에 한 번 이어붙이므로 원본 파일 전체를 object 컬럼으로 올리지 않습니다.
     
-    # 데이터는 4행(index 3)부터 시작
-    # 각 행은: "합계", 자치구명, 항목, 그 다음 연도별 데이터
-    for idx in range(3, len(df)):
-        row = df.iloc[idx]
-        district_1 = str(row[0])  # 항상 "합계"
-        district_2 = str(row[1])  # "소계" 또는 자치구명
-        항목 = str(row[2])
-        
+    출력 dtype: 연도 int16, 자치구/범주 category, 건수 int32, 비율 지표 float32
+    
+    Args:
+        plan: 헤더에서 감지한 ColumnPlan
+        labels: {출력 컬럼명: 원본 컬럼 위치} (첫 항목은 자치구 컬럼)
+        category: 계획의 범주(기상상태/차종)를 담을 컬럼명
+        start, nrows: 읽을 데이터 행 구간 (기본: 전체)
+    """
+    n_groups = len(plan.years)
+    value_cols = plan.columns.ravel().tolist()
+    reader = pd.read_csv(filepath, encoding='utf-8-sig', header=None,
+                         skiprows=plan.header_rows + start, nrows=nrows,
+                         usecols=sorted(set(labels.values()) | set(value_cols)),
+                         na_values='-', chunksize=_chunk_rows())
+    
+    label_parts = {name: [] for name in labels}
+    value_parts = []
+    for chunk in reader:
         # '소계' 제외 (전체 합계는 제외)
-        if district_2 == '소계':
-            continue
-        
-        # 직접 컬럼 인덱스 계산
-        # 2024년: 3~8 (6개)
-        # 2023년: 9~15 (7개)
-        # 2022년: 16~22 (7개)
-        # 나머지도 7개씩
-        
-        year_configs = [
-            (2024, 3, ['소계', '맑음', '흐림', '비', '눈', '기타/불명']),
-            (2023, 9, ['소계', '맑음', '흐림', '비', '안개', '눈', '기타/불명']),
-            (2022, 16, ['소계', '맑음', '흐림', '비', '안개', '눈', '기타/불명']),
-            (2021, 23, ['소계', '맑음', '흐림', '비', '안개', '눈', '기타/불명']),
-            (2020, 30, ['소계', '맑음', '흐림', '비', '안개', '눈', '기타/불명']),
-            (2019, 37, ['소계', '맑음', '흐림', '비', '안개', '눈', '기타/불명']),
-            (2018, 44, ['소계', '맑음', '흐림', '비', '안개', '눈', '기타/불명']),
-            (2017, 51, ['소계', '맑음', '흐림', '비', '안개', '눈', '기타/불명']),
-            (2016, 58, ['소계', '맑음', '흐림', '비', '안개', '눈', '기타/불명']),
-            (2015, 65, ['소계', '맑음', '흐림', '비', '안개', '눈', '기타/불명']),
-            (2014, 72, ['소계', '맑음', '흐림', '비', '안개', '눈', '기타/불명']),
-            (2013, 79, ['소계', '맑음', '흐림', '비', '안개', '눈', '기타/불명']),
-            (2012, 86, ['소계', '맑음', '흐림', '비', '안개', '눈', '기타/불명']),
-            (2011, 93, ['소계', '맑음', '흐림', '비', '안개', '눈', '기타/불명']),
-            (2010, 100, ['소계', '맑음', '흐림', '비', '안개', '눈', '기타/불명']),
-        ]
+        chunk = chunk[chunk[1].astype(str) != '소계']
         
-        for year, start_col, weather_list in year_configs:
-            for i, weather_name in enumerate(weather_list):
-                try:
-                    col_idx = start_col + i
-                    if col_idx < len(row):
-                        value = row[col_idx]
-                        if pd.isna(value) or value == '-':
-                            value = 0
-                        else:
-                            value = float(value)
-                        
-                        new_data.append({
-                            '연도': year,
-                            '자치구': district_2,
-                            '항목': 항목,
-                            '기상상태': weather_name,
-                            '값': value
-                        })
-                except:
-                    continue
+        # (행, 그룹 × 지표) → (행 × 그룹, 지표)
+        for name, col in labels.items():
+            label_parts[name].append(chunk[col].astype(str).to_numpy(dtype=object))
+        value_parts.append(_numeric_block(chunk, value_cols).reshape(-1, len(plan.metrics)))
     
-    df_clean = pd.DataFrame(new_data)
+    values = np.concatenate(value_parts) if value_parts else np.empty((0, len(plan.metrics)))
+    n_rows = len(values) // max(1, n_groups)
+    columns = {'연도': np.tile(np.asarray(plan.years, dtype=np.int16), n_rows)}
+    
+    # 라벨은 원본 행 단위로 코드화한 뒤 정수 코드만 반복
+    for name, parts in label_parts.items():
+        row_labels = np.concatenate(parts) if parts else np.array([], dtype=object)
+        categories = sorted(set(CATEGORIES.get(name, ())) | set(row_labels))
+        codes = pd.Index(categories).get_indexer(row_labels)
+        columns[name] = _categorical(np.repeat(codes, n_groups), categories)
+    if category:
+        categories = sorted(set(CATEGORIES.get(category, ())) | set(plan.categories))
+        codes = pd.Index(categories).get_indexer(list(plan.categories))
+        columns[category] = _categorical(np.tile(codes, n_rows), categories)
+    
+    for i, metric in enumerate(plan.metrics):
+        columns[metric] = values[:, i].astype(np.float32 if metric in RATE_METRICS else np.int32)
+    return pd.DataFrame(columns)
+
+
+@timed('load_district_data')
+def load_district_data(filepath, plan=None):
+    """자치구별 데이터 로드 및 변환 (plan: 일부 연도만 읽을 때의 컬럼 계획)"""
+    plan = plan or _plan('district', filepath)
+    return _read_long(filepath, plan, labels={'자치구': 1})
+
+
+@timed('load_weather_data')
+def load_weather_data(filepath, plan=None):
+    """기상별 데이터 로드 및 변환 (plan: 일부 연도만 읽을 때의 컬럼 계획)"""
+    # 각 행은: "합계", 자치구명, 항목, 그 다음 (연도, 기상상태)별 데이터
+    # 연도마다 기상상태 컬럼 수가 다를 수 있음 (2024년은 '안개' 없음)
+    plan = plan or _plan('weather', filepath)
+    df_clean = _read_long(filepath, plan, labels={'자치구': 1, '항목': 2}, category='기상상태')
     
     # 디버깅: 데이터 확인
     if len(df_clean) == 0:
@@ -160,11 +314,12 @@ def load_weather_data(filepath):
         index=['연도', '자치구', '기상상태'],
         columns='항목',
         values='값',
-        aggfunc='sum'
+        aggfunc='sum',
+        observed=True
     ).reset_index()
     
     # 컬럼명 정리
-    df_pivot.columns.name = None
+    df_pivot.columns = [str(col) for col in df_pivot.columns]
     if '발생건수 (건)' in df_pivot.columns:
         df_pivot = df_pivot.rename(columns={
             '발생건수 (건)': '발생건수',
@@ -173,88 +328,141 @@ def load_weather_data(filepath):
         })
     
     # NaN을 0으로 채우기
-    df_pivot = df_pivot.fillna(0)
+    counts = [col for col in ('발생건수', '사망자수', '부상자수') if col in df_pivot.columns]
+    df_pivot[counts] = df_pivot[counts].fillna(0).astype(np.int32)
     
     return df_pivot
 
 
-def load_vehicle_data(filepath):
-    """차량용도별 데이터 로드 및 변환"""
-    df = pd.read_csv(filepath, encoding='utf-8-sig', header=None)
+def _count_rows(filepath):
+    """파일의 전체 행 수"""
+    with open(filepath, 'rb') as f:
+        return sum(1 for _ in f)
+
+
+def _vehicle_rows(filepath, plan, start, nrows):
+    """차량용도별 파일의 데이터 행 [start, start + nrows) 구간을 long format으로 변환"""
+    return _read_long(filepath, plan, labels={'자치구': 1}, category='차종', start=start, nrows=nrows)
+
+
+@timed('load_vehicle_data')
+def load_vehicle_data(filepath, pool=None, chunks=1, plan=None):
+    """
+    차량용도별 데이터 로드 및 변환
     
-    new_data = []
+    Args:
+        pool: 지정하면 행을 chunks개 구간으로 나눠 이 Executor에서 동시에 변환
+        chunks: 나눌 구간 수 (구간당 최소 MIN_CHUNK_ROWS행)
+        plan: 일부 연도만 읽을 때의 컬럼 계획
+    """
+    # 헤더 다음 첫 행은 소계
+    plan = plan or _plan('vehicle', filepath)
     
-    # 데이터는 8행(index 7)부터 시작 (0~6행은 헤더, 7행은 소계)
-    for idx in range(7, len(df)):
-        row = df.iloc[idx]
-        district_1 = str(row[0])  # 항상 "합계"
-        district_2 = str(row[1])  # "소계" 또는 자치구명
-        
-        # '소계' 제외 (전체 합계는 제외)
-        if district_2 == '소계':
-            continue
-        
-        # 각 연도별로 차종별 데이터 추출
-        col_idx = 2
-        for year in range(2024, 2009, -1):  # 2024부터 2010까지
-            # 각 연도는 51개 컬럼
-            try:
-                # 소계 (0-2)
-                소계_발생 = float(row[col_idx]) if pd.notna(row[col_idx]) and row[col_idx] != '-' else 0
-                소계_사망 = float(row[col_idx + 1]) if pd.notna(row[col_idx + 1]) and row[col_idx + 1] != '-' else 0
-                소계_부상 = float(row[col_idx + 2]) if pd.notna(row[col_idx + 2]) and row[col_idx + 2] != '-' else 0
-                
-                # 사업용차량 소계 (3-5)
-                사업용_발생 = float(row[col_idx + 3]) if pd.notna(row[col_idx + 3]) and row[col_idx + 3] != '-' else 0
-                사업용_사망 = float(row[col_idx + 4]) if pd.notna(row[col_idx + 4]) and row[col_idx + 4] != '-' else 0
-                사업용_부상 = float(row[col_idx + 5]) if pd.notna(row[col_idx + 5]) and row[col_idx + 5] != '-' else 0
-                
-                # 비사업용차량 소계 (27-29)
-                비사업용_발생 = float(row[col_idx + 27]) if pd.notna(row[col_idx + 27]) and row[col_idx + 27] != '-' else 0
-                비사업용_사망 = float(row[col_idx + 28]) if pd.notna(row[col_idx + 28]) and row[col_idx + 28] != '-' else 0
-                비사업용_부상 = float(row[col_idx + 29]) if pd.notna(row[col_idx + 29]) and row[col_idx + 29] != '-' else 0
-                
-                # 이륜차 (42-44)
-                이륜차_발생 = float(row[col_idx + 42]) if pd.notna(row[col_idx + 42]) and row[col_idx + 42] != '-' else 0
-                이륜차_사망 = float(row[col_idx + 43]) if pd.notna(row[col_idx + 43]) and row[col_idx + 43] != '-' else 0
-                이륜차_부상 = float(row[col_idx + 44]) if pd.notna(row[col_idx + 44]) and row[col_idx + 44] != '-' else 0
-                
-                # 자전거 (45-47)
-                자전거_발생 = float(row[col_idx + 45]) if pd.notna(row[col_idx + 45]) and row[col_idx + 45] != '-' else 0
-                자전거_사망 = float(row[col_idx + 46]) if pd.notna(row[col_idx + 46]) and row[col_idx + 46] != '-' else 0
-                자전거_부상 = float(row[col_idx + 47]) if pd.notna(row[col_idx + 47]) and row[col_idx + 47] != '-' else 0
-                
-                # 각 차종별로 레코드 추가
-                vehicle_types = [
-                    ('소계', 소계_발생, 소계_사망, 소계_부상),
-                    ('사업용차량', 사업용_발생, 사업용_사망, 사업용_부상),
-                    ('비사업용차량', 비사업용_발생, 비사업용_사망, 비사업용_부상),
-                    ('이륜차', 이륜차_발생, 이륜차_사망, 이륜차_부상),
-                    ('자전거', 자전거_발생, 자전거_사망, 자전거_부상)
-                ]
-                
-                for vtype, 발생, 사망, 부상 in vehicle_types:
-                    new_data.append({
-                        '연도': year,
-                        '자치구': district_2,
-                        '차종': vtype,
-                        '발생건수': 발생,
-                        '사망자수': 사망,
-                        '부상자수': 부상
-                    })
-                
-            except Exception as e:
-                pass
-            
-            col_idx += 51  # 다음 연도로 (51개 컬럼)
+    n_rows = _count_rows(filepath) - plan.header_rows
+    chunk_rows = max(MIN_CHUNK_ROWS, -(-n_rows // max(1, chunks)))
+    starts = list(range(0, n_rows, chunk_rows))
     
-    df_clean = pd.DataFrame(new_data)
+    if pool is None or len(starts) <= 1:
+        parts = [_vehicle_rows(filepath, plan, start, chunk_rows) for start in starts]
+    else:
+        parts = list(pool.map(_vehicle_rows, repeat(filepath), repeat(plan), starts, repeat(chunk_rows)))
+    df_clean = _concat_frames(parts) if len(parts) > 1 else parts[0]
     
     print(f"✓ 차량용도별 데이터 레코드 수: {len(df_clean)}")
     
     return df_clean
 
 
+def _merge_years(name, new_part, old_part, plan):
+    """
+    새로 파싱한 연도와 이전 캐시의 연도를 전체 파싱과 같은 행 순서로 합침
+
+    자치구별/차량용도별은 원본 행 → (연도, 범주) 그룹 순서, 기상별은 pivot 결과와 같은
+    (연도, 자치구, 기상상태) 정렬 순서입니다.
+    """
+    # 범주형 컬럼은 같은 사전으로 맞춰야 concat 후에도 category로 남음 (캐시에서 읽은 사전은 dtype이 다를 수 있음)
+    merged = _concat_frames([new_part, old_part])
+    if name == 'weather':
+        return merged.sort_values(['연도', '자치구', '기상상태'], ignore_index=True)
+
+    # 원본 행 순서 (자치구 하나가 원본 한 행)
+    districts = merged['자치구'].cat.categories
+    row_rank = np.empty(len(districts), dtype=np.int64)
+    row_rank[districts.get_indexer(pd.unique(new_part['자치구']))] = np.arange(len(districts))
+    row_pos = row_rank[merged['자치구'].cat.codes.to_numpy()]
+
+    # 새 파일 헤더의 (연도, 범주) 그룹 순서
+    category = '차종' if name == 'vehicle' else None
+    years = np.unique(np.asarray(plan.years))
+    categories = merged[category].cat.categories if category else pd.Index([None])
+    group_rank = np.full((len(years), len(categories)), -1, dtype=np.int64)
+    for g, (year, cat) in enumerate(zip(plan.years, plan.categories)):
+        group_rank[years.searchsorted(year), categories.get_loc(cat) if category else 0] = g
+    cat_codes = merged[category].cat.codes.to_numpy() if category else 0
+    group_pos = group_rank[years.searchsorted(merged['연도'].to_numpy()), cat_codes]
+
+    order = np.lexsort((group_pos, row_pos))
+    return merged.take(order).reset_index(drop=True)
+
+
+def _update_frame(name, loader, old_df, old_meta, filepath):
+    """
+    증분 로드: 이전 캐시에 새 파일의 새로/바뀐 연도 블록만 파싱해서 합침
+
+    헤더에서 연도 블록 구성(범주/지표)이 이전 계획과 같은 연도는 이전 캐시 값을 그대로 쓰고,
+    새 연도, 구성이 바뀐 연도, 이전 파일의 최근 연도(DASHBOARD_INCREMENTAL_REPARSE_YEARS)만 파싱합니다.
+
+    이전 캐시는 같은 원본 폴더에서 만든 것만 받지만(data_cache.previous_cache), 다른 데이터로 바뀐 경우를
+    걸러내도록 다음을 확인하고 하나라도 어긋나면 None을 반환해 전체를 파싱합니다.
+    - 이전 헤더의 연도 순서가 새 헤더에서 새 연도 뒤에 그대로 이어짐 (최신 연도부터 나열)
+    - 자치구 구성이 같음
+    - 이전 캐시에서 가져올 연도 중 가장 오래된 연도 하나를 함께 파싱해 값이 같음
+    """
+    old_plan = ColumnPlan.from_dict(old_meta['layout'])
+    old_blocks = old_plan.year_blocks()
+    plan = _plan(name, filepath)
+    blocks = plan.year_blocks()
+
+    old_years = list(dict.fromkeys(old_plan.years))
+    new_years = list(dict.fromkeys(plan.years))
+    added = [year for year in new_years if year not in old_blocks]
+    if new_years != added + old_years[:len(new_years) - len(added)]:
+        print(f"⚠️ {name}: 연도 구성이 이전 파일과 이어지지 않아 전체를 다시 파싱합니다")
+        return None
+
+    n_recent = int(os.environ.get(REPARSE_YEARS_ENV, DEFAULT_REPARSE_YEARS))
+    recent = set(sorted(old_blocks, reverse=True)[:n_recent])
+    reparse = {year for year, block in blocks.items() if old_blocks.get(year) != block or year in recent}
+    keep = set(blocks) - reparse
+    if not reparse or not keep or not keep <= set(old_df['연도'].unique().tolist()):
+        return None
+
+    # 표본 연도는 새로 파싱한 값을 쓰고, 이전 캐시 값과 비교만 함
+    sample = min(keep)
+    print(f"  {name}: {sorted(reparse)}년만 파싱, 나머지 {len(keep)}개 연도는 이전 캐시 사용 ({sample}년으로 검증)")
+    new_part = loader(filepath, plan=plan.select_years(reparse | {sample}))
+    old_part = old_df[old_df['연도'].isin(sorted(keep))].reset_index(drop=True)
+    if set(new_part['자치구'].unique()) != set(old_part['자치구'].unique()):
+        print(f"⚠️ {name}: 자치구 구성이 바뀌어 전체를 다시 파싱합니다")
+        return None
+    if not _same_values(new_part[new_part['연도'] == sample], old_part[old_part['연도'] == sample]):
+        print(f"⚠️ {name}: {sample}년 값이 이전 캐시와 달라 전체를 다시 파싱합니다")
+        return None
+    old_part = old_part[old_part['연도'] != sample].reset_index(drop=True)
+    return _merge_years(name, new_part, old_part, plan)
+
+
+def _same_values(a, b):
+    """같은 연도의 두 조각이 (라벨, 값) 기준으로 같은지 (행 순서/범주 사전과 무관)"""
+    if sorted(a.columns) != sorted(b.columns) or len(a) != len(b):
+        return False
+    labels = [col for col in a.columns if isinstance(a[col].dtype, pd.CategoricalDtype)]
+    def normalize(df):
+        df = df.astype({col: str for col in labels})
+        return df.sort_values(labels).reset_index(drop=True)[sorted(a.columns)]
+    return normalize(a).equals(normalize(b))
+
+
 if __name__ == '__main__':
     # 테스트
     df_weather, df_vehicle, df_district = load_and_clean_data()
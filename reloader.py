@@ -0,0 +1,112 @@
+"""
+원본 데이터 자동 갱신 모듈
+DATA/ 폴더를 주기적으로 확인해 데이터셋별 최신 파일이 바뀌면 백그라운드 스레드에서 다시 읽습니다.
+요청 처리 스레드는 파싱을 기다리지 않고, 새 데이터가 준비되면 한 번에 교체됩니다.
+
+복사 중인 파일을 읽지 않도록 같은 변경(파일 경로/크기/수정 시각)이 두 번 연속 보일 때만 갱신합니다.
+"""
+
+import os
+import threading
+
+from metrics import register_value
+from preprocessing import find_data_files
+
+RELOAD_INTERVAL_ENV = 'DASHBOARD_RELOAD_INTERVAL'
+DEFAULT_RELOAD_INTERVAL = 60  # 초 (0이면 감시하지 않음)
+
+
+def files_signature(paths):
+    """데이터셋별 (경로, 크기, 수정 시각). 파일이 없으면 크기/시각은 None"""
+    signature = []
+    for name in sorted(paths):
+        try:
+            stat = os.stat(paths[name])
+            signature.append((name, paths[name], stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            signature.append((name, paths[name], None, None))
+    return tuple(signature)
+
+
+class DataWatcher:
+    """
+    최신 원본 파일 감시 스레드
+
+    Args:
+        reload: 새 경로(dict)를 받아 데이터를 다시 읽고 교체하는 함수
+        current: 지금 사용 중인 파일의 files_signature() (아직 로드 전이면 None)
+        interval: 확인 주기 (초)
+    """
+
+    def __init__(self, reload, current, interval=DEFAULT_RELOAD_INTERVAL):
+        self.reload = reload
+        self.current = current
+        self.interval = interval
+
+        self.reloads = 0
+        self.failures = 0
+        self._pending = None  # 한 번 보인 변경 (다음 확인에서도 같으면 갱신)
+        self._failed = None   # 갱신에 실패한 변경 (파일이 다시 바뀔 때까지 재시도하지 않음)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def check(self):
+        """한 번 확인해서 필요하면 갱신. 갱신했으면 True"""
+        current = self.current()
+        if current is None:
+            return False  # 첫 로드가 끝나기 전
+
+        paths = find_data_files()
+        signature = files_signature(paths)
+        if signature == current or signature == self._failed:
+            self._pending = None
+            return False
+        if any(size is None for _, _, size, _ in signature):
+            return False
+        if signature != self._pending:
+            self._pending = signature
+            return False
+
+        self._pending = None
+        changed = [name for (name, path, *_), (_, old, *_) in zip(signature, current) if path != old]
+        print(f"🔄 원본 데이터 변경 감지 → 다시 읽는 중... ({', '.join(changed) or '같은 파일명'})")
+        try:
+            self.reload(paths)
+        except Exception as e:
+            self.failures += 1
+            self._failed = signature
+            print(f"❌ 데이터 갱신 실패, 기존 데이터를 유지합니다: {type(e).__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
+        self.reloads += 1
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:  # 감시 스레드는 죽지 않도록
+                print(f"⚠️ 데이터 감시 오류: {e}")
+
+    def start(self):
+        if self._thread is None and self.interval > 0:
+            self._thread = threading.Thread(target=self._run, name='dashboard-data-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+
+def start_watcher(reload, current):
+    """DASHBOARD_RELOAD_INTERVAL 주기로 감시 시작 (0이면 감시하지 않고 None 반환)"""
+    interval = float(os.environ.get(RELOAD_INTERVAL_ENV, DEFAULT_RELOAD_INTERVAL))
+    if interval <= 0:
+        return None
+    watcher = DataWatcher(reload, current, interval).start()
+    register_value('dashboard_data_reloads_total', 'counter', '원본 데이터 자동 갱신 횟수',
+                   lambda: watcher.reloads)
+    register_value('dashboard_data_reload_failures_total', 'counter', '원본 데이터 갱신 실패 횟수',
+                   lambda: watcher.failures)
+    return watcher
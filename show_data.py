@@ -69,13 +69,13 @@ def main():
     
     # 기상별 통계
     print("\n▶ 2024년 기상별 사고 건수:")
-    weather_stats = df_weather[df_weather['연도'] == 2024].groupby('기상상태')['발생건수'].sum().sort_values(ascending=False)
+    weather_stats = df_weather[df_weather['연도'] == 2024].groupby('기상상태', observed=True)['발생건수'].sum().sort_values(ascending=False)
     for weather, count in weather_stats.items():
         print(f"  {weather}: {count:,.0f}건")
     
     # 차종별 통계
     print("\n▶ 2024년 차종별 사고 건수:")
-    vehicle_stats = df_vehicle[df_vehicle['연도'] == 2024].groupby('차종')['발생건수'].sum().sort_values(ascending=False)
+    vehicle_stats = df_vehicle[df_vehicle['연도'] == 2024].groupby('차종', observed=True)['발생건수'].sum().sort_values(ascending=False)
     for vehicle, count in vehicle_stats.items():
         print(f"  {vehicle}: {count:,.0f}건")
     
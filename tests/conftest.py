@@ -0,0 +1,20 @@
+"""
+테스트 공통 설정
+저장소 최상위 모듈(preprocessing, app 등)을 import할 수 있도록 경로를 추가하고,
+캐시는 테스트마다 임시 폴더에 저장합니다.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """.cache/ 대신 테스트별 임시 캐시 폴더 사용"""
+    path = tmp_path / 'cache'
+    monkeypatch.setenv('DASHBOARD_CACHE_DIR', str(path))
+    return path
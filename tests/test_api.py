@@ -0,0 +1,60 @@
+"""집계 조회 API 테스트"""
+
+import pytest
+from flask import Flask
+
+import preprocessing
+from api import register_api_routes
+from cube import AccidentCube
+from generate_data import generate_dataset
+
+
+@pytest.fixture(scope='module')
+def cube(tmp_path_factory):
+    paths = generate_dataset(str(tmp_path_factory.mktemp('synthetic')), n_regions=25, n_years=3)
+    return AccidentCube.from_frames(*preprocessing.load_and_clean_data(use_cache=False, workers=1, paths=paths))
+
+
+@pytest.fixture
+def client(cube):
+    server = Flask(__name__)
+    current = {'value': (cube, 7), 'reads': 0}
+
+    def get_current():
+        current['reads'] += 1
+        return current['value']
+
+    register_api_routes(server, get_current)
+    client = server.test_client()
+    client.current = current
+    return client
+
+
+def test_cube_and_version_are_read_once_per_request(client):
+    response = client.get('/api/district?group_by=year')
+
+    assert response.status_code == 200
+    assert response.get_json()['data_version'] == 7
+    assert client.current['reads'] == 1
+
+
+def test_unknown_format_is_rejected(client):
+    response = client.get('/api/district?format=xml')
+
+    assert response.status_code == 400
+    assert 'format' in response.get_json()['error']
+
+
+@pytest.mark.parametrize('endpoint', ['weather', 'vehicle'])
+def test_group_by_is_only_accepted_by_district(client, endpoint):
+    assert client.get(f'/api/{endpoint}?group_by={endpoint}').status_code == 400
+
+    response = client.get(f'/api/{endpoint}')
+    assert response.status_code == 200
+    assert 'group_by' not in response.get_json()['query']
+
+
+def test_not_ready_returns_503(client):
+    client.current['value'] = (None, 0)
+
+    assert client.get('/api/district').status_code == 503
@@ -0,0 +1,46 @@
+"""차트 생성 테스트"""
+
+import json
+
+import pandas as pd
+
+import geo
+from charts import create_map_chart, create_ranking_chart, is_failed_figure
+from figure_cache import FigureCache
+
+
+def test_ranking_chart_with_fewer_districts_than_top_n():
+    df = pd.DataFrame({
+        '연도': [2024, 2024, 2024],
+        '자치구': ['강남구', '송파구', '종로구'],
+        '발생건수': [300, 200, 100],
+    })
+
+    fig = create_ranking_chart(df, top_n=10)
+
+    assert list(fig.data[0].y) == ['종로구', '송파구', '강남구']
+    assert 'TOP 3' in fig.layout.title.text
+
+
+def test_map_failure_is_not_cached_until_geometry_exists(tmp_path, monkeypatch):
+    path = tmp_path / 'seoul.json'
+    monkeypatch.setenv(geo.GEOJSON_PATH_ENV, str(path))
+    monkeypatch.setattr(geo, '_geometry', None)
+    df = pd.DataFrame({'자치구': ['종로구'], '발생건수': [10], '사망자수': [1], '부상자수': [5]})
+    cache = FigureCache()
+    key = ('map', (), (), (), 'total')
+
+    def build():
+        return cache.get_or_create(key, lambda: create_map_chart(df, 'total'),
+                                   cacheable=lambda fig: not is_failed_figure(fig))
+
+    assert is_failed_figure(build())
+    assert cache.get(key) is None
+
+    path.write_text(json.dumps({'type': 'FeatureCollection', 'features': [{
+        'type': 'Feature',
+        'properties': {'name': '종로구'},
+        'geometry': {'type': 'Polygon', 'coordinates': [[[126.9, 37.5], [127.0, 37.5], [127.0, 37.6], [126.9, 37.5]]]},
+    }]}), encoding='utf-8')
+    assert not is_failed_figure(build())
+    assert cache.get(key) is not None
@@ -0,0 +1,54 @@
+"""공유 큐브 테스트: 동시에 요청해도 한 번만 만들고, 쓰이지 않는 이전 큐브는 정리"""
+
+import os
+import threading
+import time
+
+import preprocessing
+from cube import AccidentCube, load_shared_cube, remove_stale_cubes
+from generate_data import generate_dataset
+
+
+def test_concurrent_workers_build_shared_cube_once(tmp_path, cache_dir, monkeypatch):
+    monkeypatch.setenv(preprocessing.LOAD_WORKERS_ENV, '1')
+    paths = generate_dataset(str(tmp_path), n_regions=5, n_years=3, latest_year=2024, seed=1)
+    frames = preprocessing.load_and_clean_data(use_cache=False, paths=paths)
+    directory = os.path.join(str(cache_dir), 'cube-test')
+    os.makedirs(cache_dir, exist_ok=True)
+
+    builds = []
+
+    def build():
+        builds.append(threading.get_ident())
+        time.sleep(0.2)  # 다른 워커가 같은 큐브를 요청하는 동안 만드는 중
+        return AccidentCube.from_frames(*frames)
+
+    cubes = []
+    threads = [threading.Thread(target=lambda: cubes.append(load_shared_cube(directory, build)))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
+    assert len(cubes) == 4
+    assert all(cube.districts == cubes[0].districts for cube in cubes)
+
+
+def test_remove_stale_cubes_keeps_current_and_recent(cache_dir):
+    os.makedirs(cache_dir)
+    current = cache_dir / 'cube-new'
+    recent = cache_dir / 'cube-recent'
+    stale = cache_dir / 'cube-old'
+    for path in (current, recent, stale):
+        path.mkdir()
+    (cache_dir / 'cube-old.lock').touch()
+    (cache_dir / 'district-abc.feather').touch()
+
+    old = time.time() - 3600
+    for path in (current, stale, cache_dir / 'cube-old.lock', cache_dir / 'district-abc.feather'):
+        os.utime(path, (old, old))
+
+    assert remove_stale_cubes(str(current), retention=600) == 2
+    assert sorted(os.listdir(cache_dir)) == ['cube-new', 'cube-recent', 'district-abc.feather']
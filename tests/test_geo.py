@@ -0,0 +1,68 @@
+"""자치구 경계 저장소 테스트: 경계 파일이 없을 때 내려받기는 시작 시 한 번만"""
+
+import json
+import os
+
+import pytest
+
+import geo
+
+SQUARE = {
+    'type': 'FeatureCollection',
+    'features': [{
+        'type': 'Feature',
+        'properties': {'name': '종로구'},
+        'geometry': {'type': 'Polygon', 'coordinates': [[[126.9, 37.5], [127.0, 37.5], [127.0, 37.6], [126.9, 37.6], [126.9, 37.5]]]},
+    }],
+}
+
+
+@pytest.fixture
+def missing_bundle(tmp_path, monkeypatch):
+    """DATA/ 경계 파일이 없는 새 작업 폴더"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv(geo.GEOJSON_PATH_ENV, raising=False)
+    monkeypatch.delenv(geo.GEOJSON_SHA256_ENV, raising=False)
+    monkeypatch.setattr(geo, '_geometry', None)
+    monkeypatch.setattr(geo, '_download_attempted', False)
+
+
+def write_square(dest):
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    with open(dest, 'w', encoding='utf-8') as f:
+        json.dump(SQUARE, f)
+    return 'digest'
+
+
+def test_get_geometry_never_downloads(missing_bundle, monkeypatch):
+    def download(*args, **kwargs):
+        raise AssertionError('get_geometry()가 네트워크에 접근함')
+
+    monkeypatch.setattr(geo, 'download_geometry', download)
+    with pytest.raises(geo.GeometryError):
+        geo.get_geometry()
+
+    # python geo.py 로 파일을 준비하면 다음 호출부터 로드
+    write_square(geo.DEFAULT_GEOJSON_PATH)
+    assert geo.get_geometry().names == ('종로구',)
+
+
+def test_missing_bundle_is_downloaded_once(missing_bundle, monkeypatch):
+    calls = []
+
+    def download(dest, timeout):
+        calls.append(dest)
+        raise OSError('network unreachable')
+
+    monkeypatch.setattr(geo, 'download_geometry', download)
+    assert not geo.ensure_geometry_file()
+    # 실패해도 같은 프로세스에서는 다시 시도하지 않음 (데이터 갱신마다 네트워크를 기다리지 않도록)
+    assert not geo.ensure_geometry_file()
+    assert calls == [geo.DEFAULT_GEOJSON_PATH]
+
+
+def test_missing_bundle_download_is_loaded(missing_bundle, monkeypatch):
+    monkeypatch.setattr(geo, 'download_geometry', lambda dest, timeout: write_square(dest))
+    assert geo.ensure_geometry_file()
+    assert geo.get_geometry().names == ('종로구',)
+    assert os.path.exists(geo.DEFAULT_GEOJSON_PATH)
@@ -0,0 +1,68 @@
+"""증분 로드(DASHBOARD_INCREMENTAL_LOAD=1) 테스트: 다른 데이터의 이전 캐시를 섞지 않아야 함"""
+
+import os
+
+import pandas as pd
+import pytest
+
+import preprocessing
+from generate_data import generate_dataset
+
+
+@pytest.fixture(autouse=True)
+def incremental(monkeypatch):
+    monkeypatch.setenv(preprocessing.INCREMENTAL_ENV, '1')
+    monkeypatch.setenv(preprocessing.LOAD_WORKERS_ENV, '1')
+
+
+def _dataset(directory, seed, latest_year, stamp=None):
+    """합성 데이터 생성 (stamp를 주면 파일명의 내려받기 시각을 바꿔 더 최신 파일로 둠)"""
+    paths = generate_dataset(str(directory), n_regions=25, n_years=latest_year - 2009,
+                             latest_year=latest_year, seed=seed)
+    if stamp:
+        for name, path in paths.items():
+            renamed = os.path.join(str(directory), f"{preprocessing.DATA_PREFIXES[name]}{stamp}.csv")
+            os.replace(path, renamed)
+            paths[name] = renamed
+    return paths
+
+
+def _assert_full_parse(paths):
+    loaded = preprocessing.load_and_clean_data(paths=paths)
+    full = preprocessing.load_and_clean_data(use_cache=False, paths=paths)
+    for actual, expected in zip(loaded, full):
+        pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_cache_from_other_directory_is_not_merged(tmp_path, cache_dir):
+    synthetic = _dataset(tmp_path / 'synthetic', seed=0, latest_year=2023)
+    preprocessing.load_and_clean_data(paths=synthetic)
+    synthetic_caches = sorted(os.listdir(cache_dir))
+
+    _assert_full_parse(_dataset(tmp_path / 'data', seed=1, latest_year=2024))
+
+    # 다른 폴더의 캐시는 그 폴더로 다시 실행할 때 쓰이므로 남아 있어야 함
+    assert set(synthetic_caches) <= set(os.listdir(cache_dir))
+
+
+def test_different_data_in_same_directory_is_not_merged(tmp_path):
+    directory = tmp_path / 'data'
+    preprocessing.load_and_clean_data(paths=_dataset(directory, seed=0, latest_year=2023))
+
+    _assert_full_parse(_dataset(directory, seed=1, latest_year=2024, stamp='20260101000000'))
+
+
+def test_new_year_is_merged_with_previous_cache(tmp_path, capsys):
+    directory = tmp_path / 'data'
+    current = _dataset(directory, seed=0, latest_year=2024, stamp='20260101000000')
+    # 이전 파일: 최신 연도 컬럼이 없는 같은 데이터
+    previous = {}
+    for name, path in current.items():
+        rows = pd.read_csv(path, header=None, dtype=str, keep_default_na=False, encoding='utf-8-sig')
+        rows = rows.loc[:, rows.iloc[0].str.strip() != '2024']
+        previous[name] = os.path.join(str(directory), preprocessing.DATA_FILES[name])
+        rows.to_csv(previous[name], header=False, index=False, encoding='utf-8-sig')
+    preprocessing.load_and_clean_data(paths=previous)
+
+    _assert_full_parse(current)
+    assert '년만 파싱' in capsys.readouterr().out
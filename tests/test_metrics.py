@@ -0,0 +1,16 @@
+"""성능 계측(/metrics) 테스트"""
+
+from flask import Flask
+
+from metrics import register_metrics_route
+
+
+def test_metrics_content_type_has_single_charset():
+    server = Flask(__name__)
+    register_metrics_route(server)
+
+    response = server.test_client().get('/metrics')
+
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == 'text/plain; version=0.0.4; charset=utf-8'
+    assert '# TYPE dashboard_stage_seconds histogram' in response.get_data(as_text=True)
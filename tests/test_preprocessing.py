@@ -0,0 +1,27 @@
+"""전처리(KOSIS CSV → long format) 테스트"""
+
+import pandas as pd
+import pytest
+
+import preprocessing
+from generate_data import generate_dataset
+
+
+@pytest.fixture(scope='module')
+def large_dataset(tmp_path_factory):
+    """차량용도별 파일이 MIN_CHUNK_ROWS보다 긴 합성 데이터 (여러 구간으로 나눠 변환됨)"""
+    regions = preprocessing.MIN_CHUNK_ROWS + 100
+    return generate_dataset(str(tmp_path_factory.mktemp('synthetic')), n_regions=regions, n_years=3)
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_parallel_vehicle_load_matches_sequential(large_dataset, executor):
+    sequential = preprocessing.load_and_clean_data(use_cache=False, workers=1, paths=large_dataset)
+    parallel = preprocessing.load_and_clean_data(use_cache=False, workers=3, executor=executor,
+                                                 paths=large_dataset)
+
+    for expected, actual in zip(sequential, parallel):
+        pd.testing.assert_frame_equal(actual, expected)
+    df_vehicle = parallel[1]
+    assert isinstance(df_vehicle['자치구'].dtype, pd.CategoricalDtype)
+    assert df_vehicle['자치구'].nunique() == preprocessing.MIN_CHUNK_ROWS + 100